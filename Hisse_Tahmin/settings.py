@@ -94,6 +94,18 @@ DATABASES = {
 }
 
 
+# Önbellek (hisse bazında sütunsal fiyat/analiz dizileri için kullanılır).
+# Birden fazla sunucu süreci için Redis ya da Memcached arka ucu tanımlanabilir.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'hisse-tahmin',
+        'OPTIONS': {
+            'MAX_ENTRIES': 1000,
+        },
+    }
+}
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
@@ -2,7 +2,8 @@ from django.contrib import admin
 # User ve UserAdmin import'larını kaldırıyoruz çünkü zaten Django tarafından kaydedilmiş durumda
 from .models import (Stock, StockPrice, StockAnalysis, StockFile, 
                     MacroeconomicData, Sector, SectorIndex, 
-                    CompanyFinancial, SentimentData)
+                    CompanyFinancial, SentimentData, BackgroundJob, ModelArtifact,
+                    BatchPrediction, IntradayBlock, TuningTrial, PriceBar)
 
 # Register your models here.
 # admin.site.register(User, UserAdmin) satırını kaldırıyoruz
@@ -106,3 +107,50 @@ class SentimentDataAdmin(admin.ModelAdmin):
     search_fields = ('stock__symbol', 'content_sample')
     date_hierarchy = 'date'
     ordering = ('-date',)
+
+@admin.register(BackgroundJob)
+class BackgroundJobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'job_type', 'status', 'progress', 'attempts', 'created_by', 'created_at', 'finished_at')
+    list_filter = ('status', 'job_type')
+    readonly_fields = ('created_at', 'started_at', 'heartbeat_at', 'finished_at')
+    ordering = ('-created_at',)
+
+@admin.register(ModelArtifact)
+class ModelArtifactAdmin(admin.ModelAdmin):
+    list_display = ('stock', 'model_type', 'time_horizon', 'data_end', 'row_count', 'use_count', 'created_at', 'last_used_at')
+    list_filter = ('model_type', 'time_horizon')
+    search_fields = ('stock__symbol', 'content_hash')
+    readonly_fields = ('content_hash', 'created_at', 'last_used_at')
+    ordering = ('-created_at',)
+
+@admin.register(BatchPrediction)
+class BatchPredictionAdmin(admin.ModelAdmin):
+    list_display = ('run_id', 'stock', 'model_type', 'time_horizon', 'as_of', 'last_price', 'predicted_price', 'change_percent')
+    list_filter = ('model_type', 'time_horizon', 'as_of')
+    search_fields = ('stock__symbol', 'run_id')
+    ordering = ('-created_at', '-change_percent')
+
+@admin.register(IntradayBlock)
+class IntradayBlockAdmin(admin.ModelAdmin):
+    list_display = ('stock', 'interval', 'date', 'bar_count', 'updated_at')
+    list_filter = ('interval', 'stock')
+    search_fields = ('stock__symbol',)
+    date_hierarchy = 'date'
+    exclude = ('data',)
+    ordering = ('-date',)
+
+@admin.register(PriceBar)
+class PriceBarAdmin(admin.ModelAdmin):
+    list_display = ('stock', 'timeframe', 'period_start', 'last_date', 'open', 'high', 'low', 'close', 'volume')
+    list_filter = ('timeframe', 'stock')
+    search_fields = ('stock__symbol',)
+    date_hierarchy = 'period_start'
+    ordering = ('-period_start',)
+
+@admin.register(TuningTrial)
+class TuningTrialAdmin(admin.ModelAdmin):
+    list_display = ('study', 'number', 'stock', 'model_type', 'time_horizon', 'state', 'score', 'duration', 'created_at')
+    list_filter = ('state', 'model_type', 'time_horizon')
+    search_fields = ('stock__symbol', 'study')
+    readonly_fields = ('study', 'params_key', 'created_at')
+    ordering = ('-created_at',)
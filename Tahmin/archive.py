@@ -0,0 +1,368 @@
+"""
+Fiyat, analiz, döviz, makro ve finansal tablo geçmişinin Parquet (Apache Arrow) arşivi.
+
+Bir arşiv klasördür: her veri kümesi kendi alt klasöründe yıla göre bölümlenmiş (hive:
+year=2024/...) Parquet dosyalarından oluşur ve manifest.json satır sayılarını ve şema sürümünü
+içerir. Sütunlar model alanlarından türetilir; DecimalField değerleri Arrow decimal128 olarak
+birebir saklanır. Satırlar hisse kimliği yerine sembolle yazıldığından arşiv başka bir ortama
+(farklı id'lerle) yüklenebilir. Veriler ORM nesnesi oluşturmadan partiler halinde okunup
+yazılır; yükleme, anahtar alanlarda benzersiz kısıt varsa toplu ekleme/güncelleme (upsert) ile,
+yoksa eşleşen satırlar silinip yeniden eklenerek yapılır.
+"""
+import io
+import json
+import logging
+import os
+import re
+import zipfile
+
+from django.conf import settings
+from django.db import connection, models, transaction
+from django.utils import timezone
+
+from .bars import rebuild_price_bars
+from .models import Stock, StockPrice, StockAnalysis, ExchangeRate, MacroeconomicData, CompanyFinancial
+from .upsert import supports_upsert
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.csv as pa_csv
+    import pyarrow.dataset as ds
+except ImportError:
+    pa = None
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_DIR = os.path.join(settings.BASE_DIR, 'uploads', 'archives')
+ARCHIVE_FORMAT = 1
+MANIFEST_NAME = 'manifest.json'
+
+BATCH_ROWS = 50000
+BULK_BATCH_SIZE = 1000
+
+PARTITION_COLUMN = 'year'
+
+# Veri kümeleri yükleme sırasıyla: hisseler, hisseye bağlı tablolardan önce gelir.
+#   keys: satırı tanımlayan alanlar (yüklemede eşleştirme için)
+#   partition: yıl bölümünün türetildiği alan (None: bölümlenmez)
+#   refresh: güncellenen satırlarda yenilenecek zaman damgaları (sütunsal önbellek parmak izi)
+DATASETS = {
+    'stocks': {'model': Stock, 'keys': ['symbol'], 'partition': None, 'refresh': ['updated_at']},
+    'prices': {'model': StockPrice, 'keys': ['stock', 'date'], 'partition': 'date', 'refresh': ['updated_at']},
+    'analysis': {'model': StockAnalysis, 'keys': ['stock', 'date'], 'partition': 'date', 'refresh': ['created_at', 'updated_at']},
+    'exchange_rates': {'model': ExchangeRate, 'keys': ['date', 'currency'], 'partition': 'date', 'refresh': ['updated_at']},
+    'macro': {'model': MacroeconomicData, 'keys': ['date'], 'partition': 'date', 'refresh': []},
+    'financials': {'model': CompanyFinancial, 'keys': ['stock', 'period', 'year'], 'partition': 'year', 'refresh': ['updated_at']},
+}
+
+ARCHIVE_NAME_PATTERN = re.compile(r'^[\w-]+$')
+
+
+def require_pyarrow():
+    if pa is None:
+        raise ValueError("Parquet arşivi için pyarrow paketi gerekli: pip install pyarrow")
+
+
+def archive_path(name):
+    """Arşiv adını ARCHIVE_DIR altındaki klasör yoluna çevirir; geçersiz adlarda ValueError fırlatır."""
+    if not name or not ARCHIVE_NAME_PATTERN.match(name):
+        raise ValueError(f"Geçersiz arşiv adı: {name}")
+    return os.path.join(ARCHIVE_DIR, name)
+
+
+def archive_fields(model):
+    """Arşive yazılan model alanları: kimlik ve otomatik zaman damgaları hariç tüm sütunlar."""
+    return [
+        field for field in model._meta.concrete_fields
+        if not field.primary_key and not getattr(field, 'auto_now', False) and not getattr(field, 'auto_now_add', False)
+    ]
+
+
+def column_name(field):
+    # Hisse bağlantısı sembol olarak saklanır
+    return 'symbol' if field.is_relation else field.name
+
+
+def arrow_type(field):
+    if field.is_relation:
+        return pa.string()
+    if isinstance(field, models.DecimalField):
+        return pa.decimal128(field.max_digits, field.decimal_places)
+    if isinstance(field, models.FloatField):
+        return pa.float64()
+    if isinstance(field, (models.BigIntegerField, models.IntegerField)):
+        return pa.int64()
+    if isinstance(field, models.BooleanField):
+        return pa.bool_()
+    if isinstance(field, models.DateTimeField):
+        return pa.timestamp('us', tz='UTC')
+    if isinstance(field, models.DateField):
+        return pa.date32()
+    return pa.string()
+
+
+def _partitioning(spec):
+    if spec['partition'] is None:
+        return None
+    return ds.partitioning(pa.schema([(PARTITION_COLUMN, pa.int32())]), flavor='hive')
+
+
+def _chunks(iterator, size):
+    chunk = []
+    for row in iterator:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def export_dataset(name, root, batch_rows=BATCH_ROWS):
+    """Veri kümesini root/<name> altına Parquet olarak yazar. Yazılan satır sayısını döndürür."""
+    require_pyarrow()
+    spec = DATASETS[name]
+    model = spec['model']
+    fields = archive_fields(model)
+
+    schema = pa.schema([(column_name(field), arrow_type(field)) for field in fields])
+    lookups = ['stock__symbol' if field.is_relation else field.name for field in fields]
+    derived_year = spec['partition'] is not None and spec['partition'] != PARTITION_COLUMN
+    if derived_year:
+        schema = schema.append(pa.field(PARTITION_COLUMN, pa.int32()))
+
+    queryset = model.objects.order_by(*[f"{key}__symbol" if key == 'stock' else key for key in spec['keys']])
+    rows = queryset.values_list(*lookups).iterator(chunk_size=batch_rows)
+    written = 0
+
+    def batches():
+        nonlocal written
+        for chunk in _chunks(rows, batch_rows):
+            arrays = [pa.array(values, type=schema.field(index).type) for index, values in enumerate(zip(*chunk))]
+            if derived_year:
+                arrays.append(pc.year(arrays[lookups.index(spec['partition'])]).cast(pa.int32()))
+            written += len(chunk)
+            yield pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+    ds.write_dataset(
+        batches(), os.path.join(root, name), schema=schema, format='parquet',
+        partitioning=_partitioning(spec), basename_template=f"{name}-{{i}}.parquet",
+        existing_data_behavior='delete_matching',
+        file_options=ds.ParquetFileFormat().make_write_options(compression='zstd'),
+    )
+    logger.info("%s: %s satır arşivlendi", name, written)
+    return written
+
+
+def export_archive(root=None, datasets=None, progress=None):
+    """
+    Veri kümelerini (varsayılan: tümü) Parquet arşivine yazar. root verilmezse ARCHIVE_DIR
+    altında zaman damgalı yeni bir klasör oluşturulur. Manifest sözlüğünü döndürür.
+    """
+    require_pyarrow()
+    report = progress or (lambda percent, message: None)
+    names = list(datasets or DATASETS)
+    unknown = set(names) - set(DATASETS)
+    if unknown:
+        raise ValueError(f"Bilinmeyen veri kümesi: {', '.join(sorted(unknown))}")
+
+    created_at = timezone.localtime()
+    root = root or archive_path(created_at.strftime('%Y%m%d_%H%M%S'))
+    os.makedirs(root, exist_ok=True)
+
+    manifest = {'format': ARCHIVE_FORMAT, 'created_at': created_at.replace(tzinfo=None).isoformat(timespec='seconds'), 'datasets': {}}
+    for index, name in enumerate(names):
+        report(int(index / len(names) * 100), f"{name} arşivleniyor")
+        rows = export_dataset(name, root)
+        manifest['datasets'][name] = {
+            'rows': rows,
+            'columns': [column_name(field) for field in archive_fields(DATASETS[name]['model'])],
+        }
+
+    with open(os.path.join(root, MANIFEST_NAME), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    manifest['path'] = root
+    return manifest
+
+
+def read_manifest(root):
+    path = os.path.join(root, MANIFEST_NAME)
+    if not os.path.exists(path):
+        raise ValueError(f"Arşiv bulunamadı: {root}")
+    with open(path, encoding='utf-8') as f:
+        manifest = json.load(f)
+    if manifest.get('format') != ARCHIVE_FORMAT:
+        raise ValueError(f"Desteklenmeyen arşiv biçimi: {manifest.get('format')}")
+    return manifest
+
+
+def _delete_matching(model, keys, objects):
+    # Son anahtar dışındaki değerlere göre gruplanır; her grupta son anahtar parça parça silinir
+    *prefix, last = [model._meta.get_field(key).attname for key in keys]
+    groups = {}
+    for obj in objects:
+        groups.setdefault(tuple(getattr(obj, name) for name in prefix), []).append(getattr(obj, last))
+    for values, last_values in groups.items():
+        for start in range(0, len(last_values), BULK_BATCH_SIZE):
+            model.objects.filter(
+                **dict(zip(prefix, values)), **{f"{last}__in": last_values[start:start + BULK_BATCH_SIZE]},
+            ).delete()
+
+
+def _save_objects(spec, objects, fields, replace):
+    model = spec['model']
+    if replace:
+        model.objects.bulk_create(objects, batch_size=BULK_BATCH_SIZE)
+        return
+
+    if supports_upsert(model, spec['keys']):
+        update_fields = [field.name for field in fields if field.name not in spec['keys']] + spec['refresh']
+        model.objects.bulk_create(
+            objects, batch_size=BULK_BATCH_SIZE,
+            update_conflicts=True, unique_fields=spec['keys'], update_fields=update_fields,
+        )
+        return
+
+    # Benzersiz kısıt yok: aynı anahtarlı satırlar silinip yeniden eklenir
+    _delete_matching(model, spec['keys'], objects)
+    model.objects.bulk_create(objects, batch_size=BULK_BATCH_SIZE)
+
+
+def _copy_table(model, table):
+    """Arrow tablosunu PostgreSQL COPY ile yazar; otomatik zaman damgaları şimdiki zamanla doldurulur."""
+    now = pa.scalar(timezone.now(), pa.timestamp('us', tz='UTC'))
+    for field in model._meta.concrete_fields:
+        if getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False):
+            table = table.append_column(field.attname, pa.repeat(now, table.num_rows))
+
+    buffer = io.BytesIO()
+    pa_csv.write_csv(table, buffer, write_options=pa_csv.WriteOptions(include_header=False))
+    buffer.seek(0)
+
+    quote = connection.ops.quote_name
+    columns = ', '.join(quote(column) for column in table.column_names)
+    with connection.cursor() as cursor:
+        cursor.copy_expert(f"COPY {quote(model._meta.db_table)} ({columns}) FROM STDIN WITH (FORMAT csv)", buffer)
+
+
+def import_dataset(name, root, replace=False, batch_rows=BATCH_ROWS):
+    """
+    root/<name> altındaki Parquet dosyalarını veritabanına yükler. replace=True ise tablodaki
+    mevcut satırlar önce silinir (hisseler hiçbir zaman silinmez); aksi halde aynı anahtarlı
+    satırlar güncellenir. (yüklenen, atlanan) satır sayılarını döndürür; veritabanında sembolü
+    bulunmayan hisselerin satırları atlanır.
+    """
+    require_pyarrow()
+    spec = DATASETS[name]
+    model = spec['model']
+    path = os.path.join(root, name)
+    if not os.path.isdir(path):
+        return 0, 0
+
+    fields = archive_fields(model)
+    columns = [column_name(field) for field in fields]
+    dataset = ds.dataset(path, format='parquet', partitioning=_partitioning(spec))
+    stocks = Stock.objects.values_list('symbol', 'id')
+    symbols = pa.array([symbol for symbol, _ in stocks], pa.string())
+    ids = pa.array([stock_id for _, stock_id in stocks], pa.int64())
+    # PostgreSQL'de tablo baştan yükleniyorsa satırlar INSERT yerine COPY ile yazılır
+    use_copy = replace and model is not Stock and connection.vendor == 'postgresql'
+
+    loaded = skipped = 0
+    with transaction.atomic():
+        if replace and model is not Stock:
+            model.objects.all().delete()
+
+        for batch in dataset.to_batches(columns=columns, batch_size=batch_rows):
+            arrays = {}
+            for field, column in zip(fields, columns):
+                values = batch.column(column)
+                if field.is_relation:
+                    values = pc.take(ids, pc.index_in(values, value_set=symbols))
+                arrays[field.attname] = values
+            table = pa.table(arrays)
+
+            if 'stock_id' in arrays:
+                table = table.filter(pc.is_valid(table['stock_id']))
+                skipped += batch.num_rows - table.num_rows
+            if not table.num_rows:
+                continue
+
+            if use_copy:
+                _copy_table(model, table)
+            else:
+                objects = [model(**row) for row in table.to_pylist()]
+                _save_objects(spec, objects, fields, replace and model is not Stock)
+            loaded += table.num_rows
+
+    logger.info("%s: %s satır yüklendi, %s satır atlandı", name, loaded, skipped)
+    return loaded, skipped
+
+
+def import_archive(root, datasets=None, replace=False, progress=None):
+    """
+    Parquet arşivini yükler. Veri kümeleri DATASETS sırasıyla (önce hisseler) yüklenir.
+    {veri kümesi: {'rows', 'skipped'}} raporunu döndürür.
+    """
+    require_pyarrow()
+    report = progress or (lambda percent, message: None)
+    manifest = read_manifest(root)
+    names = [name for name in DATASETS if name in manifest['datasets'] and (not datasets or name in datasets)]
+
+    result = {}
+    for index, name in enumerate(names):
+        report(int(index / len(names) * 100), f"{name} yükleniyor")
+        loaded, skipped = import_dataset(name, root, replace=replace)
+        result[name] = {'rows': loaded, 'skipped': skipped}
+        if name == 'prices' and loaded:
+            # Haftalık/aylık barlar fiyatlardan türetilir, arşivde saklanmaz
+            report(int((index + 1) / len(names) * 100), "Fiyat barları oluşturuluyor")
+            rebuild_price_bars()
+    return result
+
+
+def list_archives():
+    """ARCHIVE_DIR altındaki arşivler, en yeniden eskiye: [{'name', 'created_at', 'datasets'}]"""
+    if not os.path.isdir(ARCHIVE_DIR):
+        return []
+
+    archives = []
+    for name in sorted(os.listdir(ARCHIVE_DIR), reverse=True):
+        try:
+            manifest = read_manifest(os.path.join(ARCHIVE_DIR, name))
+        except ValueError:
+            continue
+        archives.append({
+            'name': name,
+            'created_at': manifest['created_at'],
+            'datasets': {key: value['rows'] for key, value in manifest['datasets'].items()},
+        })
+    return archives
+
+
+def write_archive_zip(root, destination):
+    """Arşiv klasörünü zip dosyasına (ya da dosya nesnesine) yazar. Parquet zaten sıkıştırılmış olduğundan dosyalar olduğu gibi eklenir."""
+    with zipfile.ZipFile(destination, 'w', compression=zipfile.ZIP_STORED) as archive:
+        for directory, _, files in os.walk(root):
+            for filename in files:
+                path = os.path.join(directory, filename)
+                archive.write(path, os.path.relpath(path, root))
+
+
+def extract_archive_zip(source, name):
+    """Yüklenen arşiv zip'ini ARCHIVE_DIR/<name> altına açar ve klasör yolunu döndürür."""
+    root = archive_path(name)
+    with zipfile.ZipFile(source) as archive:
+        members = archive.namelist()
+        if MANIFEST_NAME not in members:
+            raise ValueError("Zip dosyası bir veri arşivi değil (manifest.json bulunamadı).")
+        # Klasör dışına yazmaya çalışan (../) girdiler reddedilir
+        base = os.path.realpath(root)
+        for member in members:
+            target = os.path.realpath(os.path.join(base, member))
+            if os.path.commonpath([base, target]) != base:
+                raise ValueError(f"Geçersiz arşiv girdisi: {member}")
+        archive.extractall(root)
+    read_manifest(root)
+    return root
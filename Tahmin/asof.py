@@ -0,0 +1,224 @@
+"""
+Zamana göre (as-of) hizalama: günlük fiyatlar, aylık/düzensiz makro veriler ve çeyreklik/yıllık
+finansallar, her gün yalnızca o gün itibarıyla açıklanmış değerleri görecek şekilde (geleceğe
+bakmadan) birleştirilir.
+
+Her kayıt dönem tarihine (gözlem günü, ay sonu, çeyrek sonu) yayım gecikmesi eklenerek bir
+bilinme tarihine yerleştirilir. Günlük tarih dizisindeki her gün için bilinme tarihi o güne
+eşit ya da önce olan son kayıt alınır (ileri doldurma). Birleştirme sıralı diziler üzerinde
+np.searchsorted ile yapılır; satır başına sorgu ya da sözlük araması yoktur. Hisse bazlı
+kaynaklarda (finansallar) hisse ve tarih tek bir int64 anahtarda birleştirilir ve tüm hisseler
+tek geçişte hizalanır.
+"""
+import logging
+
+import numpy as np
+import pandas as pd
+
+from .columnar import fingerprint
+from .market_matrix import open_market_matrix, update_market_matrix
+from .models import CompanyFinancial, ExchangeRate, InflationData, InterestRate, MacroeconomicData
+
+logger = logging.getLogger(__name__)
+
+# Makro seriler: ad -> (model, değer alanı, filtre, yayım gecikmesi (gün)). Gecikmeler dönem
+# tarihinden açıklanma gününe kadar geçen süredir; değişken olanlar için ihtiyatlı (geç) değerler
+# seçilmiştir. Erken açıklanan veri birkaç gün geç görünür ama hiçbir gün henüz açıklanmamış
+# bir değeri görmez.
+MACRO_SERIES = {
+    'usd_try': (ExchangeRate, 'close_price', {'currency': 'USD'}, 0),
+    'eur_try': (ExchangeRate, 'close_price', {'currency': 'EUR'}, 0),
+    'policy_rate': (InterestRate, 'policy_rate', {}, 0),
+    'bond_yield_2y': (InterestRate, 'bond_yield_2y', {}, 0),
+    'bond_yield_10y': (InterestRate, 'bond_yield_10y', {}, 0),
+    # TÜİK enflasyonu izleyen ayın 3'ünde açıklar (ay sonuna göre)
+    'tufe_yearly': (InflationData, 'tufe_yearly', {}, 4),
+    'ufe_yearly': (InflationData, 'ufe_yearly', {}, 4),
+    # Büyüme ve işgücü istatistikleri dönem sonundan yaklaşık iki buçuk ay sonra açıklanır
+    'gdp_growth': (MacroeconomicData, 'gdp_growth', {}, 75),
+    'unemployment_rate': (MacroeconomicData, 'unemployment_rate', {}, 75),
+}
+
+MACRO_MODELS = (ExchangeRate, InterestRate, InflationData, MacroeconomicData)
+
+MONTH_NUMBERS = {name: number for number, (name, _) in enumerate(InflationData.MONTH_CHOICES, start=1)}
+
+# Finansal tabloların dönem sonundan KAP'ta açıklanmasına kadar en geç süreler (gün)
+FINANCIAL_LAGS = {'Q1': 60, 'Q2': 70, 'Q3': 60, 'Q4': 75, 'ANNUAL': 75}
+PERIOD_END_MONTHS = {'Q1': 3, 'Q2': 6, 'Q3': 9, 'Q4': 12, 'ANNUAL': 12}
+# Aynı gün bilinir hale gelen dönemlerde (Q4 ve yıllık) yıllık tablo geçerlidir
+PERIOD_PRIORITY = {'Q1': 0, 'Q2': 0, 'Q3': 0, 'Q4': 0, 'ANNUAL': 1}
+
+FINANCIAL_FIELDS = (
+    'revenue', 'ebitda', 'net_income', 'total_assets', 'total_liabilities', 'equity',
+    'debt_to_equity', 'roe', 'eps', 'dividend', 'dividend_yield', 'pe_ratio', 'pb_ratio', 'ev_ebitda',
+)
+FINANCIAL_PREFIX = 'fin_'
+
+# Hisse kimliği ve gün numarası tek int64 anahtarda birleştirilir (gün numarası negatif olabilir)
+DAY_BITS = 32
+DAY_OFFSET = 1 << (DAY_BITS - 1)
+
+
+def month_end(years, months):
+    """Yıl ve ay numarası dizilerinden ayın son günü (datetime64[D])."""
+    index = (np.asarray(years, dtype=np.int64) - 1970) * 12 + np.asarray(months, dtype=np.int64) - 1
+    return (index.astype('datetime64[M]') + 1).astype('datetime64[D]') - 1
+
+
+def asof_positions(dates, available):
+    """Her tarih için bilinme tarihi o güne eşit ya da önce olan son kaydın sırası (yoksa -1)."""
+    return np.searchsorted(available, dates, side='right') - 1
+
+
+def asof_join(dates, available, values):
+    """
+    Sıralı (available, values) serisini günlere hizalar: her gün için o güne kadar bilinen son
+    değer; öncesinde değer yoksa NaN. values tek boyutlu ya da (kayıt, sütun) olabilir.
+    """
+    values = np.asarray(values, dtype=float)
+    positions = asof_positions(dates, available)
+    joined = np.full((len(dates),) + values.shape[1:], np.nan)
+    known = positions >= 0
+    joined[known] = values[positions[known]]
+    return joined
+
+
+def _composite(keys, dates):
+    days = np.asarray(dates, dtype='datetime64[D]').astype(np.int64) + DAY_OFFSET
+    return (np.asarray(keys, dtype=np.int64) << DAY_BITS) + days
+
+
+def asof_join_by_key(keys, dates, series_keys, available, values):
+    """
+    asof_join'in hisse bazlı hali: (keys[i], dates[i]) satırına yalnızca aynı anahtarın
+    kayıtlarından bilinen son değer gelir. Seri (anahtar, bilinme tarihi) sırasında olmalıdır.
+    """
+    values = np.asarray(values, dtype=float)
+    series_keys = np.asarray(series_keys, dtype=np.int64)
+    positions = np.searchsorted(_composite(series_keys, available), _composite(keys, dates), side='right') - 1
+
+    joined = np.full((len(keys),) + values.shape[1:], np.nan)
+    known = positions >= 0
+    known[known] = series_keys[positions[known]] == np.asarray(keys, dtype=np.int64)[known]
+    joined[known] = values[positions[known]]
+    return joined
+
+
+def macro_version():
+    """Makro tabloların parmak izi (kayıt sayısı ve son güncelleme)."""
+    return '|'.join(fingerprint(model.objects.all()) for model in MACRO_MODELS)
+
+
+def _macro_rows(model, field, filters):
+    # (dönem tarihleri, değerler); enflasyon verisi ay sonuna yerleştirilir
+    queryset = model.objects.filter(**filters).exclude(**{f'{field}__isnull': True}).order_by()
+    if model is InflationData:
+        rows = [(year, MONTH_NUMBERS[month], value)
+                for year, month, value in queryset.values_list('year', 'month', field) if month in MONTH_NUMBERS]
+        years, months, values = zip(*rows) if rows else ((), (), ())
+        return month_end(years, months), np.array(values, dtype=float)
+    rows = list(queryset.values_list('date', field))
+    return np.array([row[0] for row in rows], dtype='datetime64[D]'), np.array([row[1] for row in rows], dtype=float)
+
+
+def load_macro_series(names=None):
+    """Makro seriler, bilinme tarihine göre sıralı: {ad: (bilinme tarihleri, değerler)}."""
+    series = {}
+    for name in names or MACRO_SERIES:
+        model, field, filters, lag = MACRO_SERIES[name]
+        dates, values = _macro_rows(model, field, filters)
+        available = dates + np.timedelta64(lag, 'D')
+        order = np.argsort(available, kind='stable')
+        series[name] = (available[order], values[order])
+    return series
+
+
+def load_financials(stock_ids=None, fields=FINANCIAL_FIELDS):
+    """
+    Finansal tablolar, (hisse, bilinme tarihi) sırasında sütunlar halinde:
+    {'stock_id', 'period_end', 'available': dizi, 'values': {alan: float dizisi}}.
+    """
+    queryset = CompanyFinancial.objects.order_by()
+    if stock_ids is not None:
+        queryset = queryset.filter(stock_id__in=list(stock_ids))
+    rows = list(queryset.values_list('stock_id', 'year', 'period', *fields))
+    frame = pd.DataFrame.from_records(rows, columns=['stock_id', 'year', 'period', *fields])
+    frame = frame[frame['period'].isin(list(PERIOD_END_MONTHS))]
+
+    period_end = month_end(frame['year'].to_numpy(), frame['period'].map(PERIOD_END_MONTHS).to_numpy())
+    available = period_end + frame['period'].map(FINANCIAL_LAGS).to_numpy().astype('timedelta64[D]')
+    stock_id = frame['stock_id'].to_numpy(dtype=np.int64)
+    priority = frame['period'].map(PERIOD_PRIORITY).to_numpy()
+
+    order = np.lexsort((priority, available, stock_id))
+    return {
+        'stock_id': stock_id[order],
+        'period_end': period_end[order],
+        'available': available[order],
+        'values': {field: frame[field].to_numpy(dtype=float, na_value=np.nan)[order] for field in fields},
+    }
+
+
+def join_financials(stock_ids, dates, financials):
+    """
+    (hisse, gün) satırlarına o gün itibarıyla açıklanmış son finansal değerleri ekler:
+    {fin_<alan>: dizi, 'fin_period_end': datetime64 dizisi}. Boş alanlar önceki dönemden doldurulur.
+    """
+    columns = {}
+    for field, values in financials['values'].items():
+        present = ~np.isnan(values)
+        columns[FINANCIAL_PREFIX + field] = asof_join_by_key(
+            stock_ids, dates, financials['stock_id'][present], financials['available'][present], values[present],
+        )
+
+    period_days = financials['period_end'].astype(np.int64).astype(float)
+    period_end = asof_join_by_key(stock_ids, dates, financials['stock_id'], financials['available'], period_days)
+    columns[FINANCIAL_PREFIX + 'period_end'] = pd.to_datetime(period_end, unit='D')
+    return columns
+
+
+def daily_panel(symbols=None, start=None, end=None, macro=None, financials=None):
+    """
+    Hisselerin günlük kapanışlarına o gün itibarıyla bilinen makro ve finansal değerleri ekler.
+    (date, symbol) indeksli uzun DataFrame döndürür: close, makro serileri, fin_<alan> ve
+    fin_period_end (son açıklanan finansal dönemin sonu). macro ve financials sütun listeleridir;
+    None hepsi, boş liste hiçbiri anlamına gelir. Fiyatlar piyasa matrisinden okunur.
+    """
+    matrix = open_market_matrix()
+    if matrix is None:
+        update_market_matrix()
+        matrix = open_market_matrix()
+    if matrix is None:
+        raise ValueError("Fiyat verisi bulunamadı. Önce fiyat verilerini yükleyin.")
+
+    symbols = list(symbols) if symbols else list(matrix.symbols)
+    unknown = [symbol for symbol in symbols if symbol not in matrix.symbols]
+    if unknown:
+        raise ValueError(f"Fiyat verisi olmayan hisseler: {', '.join(unknown)}")
+
+    close = matrix.frame('close', start, end, symbols)
+    values = close.to_numpy()
+    day_index, column_index = np.nonzero(~np.isnan(values))
+    dates = close.index.to_numpy(dtype='datetime64[D]')[day_index]
+    stock_ids = np.array([matrix.stock_ids[matrix.column(symbol)] for symbol in symbols], dtype=np.int64)[column_index]
+
+    panel = pd.DataFrame(
+        {'close': values[day_index, column_index]},
+        index=pd.MultiIndex.from_arrays(
+            [pd.DatetimeIndex(dates, name='date'), pd.Index(np.asarray(symbols, dtype=object)[column_index], name='symbol')],
+        ),
+    )
+
+    if macro is None or len(macro):
+        for name, (available, series) in load_macro_series(macro).items():
+            panel[name] = asof_join(dates, available, series)
+
+    fields = FINANCIAL_FIELDS if financials is None else tuple(financials)
+    if fields:
+        records = load_financials(np.unique(stock_ids), fields)
+        for name, column in join_financials(stock_ids, dates, records).items():
+            panel[name] = column
+
+    logger.debug("As-of panel: %s satır, %s hisse, %s sütun", len(panel), len(symbols), panel.shape[1])
+    return panel.sort_index()
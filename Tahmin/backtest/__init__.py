@@ -0,0 +1,21 @@
+"""
+Geriye dönük test (backtest) alt sistemi.
+
+Saklanan fiyatlar ve StockAnalysis göstergeleri üzerinde vektörel strateji değerlendirmesi,
+süreç havuzunda parametre taraması ve walk-forward doğrulama (bkz. engine).
+"""
+from .data import BacktestPanel, load_panel
+from .engine import evaluate, run_backtest, summarize, walk_forward
+from .strategies import STRATEGIES, parameter_grid, register_strategy
+
+__all__ = [
+    'BacktestPanel',
+    'load_panel',
+    'evaluate',
+    'run_backtest',
+    'summarize',
+    'walk_forward',
+    'STRATEGIES',
+    'parameter_grid',
+    'register_strategy',
+]
@@ -0,0 +1,93 @@
+"""
+Geriye dönük test için hizalı fiyat ve gösterge matrisleri.
+
+Fiyatlar bellek eşlemeli piyasa matrisinden (bkz. market_matrix) kopyasız okunur; istenen
+StockAnalysis göstergeleri tek sorguyla aynı tarih x hisse düzenine yerleştirilir.
+"""
+import numpy as np
+import pandas as pd
+
+from ..market_matrix import open_market_matrix, update_market_matrix
+from ..models import StockAnalysis
+
+READ_CHUNK_ROWS = 100000
+
+
+class BacktestPanel:
+    """
+    Tarih x hisse matrisleri: close (DataFrame), returns (günlük basit getiri) ve
+    indicators (StockAnalysis alanı -> DataFrame). Tüm DataFrame'ler aynı indeks ve sütunlara sahiptir.
+    """
+
+    def __init__(self, close, stock_ids, indicators=None):
+        self.close = close
+        self.stock_ids = stock_ids
+        self.returns = close.pct_change(fill_method=None)
+        self.indicators = indicators or {}
+
+    @property
+    def dates(self):
+        return self.close.index
+
+    @property
+    def symbols(self):
+        return list(self.close.columns)
+
+    def indicator(self, field):
+        if field not in self.indicators:
+            raise ValueError(f"Gösterge yüklenmedi: {field}")
+        return self.indicators[field]
+
+
+def load_indicators(dates, stock_ids, symbols, fields):
+    """StockAnalysis alanlarını tarih x hisse DataFrame'lerine yerleştirir: {alan: DataFrame}"""
+    values = {field: np.full((len(dates), len(stock_ids)), np.nan) for field in fields}
+    if not fields or not len(dates):
+        return {field: pd.DataFrame(data, index=dates, columns=symbols) for field, data in values.items()}
+
+    column_of = {stock_id: index for index, stock_id in enumerate(stock_ids)}
+    date_index = dates.to_numpy(dtype='datetime64[D]')
+    rows = StockAnalysis.objects.filter(
+        stock_id__in=list(column_of), date__gte=dates[0].date(), date__lte=dates[-1].date(),
+    ).order_by().values_list('stock_id', 'date', *fields).iterator(chunk_size=READ_CHUNK_ROWS)
+
+    while True:
+        chunk = [row for _, row in zip(range(READ_CHUNK_ROWS), rows)]
+        if not chunk:
+            break
+        columns = list(zip(*chunk))
+        day = np.array(columns[1], dtype='datetime64[D]')
+        row_index = np.searchsorted(date_index, day)
+        # Fiyat matrisinde olmayan günler (ör. aralık dışı) atlanır
+        row_index = np.minimum(row_index, len(date_index) - 1)
+        found = date_index[row_index] == day
+        column_index = np.array([column_of[stock_id] for stock_id in columns[0]])
+        for offset, field in enumerate(fields):
+            data = np.array(columns[2 + offset], dtype=float)
+            values[field][row_index[found], column_index[found]] = data[found]
+
+    return {field: pd.DataFrame(data, index=dates, columns=symbols) for field, data in values.items()}
+
+
+def load_panel(symbols=None, start=None, end=None, indicators=()):
+    """
+    Piyasa matrisinden (yoksa oluşturularak) fiyatları ve istenen göstergeleri okur.
+    symbols verilmezse matristeki tüm hisseler kullanılır. Verisi olmayan günler atılır.
+    """
+    matrix = open_market_matrix()
+    if matrix is None:
+        update_market_matrix()
+        matrix = open_market_matrix()
+
+    symbols = list(symbols) if symbols else list(matrix.symbols)
+    unknown = [symbol for symbol in symbols if symbol not in matrix.symbols]
+    if unknown:
+        raise ValueError(f"Fiyat verisi olmayan hisseler: {', '.join(unknown)}")
+
+    close = matrix.frame('close', start, end, symbols)
+    close = close[close.notna().any(axis=1)]
+    if close.empty:
+        raise ValueError("Seçilen aralıkta fiyat verisi bulunamadı.")
+
+    stock_ids = [int(matrix.stock_ids[matrix.column(symbol)]) for symbol in symbols]
+    return BacktestPanel(close, stock_ids, load_indicators(close.index, stock_ids, symbols, list(indicators)))
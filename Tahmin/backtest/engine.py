@@ -0,0 +1,227 @@
+"""
+Vektörel geriye dönük test motoru, parametre taraması ve ileriye yürüyen (walk-forward) doğrulama.
+
+Bir parametre kombinasyonu tüm hisseler için tek seferde değerlendirilir: pozisyon matrisi
+ertesi günün getirisine uygulanır, pozisyon değişimlerinden işlem maliyeti düşülür ve portföy
+getirisi hisseler arasında eşit ağırlıklı ortalamadır. Tarama kombinasyonları süreç havuzunda
+paralel çalışır; panel (fiyatlar bellek eşlemeli matristen, kopyasız) bir kez yüklenir ve
+fork ile başlayan süreçlere devredilir. Walk-forward doğrulamada her eğitim penceresinde en iyi parametreler seçilir ve
+yalnızca onu izleyen test penceresinde uygulanır; raporlanan sonuç bu test pencerelerinin
+birleşimidir (örneklem dışı).
+"""
+import logging
+import math
+import os
+import time
+from concurrent.futures import as_completed
+
+import numpy as np
+import pandas as pd
+
+from ..pools import process_pool
+from .data import load_panel
+from .strategies import get_strategy, parameter_grid, positions
+
+logger = logging.getLogger(__name__)
+
+TRADING_DAYS = 252
+
+# Tek yönlü işlem maliyeti (komisyon + kayma), pozisyon değişimi başına
+DEFAULT_COST = 0.001
+
+TRAIN_DAYS = 2 * TRADING_DAYS
+TEST_DAYS = TRADING_DAYS // 2
+
+SELECTION_METRIC = 'sharpe'
+
+# Süreç başına yüklenen panel (bkz. _init_worker)
+_worker_panel = None
+
+
+def strategy_returns(panel, position, cost=DEFAULT_COST):
+    """
+    Hisse bazında günlük net strateji getirileri (tarih x hisse). Gün t kapanışındaki pozisyon
+    t+1 getirisine uygulanır; pozisyon değiştiğinde değişim kadar maliyet düşülür.
+    """
+    held = position.shift(1).fillna(0.0)
+    turnover = (held - held.shift(1).fillna(0.0)).abs()
+    return held * panel.returns.fillna(0.0) - turnover * cost, held
+
+
+def trade_returns(net, held):
+    """Her işlemin (girişten çıkışa) toplam getirisi; tüm hisselerin işlemleri tek dizide."""
+    held = held.to_numpy() > 0
+    log_returns = np.log1p(net.to_numpy())
+    entries = held & ~np.vstack([np.zeros((1, held.shape[1]), dtype=bool), held[:-1]])
+
+    trade_ids = np.cumsum(entries, axis=0)
+    offset = np.concatenate([[0], np.cumsum(trade_ids[-1])[:-1]]) if held.size else 0
+    trade_ids = (trade_ids + offset)[held] - 1
+    if not len(trade_ids):
+        return np.array([])
+    return np.expm1(np.bincount(trade_ids, weights=log_returns[held]))
+
+
+def summarize(daily, trades=None, exposure=None):
+    """Günlük portföy getirisi serisinden rapor: getiri, oynaklık, Sharpe, en büyük düşüş, isabet oranı."""
+    daily = daily.dropna()
+    if daily.empty:
+        return {'days': 0}
+
+    equity = (1 + daily).cumprod()
+    drawdown = equity / equity.cummax() - 1
+    years = len(daily) / TRADING_DAYS
+    total_return = equity.iloc[-1] - 1
+    volatility = daily.std() * math.sqrt(TRADING_DAYS)
+
+    report = {
+        'days': int(len(daily)),
+        'start': daily.index[0].date().isoformat(),
+        'end': daily.index[-1].date().isoformat(),
+        'total_return': float(total_return * 100),
+        'annual_return': float(((1 + total_return) ** (1 / years) - 1) * 100) if total_return > -1 else -100.0,
+        'annual_volatility': float(volatility * 100),
+        'sharpe': float(daily.mean() * TRADING_DAYS / volatility) if volatility > 0 else 0.0,
+        'max_drawdown': float(drawdown.min() * 100),
+        'positive_days': float((daily > 0).sum() / max((daily != 0).sum(), 1) * 100),
+    }
+    if trades is not None:
+        report['trades'] = int(len(trades))
+        report['hit_rate'] = float((trades > 0).mean() * 100) if len(trades) else 0.0
+        report['average_trade'] = float(trades.mean() * 100) if len(trades) else 0.0
+    if exposure is not None:
+        report['exposure'] = float(exposure * 100)
+    return report
+
+
+def evaluate(panel, name, params, cost=DEFAULT_COST):
+    """
+    Tek parametre kombinasyonunu tüm hisselerde değerlendirir.
+    (günlük portföy getirisi, rapor, hisse bazında toplam getiri %) döndürür.
+    """
+    net, held = strategy_returns(panel, positions(panel, name, params), cost)
+    # Fiyatı olan hisseler arasında eşit ağırlık; nakitte kalan pay getiri üretmez
+    active = panel.close.notna()
+    daily = net.where(active).mean(axis=1)
+    daily = daily.iloc[1:]
+
+    trades = trade_returns(net, held)
+    exposure = held.where(active).mean().mean()
+    per_symbol = (np.expm1(np.log1p(net).sum()) * 100).round(2)
+    return daily, summarize(daily, trades, exposure), per_symbol.to_dict()
+
+
+def _scores(frame, metric):
+    # Sharpe tüm sütunlar için tek seferde hesaplanır; diğer ölçütler summarize ile
+    if metric == 'sharpe':
+        volatility = frame.std() * math.sqrt(TRADING_DAYS)
+        return (frame.mean() * TRADING_DAYS / volatility).where(volatility > 0, 0.0).to_dict()
+    return {key: summarize(frame[key]).get(metric, -np.inf) for key in frame.columns}
+
+
+def walk_forward(series, train_days=TRAIN_DAYS, test_days=TEST_DAYS, metric=SELECTION_METRIC):
+    """
+    series: {parametre anahtarı: günlük portföy getirisi}. Her eğitim penceresinde metric'e göre
+    en iyi parametreyi seçer, sonraki test penceresinde uygular. (örneklem dışı getiri, pencereler)
+    """
+    frame = pd.DataFrame(series)
+    windows, parts = [], []
+    for start in range(train_days, len(frame), test_days):
+        train = frame.iloc[start - train_days:start]
+        test = frame.iloc[start:start + test_days]
+        scores = _scores(train, metric)
+        best = max(scores, key=scores.get)
+        parts.append(test[best])
+        windows.append({
+            'train_start': train.index[0].date().isoformat(),
+            'test_start': test.index[0].date().isoformat(),
+            'test_end': test.index[-1].date().isoformat(),
+            'params': best,
+            f'train_{metric}': round(float(scores[best]), 3),
+            'test_return': round(float(((1 + test[best]).prod() - 1) * 100), 2),
+        })
+
+    out_of_sample = pd.concat(parts) if parts else pd.Series(dtype=float)
+    return out_of_sample, windows
+
+
+def _params_key(params):
+    return ', '.join(f"{key}={value}" for key, value in sorted(params.items())) or 'varsayılan'
+
+
+def _init_worker(symbols, start, end, indicators):
+    global _worker_panel
+    if _worker_panel is None:
+        _worker_panel = load_panel(symbols, start, end, indicators)
+
+
+def _evaluate_in_worker(name, params, cost):
+    daily, report, per_symbol = evaluate(_worker_panel, name, params, cost)
+    return params, daily, report, per_symbol
+
+
+def run_backtest(name, grid=None, symbols=None, start=None, end=None, cost=DEFAULT_COST,
+                 train_days=TRAIN_DAYS, test_days=TEST_DAYS, max_workers=None, progress=None):
+    """
+    Stratejinin parametre taramasını (grid verilmezse varsayılan tarama) hisselerin tamamında
+    çalıştırır ve walk-forward doğrulama yapar. Sonuçlar Sharpe oranına göre sıralıdır.
+    """
+    report = progress or (lambda percent, message: None)
+    started = time.monotonic()
+    strategy = get_strategy(name)
+    combinations = parameter_grid(name, grid)
+    if not combinations:
+        raise ValueError("Geçerli parametre kombinasyonu yok.")
+
+    indicators = strategy['indicators']
+    max_workers = min(max_workers or os.cpu_count() or 1, len(combinations))
+    outcomes = []
+
+    report(5, "Veriler yükleniyor")
+    panel = load_panel(symbols, start, end, indicators)
+
+    if max_workers == 1:
+        for index, params in enumerate(combinations):
+            outcomes.append((params, *evaluate(panel, name, params, cost)))
+            report(10 + 80 * (index + 1) // len(combinations), f"{_params_key(params)} değerlendirildi")
+    else:
+        global _worker_panel
+        # fork ile başlayan süreçler paneli kopyalamadan devralır; spawn ile başlayanlar yeniden yükler
+        _worker_panel = panel
+        try:
+            with process_pool(max_workers, _init_worker, (symbols, start, end, indicators)) as executor:
+                futures = [executor.submit(_evaluate_in_worker, name, params, cost) for params in combinations]
+                for future in as_completed(futures):
+                    outcomes.append(future.result())
+                    params = outcomes[-1][0]
+                    report(10 + 80 * len(outcomes) // len(combinations), f"{_params_key(params)} değerlendirildi")
+        finally:
+            _worker_panel = None
+
+    results = sorted(
+        ({'params': params, **summary} for params, _, summary, _ in outcomes),
+        key=lambda item: item.get('sharpe', -np.inf), reverse=True,
+    )
+    best_params = results[0]['params']
+    best_symbols = next(per_symbol for params, _, _, per_symbol in outcomes if params == best_params)
+
+    report(95, "Walk-forward doğrulama")
+    series = {_params_key(params): daily for params, daily, _, _ in outcomes}
+    out_of_sample, windows = walk_forward(series, train_days, test_days)
+
+    first_daily = outcomes[0][1]
+    duration = time.monotonic() - started
+    logger.info("Geriye dönük test %s: %s kombinasyon, %.1f sn", name, len(combinations), duration)
+    return {
+        'strategy': name,
+        'description': strategy['description'],
+        'symbols': len(best_symbols),
+        'start': first_daily.index[0].date().isoformat() if len(first_daily) else None,
+        'end': first_daily.index[-1].date().isoformat() if len(first_daily) else None,
+        'cost': cost,
+        'results': results,
+        'best': results[0],
+        'best_by_symbol': best_symbols,
+        'walk_forward': {**summarize(out_of_sample), 'windows': windows},
+        'duration': round(duration, 2),
+    }
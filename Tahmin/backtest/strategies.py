@@ -0,0 +1,110 @@
+"""
+StockAnalysis göstergelerinden vektörel sinyal stratejileri.
+
+Her strateji BacktestPanel ve parametreleri alıp tüm hisseler için aynı anda bir pozisyon
+matrisi (tarih x hisse, 1 = alımda, 0 = nakitte) döndürür. Pozisyon günün kapanışındaki
+bilgiyle belirlenir ve ertesi günün getirisine uygulanır (bkz. engine). Yeni stratejiler
+register_strategy ile eklenir.
+"""
+import itertools
+
+import numpy as np
+import pandas as pd
+
+STRATEGIES = {}
+
+
+def register_strategy(name, indicators=(), grid=None, constraint=None):
+    """
+    Stratejiyi kaydeder. indicators: gereken StockAnalysis alanları, grid: parametre taraması
+    için varsayılan değerler ({parametre: [değerler]}), constraint: geçerli kombinasyon koşulu.
+    """
+    def decorator(func):
+        STRATEGIES[name] = {
+            'func': func,
+            'indicators': tuple(indicators),
+            'grid': grid or {},
+            'constraint': constraint,
+            'description': (func.__doc__ or '').strip(),
+        }
+        return func
+    return decorator
+
+
+def get_strategy(name):
+    if name not in STRATEGIES:
+        raise ValueError(f"Geçersiz strateji: {name}")
+    return STRATEGIES[name]
+
+
+def parameter_grid(name, grid=None):
+    """Stratejinin parametre kombinasyonları (verilen ya da varsayılan taramaya göre)."""
+    strategy = get_strategy(name)
+    grid = grid or strategy['grid']
+    keys = sorted(grid)
+    combinations = [dict(zip(keys, values)) for values in itertools.product(*(grid[key] for key in keys))]
+    if strategy['constraint'] is not None:
+        combinations = [params for params in combinations if strategy['constraint'](params)]
+    return combinations
+
+
+def positions(panel, name, params):
+    """Stratejinin pozisyon matrisi; gösterge verisi olmayan günlerde pozisyon 0'dır."""
+    result = get_strategy(name)['func'](panel, **params)
+    return result.where(panel.close.notna(), 0).astype(float)
+
+
+def _hold(entry, exit):
+    # Giriş sinyaliyle açılan pozisyon çıkış sinyaline kadar tutulur (aynı gün ikisi de varsa giriş geçerli)
+    state = pd.DataFrame(np.nan, index=entry.index, columns=entry.columns)
+    state = state.mask(exit, 0.0).mask(entry, 1.0)
+    return state.ffill().fillna(0.0)
+
+
+@register_strategy(
+    'ma_crossover',
+    indicators=('ma_5', 'ma_10', 'ma_20', 'ma_50', 'ma_100', 'ma_200'),
+    grid={'fast': [5, 10, 20, 50], 'slow': [50, 100, 200]},
+    constraint=lambda params: params['fast'] < params['slow'],
+)
+def ma_crossover(panel, fast=50, slow=200):
+    """Kısa hareketli ortalama uzun ortalamanın üzerindeyken alımda kalır."""
+    return (panel.indicator(f'ma_{fast}') > panel.indicator(f'ma_{slow}')).astype(float)
+
+
+@register_strategy(
+    'rsi',
+    indicators=('rsi',),
+    grid={'lower': [20, 25, 30, 35], 'upper': [60, 65, 70, 75, 80]},
+    constraint=lambda params: params['lower'] < params['upper'],
+)
+def rsi_reversion(panel, lower=30, upper=70):
+    """RSI aşırı satım seviyesinin altına inince alır, aşırı alım seviyesini geçince satar."""
+    rsi = panel.indicator('rsi')
+    return _hold(rsi < lower, rsi > upper)
+
+
+@register_strategy(
+    'macd',
+    indicators=('macd', 'macd_signal', 'macd_hist'),
+    grid={'mode': ['signal', 'zero'], 'threshold': [0.0, 0.1]},
+)
+def macd_trend(panel, mode='signal', threshold=0.0):
+    """
+    MACD sinyal çizgisinin (mode='signal') ya da sıfırın (mode='zero') üzerindeyken alımda kalır.
+    threshold, fiyata oranla (%) gereken en küçük farktır.
+    """
+    base = panel.indicator('macd_signal') if mode == 'signal' else 0.0
+    spread = (panel.indicator('macd') - base) / panel.close * 100
+    return (spread > threshold).astype(float)
+
+
+@register_strategy(
+    'bollinger',
+    indicators=('bollinger_lower', 'bollinger_middle', 'bollinger_upper'),
+    grid={'exit': ['middle', 'upper']},
+)
+def bollinger_reversion(panel, exit='middle'):
+    """Kapanış alt bandın altına inince alır, orta (ya da üst) banda ulaşınca satar."""
+    close = panel.close
+    return _hold(close < panel.indicator('bollinger_lower'), close > panel.indicator(f'bollinger_{exit}'))
@@ -0,0 +1,191 @@
+"""
+Günlük fiyatlardan türetilen haftalık ve aylık OHLCV barları (PriceBar tablosu).
+
+Haftalar Pazartesi, aylar ayın ilk günü başlar; barın tarihi dönemin son işlem günüdür.
+Barlar fiyat aktarımında artımlı olarak güncellenir: yalnızca yeni fiyatların düştüğü dönemden
+itibaren okunur, yeniden hesaplanır ve yazılır. Çok zaman dilimli göstergeler ve grafikler
+günlük fiyatları her seferinde gruplamak yerine hazır barları okur (bkz. load_bars).
+
+Gruplama vektöreldir: her günün dönem başlangıcı tarih aritmetiğiyle bulunur, dönem sınırları
+ardışık farklardan çıkarılır ve açılış/yüksek/düşük/kapanış/hacim reduceat ile tek geçişte
+hesaplanır.
+"""
+import logging
+
+import numpy as np
+import pandas as pd
+from django.db import transaction
+from django.db.models import Count, Max, Sum
+
+from .columnar import PRICE_COLUMNS
+from .models import PriceBar, Stock, StockPrice
+
+logger = logging.getLogger(__name__)
+
+TIMEFRAMES = tuple(code for code, _ in PriceBar.TIMEFRAME_CHOICES)
+
+BAR_COLUMNS = ('open', 'high', 'low', 'close', 'volume')
+
+BULK_BATCH_SIZE = 1000
+
+
+def period_starts(dates, timeframe):
+    """Her günün bulunduğu dönemin ilk günü (datetime64[D]); W: Pazartesi, M: ayın ilk günü."""
+    days = np.asarray(dates, dtype='datetime64[D]')
+    if timeframe == 'W':
+        # 1970-01-01 Perşembe'dir; Pazartesi'ye olan uzaklık (gün + 3) mod 7
+        return days - ((days.astype(np.int64) + 3) % 7).astype('timedelta64[D]')
+    if timeframe == 'M':
+        return days.astype('datetime64[M]').astype('datetime64[D]')
+    raise ValueError(f"Geçersiz zaman dilimi: {timeframe}")
+
+
+def _empty_bars():
+    return {
+        'period_start': np.array([], dtype='datetime64[D]'),
+        'last_date': np.array([], dtype='datetime64[D]'),
+        **{column: np.array([], dtype=float) for column in BAR_COLUMNS},
+        'day_count': np.array([], dtype=np.int64),
+    }
+
+
+def aggregate_bars(prices, timeframe):
+    """
+    Tarih sıralı fiyat sütunlarından ('date', 'open', 'high', 'low', 'close', 'volume'; bkz.
+    columnar.price_columns) dönem barları: {'period_start', 'last_date', 'open', 'high', 'low',
+    'close', 'volume', 'day_count'}.
+    """
+    dates = np.asarray(prices['date'], dtype='datetime64[D]')
+    if not len(dates):
+        return _empty_bars()
+
+    starts = period_starts(dates, timeframe)
+    first = np.flatnonzero(np.r_[True, starts[1:] != starts[:-1]])
+    last = np.r_[first[1:], len(dates)] - 1
+    column = {name: np.asarray(prices[name], dtype=float) for name in BAR_COLUMNS}
+
+    return {
+        'period_start': starts[first],
+        'last_date': dates[last],
+        'open': column['open'][first],
+        # Boş (NaN) değerler yüksek/düşük hesabında yok sayılır
+        'high': np.fmax.reduceat(column['high'], first),
+        'low': np.fmin.reduceat(column['low'], first),
+        'close': column['close'][last],
+        'volume': np.add.reduceat(np.nan_to_num(column['volume']), first),
+        'day_count': np.diff(np.r_[first, len(dates)]),
+    }
+
+
+def _read_prices(queryset):
+    rows = list(queryset.order_by('date').values_list('date', *PRICE_COLUMNS.values()))
+    frame = pd.DataFrame.from_records(rows, columns=['date', *PRICE_COLUMNS])
+    data = {'date': pd.to_datetime(frame['date']).to_numpy(dtype='datetime64[D]')}
+    for column in PRICE_COLUMNS:
+        data[column] = frame[column].to_numpy(dtype=float, na_value=np.nan)
+    return data
+
+
+def _bar_objects(stock, timeframe, bars):
+    return [
+        PriceBar(
+            stock=stock, timeframe=timeframe, period_start=period_start.item(), last_date=last_date.item(),
+            open=float(open_), high=float(high), low=float(low), close=float(close), volume=int(volume),
+            day_count=int(day_count),
+        )
+        for period_start, last_date, open_, high, low, close, volume, day_count in zip(
+            bars['period_start'], bars['last_date'], bars['open'], bars['high'], bars['low'],
+            bars['close'], bars['volume'], bars['day_count'],
+        )
+    ]
+
+
+def update_price_bars(stock, since=None):
+    """
+    Hissenin barlarını günceller. since verilirse yalnızca o tarihi içeren dönemden itibaren
+    barlar yeniden hesaplanır (yeni eklenen fiyatların en eski tarihi); verilmezse tüm barlar
+    baştan oluşturulur. Yazılan bar sayısını döndürür.
+    """
+    queryset = StockPrice.objects.filter(stock=stock)
+    starts = {}
+    if since is not None:
+        since = np.datetime64(pd.Timestamp(since).date(), 'D')
+        starts = {timeframe: period_starts([since], timeframe)[0] for timeframe in TIMEFRAMES}
+        # Hafta ay başından önce başlayabilir; iki dönemin de tamamı okunur
+        queryset = queryset.filter(date__gte=min(starts.values()).item())
+    prices = _read_prices(queryset)
+
+    written = 0
+    with transaction.atomic():
+        for timeframe in TIMEFRAMES:
+            bars = aggregate_bars(prices, timeframe)
+            existing = PriceBar.objects.filter(stock=stock, timeframe=timeframe)
+            if timeframe in starts:
+                keep = bars['period_start'] >= starts[timeframe]
+                bars = {name: values[keep] for name, values in bars.items()}
+                existing = existing.filter(period_start__gte=starts[timeframe].item())
+            existing.delete()
+            PriceBar.objects.bulk_create(_bar_objects(stock, timeframe, bars), batch_size=BULK_BATCH_SIZE)
+            written += len(bars['period_start'])
+
+    logger.debug("%s: %s bar güncellendi (başlangıç: %s)", stock.symbol, written, since)
+    return written
+
+
+def bars_current(stock_id):
+    """Barlar fiyatlarla tutarlı mı: aylık barların gün sayısı toplamı ve son günü fiyatlarınkiyle aynı olmalı."""
+    bars = PriceBar.objects.filter(stock_id=stock_id, timeframe='M').aggregate(days=Sum('day_count'), last=Max('last_date'))
+    prices = StockPrice.objects.filter(stock_id=stock_id).aggregate(days=Count('id'), last=Max('date'))
+    return (bars['days'] or 0) == prices['days'] and bars['last'] == prices['last']
+
+
+def load_bars(stock_id, timeframe, start=None, end=None):
+    """
+    Hissenin kayıtlı barları dönem sırasıyla sütunlar halinde (bkz. aggregate_bars). start/end
+    verilirse son işlem günü bu aralıktaki barlar döndürülür.
+    """
+    if timeframe not in TIMEFRAMES:
+        raise ValueError(f"Geçersiz zaman dilimi: {timeframe}")
+    queryset = PriceBar.objects.filter(stock_id=stock_id, timeframe=timeframe)
+    if start is not None:
+        queryset = queryset.filter(last_date__gte=start)
+    if end is not None:
+        queryset = queryset.filter(last_date__lte=end)
+
+    rows = list(queryset.order_by('period_start').values_list('period_start', 'last_date', *BAR_COLUMNS, 'day_count'))
+    if not rows:
+        return _empty_bars()
+    period_start, last_date, *columns, day_count = zip(*rows)
+    return {
+        'period_start': np.array(period_start, dtype='datetime64[D]'),
+        'last_date': np.array(last_date, dtype='datetime64[D]'),
+        **{name: np.array(values, dtype=float) for name, values in zip(BAR_COLUMNS, columns)},
+        'day_count': np.array(day_count, dtype=np.int64),
+    }
+
+
+def stock_bars(stock):
+    """
+    Göstergeler için hissenin tüm zaman dilimlerindeki barları: {zaman dilimi: barlar}. Barlar
+    fiyatlarla tutarlı değilse (fiyat başka bir yoldan eklendiyse) önce baştan oluşturulur.
+    """
+    if not bars_current(stock.id):
+        update_price_bars(stock)
+    return {timeframe: load_bars(stock.id, timeframe) for timeframe in TIMEFRAMES}
+
+
+def rebuild_price_bars(stock_ids=None, progress=None):
+    """Fiyatı olan hisselerin (ya da verilenlerin) tüm barlarını baştan oluşturur. Yazılan bar sayısını döndürür."""
+    report = progress or (lambda percent, message: None)
+    stocks = Stock.objects.filter(prices__isnull=False).distinct().order_by('symbol')
+    if stock_ids is not None:
+        stocks = stocks.filter(id__in=list(stock_ids))
+    stocks = list(stocks)
+
+    written = 0
+    for index, stock in enumerate(stocks):
+        written += update_price_bars(stock)
+        report(100 * (index + 1) // max(len(stocks), 1), f"{stock.symbol}: barlar oluşturuldu")
+
+    logger.info("Fiyat barları: %s hisse, %s bar", len(stocks), written)
+    return {'stocks': len(stocks), 'bars': written}
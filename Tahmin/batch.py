@@ -0,0 +1,120 @@
+"""
+uploads/stock_data altındaki tüm hisse klasörlerini paralel olarak işleyen toplu yükleme hattı.
+
+Her hisse klasörü ayrı bir süreçte (bkz. pools.process_pool) ingestion motoruyla işlenir;
+sonuçlar hisse bazında, tamamlandıkça üretilir (generator) ki çağıran taraf ilerlemeyi
+anlık olarak iletebilsin.
+"""
+import logging
+import os
+from concurrent.futures import as_completed
+
+from django.db import connections
+
+from .ingestion import ingest_price_file
+from .models import Stock
+from .pools import process_pool
+
+logger = logging.getLogger(__name__)
+
+STOCK_DATA_DIR = os.path.join('uploads', 'stock_data')
+# Fiyat dosyaları read_table ile okunur; CSV'nin yanında Excel dışa aktarımları da işlenir
+SUPPORTED_EXTENSIONS = ('.csv', '.xlsx', '.xls')
+
+
+def find_stock_folders(base_dir=STOCK_DATA_DIR):
+    """
+    Sistemde kayıtlı hisselere ait klasörleri ve içlerindeki dosyaları bulur.
+    (stock_id, symbol, [dosya yolları]) listesi döndürür; dosyalar isim (zaman damgası) sırasındadır.
+    """
+    if not os.path.isdir(base_dir):
+        return []
+
+    folders = {
+        name: os.path.join(base_dir, name)
+        for name in os.listdir(base_dir)
+        if os.path.isdir(os.path.join(base_dir, name))
+    }
+    stocks = Stock.objects.filter(symbol__in=folders.keys()).values_list('id', 'symbol')
+
+    tasks = []
+    for stock_id, symbol in sorted(stocks, key=lambda item: item[1]):
+        file_paths = [
+            os.path.join(folders[symbol], filename)
+            for filename in sorted(os.listdir(folders[symbol]))
+            if filename.lower().endswith(SUPPORTED_EXTENSIONS)
+        ]
+        if file_paths:
+            tasks.append((stock_id, symbol, file_paths))
+    return tasks
+
+
+def process_stock_folder(stock_id, symbol, file_paths):
+    """
+    Tek bir hissenin tüm dosyalarını sırayla içe aktarır ve hisse bazında özet döndürür.
+    """
+    stock = Stock.objects.get(id=stock_id)
+    result = {
+        'stock': symbol,
+        'status': 'success',
+        'files': len(file_paths),
+        'total_rows': 0,
+        'success_count': 0,
+        'error_count': 0,
+        'duplicate_count': 0,
+        'errors': [],
+    }
+
+    for file_path in file_paths:
+        try:
+            report = ingest_price_file(stock, file_path)
+        except Exception as e:
+            result['errors'].append(f"{os.path.basename(file_path)}: {str(e)}")
+            continue
+
+        for key in ('total_rows', 'success_count', 'error_count', 'duplicate_count'):
+            result[key] += report[key]
+
+    if result['errors']:
+        result['status'] = 'error' if len(result['errors']) == len(file_paths) else 'success'
+        result['message'] = '\n'.join(result['errors'])
+    else:
+        result['message'] = "Başarıyla işlendi"
+
+    connections.close_all()
+    return result
+
+
+def process_all_stock_folders(base_dir=STOCK_DATA_DIR, max_workers=None):
+    """
+    Tüm hisse klasörlerini süreç havuzunda işler ve her hissenin sonucunu tamamlandıkça üretir.
+    max_workers verilmezse çekirdek sayısı kadar süreç kullanılır.
+    """
+    tasks = find_stock_folders(base_dir)
+    if not tasks:
+        return
+
+    max_workers = min(max_workers or os.cpu_count() or 1, len(tasks))
+
+    if max_workers == 1:
+        for task in tasks:
+            yield _safe_process(*task)
+        return
+
+    with process_pool(max_workers) as executor:
+        futures = {executor.submit(process_stock_folder, *task): task[1] for task in tasks}
+        for future in as_completed(futures):
+            symbol = futures[future]
+            try:
+                yield future.result()
+            except Exception as e:
+                logger.exception("%s klasörü işlenemedi", symbol)
+                yield {'stock': symbol, 'status': 'error', 'message': str(e)}
+
+
+def _safe_process(stock_id, symbol, file_paths):
+    try:
+        return process_stock_folder(stock_id, symbol, file_paths)
+    except Exception as e:
+        logger.exception("%s klasörü işlenemedi", symbol)
+        return {'stock': symbol, 'status': 'error', 'message': str(e)}
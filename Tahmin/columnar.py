@@ -0,0 +1,130 @@
+"""
+Hisse bazında sütunsal (NumPy dizileri) fiyat ve analiz önbelleği.
+
+Grafik ve analiz sayfaları binlerce StockPrice/StockAnalysis nesnesi oluşturmak yerine
+buradaki dizileri kullanır. Diziler bir kez okunup Django önbelleğine yazılır; önbellek
+anahtarı hissenin kayıt sayısı ve son değişiklik zamanından üretilen bir parmak izi
+içerdiğinden fiyatlar ya da analiz değiştiğinde (başka bir süreçte bile olsa) eski kayıt
+kendiliğinden geçersiz kalır. Parmak izi tek bir toplama sorgusudur.
+"""
+import logging
+
+import numpy as np
+import pandas as pd
+from django.core.cache import cache
+from django.db.models import Count, Max
+
+from .models import StockPrice, StockAnalysis
+
+logger = logging.getLogger(__name__)
+
+CACHE_TIMEOUT = 60 * 60 * 24
+
+PRICE_COLUMNS = {
+    'open': 'opening_price',
+    'high': 'highest_price',
+    'low': 'lowest_price',
+    'close': 'closing_price',
+    'volume': 'volume',
+}
+
+DATE_LABEL_FORMAT = '%d.%m.%Y'
+
+
+def analysis_columns_list():
+    """Önbelleğe alınan StockAnalysis gösterge alanları (stock, date ve zaman damgaları hariç)."""
+    skip = {'id', 'stock', 'date', 'created_at', 'updated_at'}
+    return [field.name for field in StockAnalysis._meta.concrete_fields if field.name not in skip]
+
+
+def _version(count, latest):
+    return f"{count}:{latest.timestamp() if latest else 0}"
+
+
+def fingerprint(queryset, timestamp_field='updated_at'):
+    """
+    Sorgu kümesinin parmak izi: kayıt sayısı ve en son zaman damgası, tek toplama sorgusuyla.
+    Kayıt eklendiğinde, silindiğinde ya da güncellendiğinde değişir. Fiyat ve analiz verisini
+    önbelleğe alan tüm modüller bu parmak izini kullanır ki aynı değişiklikle birlikte geçersiz kalsınlar.
+    """
+    stats = queryset.aggregate(count=Count('id'), latest=Max(timestamp_field))
+    return _version(stats['count'], stats['latest'])
+
+
+def fingerprints(queryset, group_field, timestamp_field='updated_at'):
+    """group_field değerlerine göre ayrı ayrı parmak izleri (bkz. fingerprint), tek sorguyla: {değer: str}"""
+    rows = queryset.values(group_field).annotate(count=Count('id'), latest=Max(timestamp_field)).order_by()
+    return {row[group_field]: _version(row['count'], row['latest']) for row in rows}
+
+
+def _read_columns(queryset, columns):
+    # columns: {sütun adı: model alanı}; tarih sütunu her zaman ilk sıradadır
+    rows = list(queryset.order_by('date').values_list('date', *columns.values()))
+    frame = pd.DataFrame.from_records(rows, columns=['date', *columns.keys()])
+
+    data = {'date': pd.to_datetime(frame['date']).to_numpy(dtype='datetime64[D]')}
+    for column in columns:
+        data[column] = frame[column].to_numpy(dtype=float, na_value=np.nan)
+    return data
+
+
+def price_version(stock_id):
+    """Hissenin fiyat verisinin sürümü (kayıt sayısı ve son değişiklik zamanı)."""
+    return fingerprint(StockPrice.objects.filter(stock_id=stock_id), 'updated_at')
+
+
+def analysis_version(stock_id):
+    """Hissenin analiz verisinin sürümü (kayıt sayısı ve son oluşturulma zamanı)."""
+    return fingerprint(StockAnalysis.objects.filter(stock_id=stock_id), 'created_at')
+
+
+def _cached(kind, stock_id, queryset, timestamp_field, columns, version=None):
+    version = version or fingerprint(queryset, timestamp_field)
+    key = f"tahmin:columns:{kind}:{stock_id}:{version}"
+    data = cache.get(key)
+    if data is None:
+        data = _read_columns(queryset, columns)
+        cache.set(key, data, CACHE_TIMEOUT)
+        logger.debug("%s önbelleği oluşturuldu: hisse %s, %s satır", kind, stock_id, len(data['date']))
+    return data
+
+
+def price_columns(stock_id, version=None):
+    """
+    Hissenin fiyat geçmişini tarih sırasıyla sütunlar halinde döndürür:
+    {'date': datetime64[D], 'open', 'high', 'low', 'close', 'volume': float64}.
+    Sürüm (price_version) önceden biliniyorsa parmak izi sorgusu tekrarlanmaz.
+    """
+    return _cached(
+        'prices', stock_id, StockPrice.objects.filter(stock_id=stock_id), 'updated_at', PRICE_COLUMNS, version,
+    )
+
+
+def analysis_columns(stock_id, version=None):
+    """
+    Hissenin analiz geçmişini tarih sırasıyla sütunlar halinde döndürür. Anahtarlar 'date' ve
+    StockAnalysis gösterge alanlarıdır; boş değerler NaN'dır.
+    """
+    fields = analysis_columns_list()
+    return _cached(
+        'analysis', stock_id, StockAnalysis.objects.filter(stock_id=stock_id), 'created_at',
+        dict(zip(fields, fields)), version,
+    )
+
+
+def date_labels(dates, date_format=DATE_LABEL_FORMAT):
+    """datetime64 dizisini grafik etiketlerine (gg.aa.yyyy) çevirir."""
+    return pd.DatetimeIndex(dates).strftime(date_format).tolist()
+
+
+def to_list(values, dropna=False):
+    """Float dizisini JSON'a uygun listeye çevirir; NaN değerler None olur ya da atılır."""
+    values = np.asarray(values, dtype=float)
+    missing = np.isnan(values)
+    if dropna:
+        return values[~missing].tolist()
+
+    result = values.tolist()
+    for index in np.flatnonzero(missing):
+        result[index] = None
+    return result
@@ -0,0 +1,386 @@
+"""
+Şirket finansal tablolarından (PDF, Excel veya bunları içeren ZIP arşivleri) veri çıkarma
+ve CompanyFinancial kayıtlarını oluşturma işlemleri.
+"""
+import json
+import logging
+import math
+import os
+import re
+import zipfile
+from concurrent.futures import as_completed
+from datetime import datetime
+
+import pandas as pd
+from django.conf import settings
+
+from .models import CompanyFinancial
+from .parsing import parse_number
+from .pools import process_pool
+from .statements import match_labels, statement_text
+
+logger = logging.getLogger(__name__)
+
+FINANCIAL_FILE_TYPES = ['pdf', 'xls', 'xlsx']
+UPLOAD_FILE_TYPES = ['zip'] + FINANCIAL_FILE_TYPES
+
+FINANCIAL_FIELDS = [
+    'revenue', 'ebitda', 'net_income', 'total_assets', 'total_liabilities', 'equity',
+    'debt_to_equity', 'roe', 'eps', 'dividend', 'dividend_yield', 'pe_ratio', 'pb_ratio', 'ev_ebitda',
+]
+
+# Bulunamadığında 0 yazılan (modelde boş bırakılamayan) alanlar
+REQUIRED_FINANCIAL_FIELDS = ['revenue', 'ebitda', 'net_income', 'total_assets', 'total_liabilities', 'equity']
+
+
+def save_financial_upload(stock, year, period, uploaded_file):
+    """
+    Yüklenen dosyayı financials/<sembol>/<yıl>/<dönem> altına kaydeder; ZIP arşivlerini açar.
+    İşlenecek dosyaların {'path', 'type', 'name'} listesini döndürür.
+    """
+    file_extension = uploaded_file.name.split('.')[-1].lower()
+    # Dosyalar işçi süreçlerde okunacağından mutlak yol kullanılır
+    base_dir = os.path.abspath(os.path.join(settings.MEDIA_ROOT, 'financials', stock.symbol, str(year), period))
+    os.makedirs(base_dir, exist_ok=True)
+    timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
+
+    if file_extension != 'zip':
+        file_path = os.path.join(base_dir, f"{file_extension}_{timestamp}.{file_extension}")
+        with open(file_path, 'wb+') as destination:
+            for chunk in uploaded_file.chunks():
+                destination.write(chunk)
+        return [{'path': file_path, 'type': file_extension, 'name': uploaded_file.name}]
+
+    zip_path = os.path.join(base_dir, f"archive_{timestamp}.zip")
+    with open(zip_path, 'wb+') as destination:
+        for chunk in uploaded_file.chunks():
+            destination.write(chunk)
+
+    extract_dir = os.path.join(base_dir, f"extracted_{timestamp}")
+    os.makedirs(extract_dir, exist_ok=True)
+    with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+        zip_ref.extractall(extract_dir)
+
+    files_to_process = []
+    for root, _, files in os.walk(extract_dir):
+        for file in files:
+            file_ext = file.split('.')[-1].lower()
+            if file_ext in FINANCIAL_FILE_TYPES:
+                files_to_process.append({'path': os.path.join(root, file), 'type': file_ext, 'name': file})
+    return files_to_process
+
+
+def _extraction_tasks(files_to_process):
+    # (dosya sırası, fonksiyon, argümanlar); her dosya ayrı bir görevdir. PDF'ler sayfa aralıklarına
+    # bölünmez: bir raporda yalnızca tablo sayfaları (en fazla 2 x STATEMENT_PAGES) metne çevrilir ve
+    # sonuç önbelleğe alınır (bkz. statements), bu kadar sayfayı süreçlere dağıtmak kazançtan çok
+    # aktarım maliyeti getirir. Paralellik dosyalar arasındadır.
+    extractors = {'pdf': _extract_pdf, 'xls': extract_data_from_excel, 'xlsx': extract_data_from_excel}
+    return [
+        (index, extractors[file_info['type']], (file_info['path'],))
+        for index, file_info in enumerate(files_to_process)
+        if file_info['type'] in extractors
+    ]
+
+
+def _run_tasks(tasks, max_workers):
+    # Tamamlanan görevleri (dosya sırası, sonuç, hata) olarak, tamamlandıkça üretir
+    if max_workers == 1:
+        for index, function, args in tasks:
+            try:
+                yield index, function(*args), None
+            except Exception as e:
+                yield index, None, e
+        return
+
+    with process_pool(max_workers) as executor:
+        futures = {executor.submit(function, *args): index for index, function, args in tasks}
+        for future in as_completed(futures):
+            try:
+                yield futures[future], future.result(), None
+            except Exception as e:
+                yield futures[future], None, e
+
+
+def extract_financial_files(files_to_process, max_workers=None, progress=None):
+    """
+    Dosyalardan finansal verileri süreç havuzunda, dosya başına bir görevle çıkarır. PDF'lerde
+    yalnızca tablo sayfaları okunur (bkz. statements). Sonuçlar tamamlanma sırasından bağımsız
+    olarak dosya sırasıyla birleştirilir: sonraki dosyalarda bulunan değerler öncekilerin
+    üzerine yazılır. (financial_data, warnings) döndürür.
+    """
+    report = progress or (lambda percent, message: None)
+    tasks = _extraction_tasks(files_to_process)
+    max_workers = min(max_workers or os.cpu_count() or 1, len(tasks)) or 1
+
+    extracted, failed = {}, {}
+    for done, (index, result, error) in enumerate(_run_tasks(tasks, max_workers), 1):
+        if error is not None:
+            failed[index] = error
+        else:
+            extracted[index] = result
+        report(100 * done // len(tasks), f"{files_to_process[index]['name']} işlendi ({done}/{len(tasks)})")
+
+    financial_data = dict.fromkeys(FINANCIAL_FIELDS)
+    warnings = []
+    for index, file_info in enumerate(files_to_process):
+        if index in failed:
+            warnings.append(f"{file_info['name']} dosyasından veri çıkarımı sırasında hata: {str(failed[index])}")
+            continue
+        for key, value in extracted.get(index, {}).items():
+            if value is not None and key in financial_data:
+                financial_data[key] = value
+
+    return financial_data, warnings
+
+
+def import_financial_files(stock, year, period, files_to_process, analyze_data=False, max_workers=None, progress=None):
+    """
+    Dosyalardan finansal verileri çıkarır (bkz. extract_financial_files), birleştirir ve
+    CompanyFinancial kaydını oluşturur ya da günceller. (financial, created, warnings) döndürür.
+    """
+    financial_data, warnings = extract_financial_files(files_to_process, max_workers=max_workers, progress=progress)
+
+    defaults = {
+        field: (0 if value is None and field in REQUIRED_FINANCIAL_FIELDS else value)
+        for field, value in financial_data.items()
+    }
+    financial, created = CompanyFinancial.objects.update_or_create(
+        stock=stock, year=year, period=period, defaults=defaults
+    )
+
+    if analyze_data:
+        try:
+            analyze_financial_data(financial)
+        except Exception as e:
+            warnings.append(f"Finansal analiz sırasında hata oluştu: {str(e)}")
+
+    return financial, created, warnings
+
+
+def _extract_pdf(file_path):
+    return extract_data_from_text(statement_text(file_path))
+
+
+def extract_data_from_pdf(file_path):
+    """
+    PDF dosyasının gelir tablosu ve bilanço sayfalarından finansal verileri çıkarır.
+    """
+    try:
+        return _extract_pdf(file_path)
+    except Exception:
+        logger.exception("PDF veri çıkarma hatası: %s", file_path)
+        return {}
+
+
+def extract_data_from_text(text):
+    """
+    PDF'ten çıkarılmış metin içinden finansal verileri etiket kalıplarıyla (bkz.
+    statements.LABEL_PATTERNS) tek geçişte çıkarır.
+    """
+    extracted_data = {field: convert_to_number(value) for field, value in match_labels(text).items()}
+
+    # Eğer bilanço verileri varsa, oranları hesapla
+    if 'total_liabilities' in extracted_data and 'equity' in extracted_data and extracted_data['equity'] > 0:
+        extracted_data['debt_to_equity'] = round(extracted_data['total_liabilities'] / extracted_data['equity'], 2)
+
+    if 'net_income' in extracted_data and 'equity' in extracted_data and extracted_data['equity'] > 0:
+        extracted_data['roe'] = round((extracted_data['net_income'] / extracted_data['equity']) * 100, 2)
+
+    return extracted_data
+
+def extract_data_from_excel(file_path):
+    """
+    Excel dosyasından finansal verileri çıkarır.
+    """
+    extracted_data = {}
+    
+    try:
+        # Pandas ile Excel'i oku
+        df = pd.read_excel(file_path)
+        
+        # Sütun başlıklarını kontrol et 
+        columns = df.columns.str.lower()
+        
+        # Gelir Tablosu Verileri
+        if any(col for col in columns if 'hasılat' in col or 'satış' in col):
+            revenue_col = next((col for col in columns if 'hasılat' in col or 'satış' in col), None)
+            if revenue_col:
+                revenue_value = df[df.columns[columns.get_loc(revenue_col)]].iloc[0]
+                if not pd.isna(revenue_value):
+                    extracted_data['revenue'] = convert_to_number(revenue_value)
+        
+        if any(col for col in columns if 'favök' in col or 'ebitda' in col):
+            ebitda_col = next((col for col in columns if 'favök' in col or 'ebitda' in col), None)
+            if ebitda_col:
+                ebitda_value = df[df.columns[columns.get_loc(ebitda_col)]].iloc[0]
+                if not pd.isna(ebitda_value):
+                    extracted_data['ebitda'] = convert_to_number(ebitda_value)
+        
+        if any(col for col in columns if 'net kar' in col or 'dönem kar' in col):
+            net_income_col = next((col for col in columns if 'net kar' in col or 'dönem kar' in col), None)
+            if net_income_col:
+                net_income_value = df[df.columns[columns.get_loc(net_income_col)]].iloc[0]
+                if not pd.isna(net_income_value):
+                    extracted_data['net_income'] = convert_to_number(net_income_value)
+        
+        # Bilanço Verileri
+        if any(col for col in columns if 'varlık' in col or 'aktif' in col):
+            assets_col = next((col for col in columns if 'varlık' in col or 'aktif' in col), None)
+            if assets_col:
+                assets_value = df[df.columns[columns.get_loc(assets_col)]].iloc[0]
+                if not pd.isna(assets_value):
+                    extracted_data['total_assets'] = convert_to_number(assets_value)
+        
+        if any(col for col in columns if 'yükümlülük' in col or 'borç' in col):
+            liabilities_col = next((col for col in columns if 'yükümlülük' in col or 'borç' in col), None)
+            if liabilities_col:
+                liabilities_value = df[df.columns[columns.get_loc(liabilities_col)]].iloc[0]
+                if not pd.isna(liabilities_value):
+                    extracted_data['total_liabilities'] = convert_to_number(liabilities_value)
+        
+        if any(col for col in columns if 'özkaynak' in col):
+            equity_col = next((col for col in columns if 'özkaynak' in col), None)
+            if equity_col:
+                equity_value = df[df.columns[columns.get_loc(equity_col)]].iloc[0]
+                if not pd.isna(equity_value):
+                    extracted_data['equity'] = convert_to_number(equity_value)
+        
+        # Oranlar
+        if any(col for col in columns if 'f/k' in col or 'fiyat/kazanç' in col):
+            pe_col = next((col for col in columns if 'f/k' in col or 'fiyat/kazanç' in col), None)
+            if pe_col:
+                pe_value = df[df.columns[columns.get_loc(pe_col)]].iloc[0]
+                if not pd.isna(pe_value):
+                    extracted_data['pe_ratio'] = convert_to_number(pe_value)
+        
+        if any(col for col in columns if 'pd/dd' in col or 'piyasa değeri/defter değeri' in col):
+            pb_col = next((col for col in columns if 'pd/dd' in col or 'piyasa değeri/defter değeri' in col), None)
+            if pb_col:
+                pb_value = df[df.columns[columns.get_loc(pb_col)]].iloc[0]
+                if not pd.isna(pb_value):
+                    extracted_data['pb_ratio'] = convert_to_number(pb_value)
+        
+        if any(col for col in columns if 'fd/favök' in col or 'firma değeri/favök' in col):
+            ev_ebitda_col = next((col for col in columns if 'fd/favök' in col or 'firma değeri/favök' in col), None)
+            if ev_ebitda_col:
+                ev_ebitda_value = df[df.columns[columns.get_loc(ev_ebitda_col)]].iloc[0]
+                if not pd.isna(ev_ebitda_value):
+                    extracted_data['ev_ebitda'] = convert_to_number(ev_ebitda_value)
+        
+        # Eğer bilanço verileri varsa, oranları hesapla
+        if 'total_liabilities' in extracted_data and 'equity' in extracted_data and extracted_data['equity'] > 0:
+            extracted_data['debt_to_equity'] = round(extracted_data['total_liabilities'] / extracted_data['equity'], 2)
+        
+        if 'net_income' in extracted_data and 'equity' in extracted_data and extracted_data['equity'] > 0:
+            extracted_data['roe'] = round((extracted_data['net_income'] / extracted_data['equity']) * 100, 2)
+        
+        return extracted_data
+        
+    except Exception:
+        logger.exception("Excel veri çıkarma hatası: %s", file_path)
+        return {}
+
+def convert_to_number(value):
+    """
+    Metinsel değeri sayıya dönüştürür; para birimi gibi sayı dışı karakterler atılır.
+    Çevrilemeyen değerler için 0 döndürür.
+    """
+    if isinstance(value, str):
+        value = re.sub(r'[^\d,.]', '', value)
+    # Excel hücrelerinden gelen NumPy sayıları da dahil
+    number = parse_number(value)
+    return 0 if math.isnan(number) else number
+
+def analyze_financial_data(financial):
+    """
+    Finansal verileri analiz eder ve çeşitli finansal oranları hesaplar.
+    """
+    analysis_results = {}
+    
+    try:
+        # Temel Oranlar
+        if financial.net_income and financial.revenue and financial.revenue > 0:
+            analysis_results['net_profit_margin'] = round((financial.net_income / financial.revenue) * 100, 2)
+        
+        if financial.ebitda and financial.revenue and financial.revenue > 0:
+            analysis_results['ebitda_margin'] = round((financial.ebitda / financial.revenue) * 100, 2)
+        
+        # Trend Analizi için önceki dönem verisini getir
+        previous_period = None
+        current_period = financial.period
+        current_year = financial.year
+        
+        if current_period == 'Q1':
+            # Önceki yıl Q4
+            previous_period = CompanyFinancial.objects.filter(
+                stock=financial.stock,
+                year=current_year-1,
+                period='Q4'
+            ).first()
+        elif current_period == 'Q2':
+            # Aynı yıl Q1
+            previous_period = CompanyFinancial.objects.filter(
+                stock=financial.stock,
+                year=current_year,
+                period='Q1'
+            ).first()
+        elif current_period == 'Q3':
+            # Aynı yıl Q2
+            previous_period = CompanyFinancial.objects.filter(
+                stock=financial.stock,
+                year=current_year,
+                period='Q2'
+            ).first()
+        elif current_period == 'Q4':
+            # Aynı yıl Q3
+            previous_period = CompanyFinancial.objects.filter(
+                stock=financial.stock,
+                year=current_year,
+                period='Q3'
+            ).first()
+        elif current_period == 'ANNUAL':
+            # Önceki yıl ANNUAL
+            previous_period = CompanyFinancial.objects.filter(
+                stock=financial.stock,
+                year=current_year-1,
+                period='ANNUAL'
+            ).first()
+        
+        # Büyüme oranları
+        if previous_period:
+            if financial.revenue and previous_period.revenue and previous_period.revenue > 0:
+                analysis_results['revenue_growth'] = round(((financial.revenue - previous_period.revenue) / previous_period.revenue) * 100, 2)
+            
+            if financial.net_income and previous_period.net_income and previous_period.net_income > 0:
+                analysis_results['net_income_growth'] = round(((financial.net_income - previous_period.net_income) / previous_period.net_income) * 100, 2)
+            
+            if financial.ebitda and previous_period.ebitda and previous_period.ebitda > 0:
+                analysis_results['ebitda_growth'] = round(((financial.ebitda - previous_period.ebitda) / previous_period.ebitda) * 100, 2)
+        
+        # Değerleme ölçütleri açıklamaları
+        if financial.pe_ratio:
+            if financial.pe_ratio < 10:
+                analysis_results['pe_ratio_comment'] = "Düşük F/K oranı (potansiyel olarak değerli)"
+            elif financial.pe_ratio > 20:
+                analysis_results['pe_ratio_comment'] = "Yüksek F/K oranı (potansiyel olarak pahalı)"
+            else:
+                analysis_results['pe_ratio_comment'] = "Orta düzey F/K oranı"
+        
+        if financial.debt_to_equity:
+            if financial.debt_to_equity < 0.5:
+                analysis_results['debt_to_equity_comment'] = "Düşük borç/özsermaye oranı (güçlü finansal yapı)"
+            elif financial.debt_to_equity > 1.5:
+                analysis_results['debt_to_equity_comment'] = "Yüksek borç/özsermaye oranı (riskli finansal yapı)"
+            else:
+                analysis_results['debt_to_equity_comment'] = "Orta düzey borç/özsermaye oranı"
+        
+        # Analiz sonuçlarını JSON olarak sakla
+        financial.extra_data = json.dumps(analysis_results)
+        financial.save()
+        
+        return analysis_results
+        
+    except Exception:
+        logger.exception("Finansal analiz hatası: %s", financial)
+        return {}
@@ -0,0 +1,380 @@
+"""
+StockAnalysis tablosundaki teknik göstergeleri NumPy/pandas kayan pencereleriyle hesaplayan motor.
+
+Bir hissenin tüm fiyat geçmişi tek sorguyla sütun dizilerine okunur, bütün göstergeler
+tek geçişte vektörel olarak hesaplanır ve sonuçlar bulk_create ile yazılır.
+"""
+import logging
+
+import numpy as np
+import pandas as pd
+from django.db import models, transaction
+from numpy.lib.stride_tricks import sliding_window_view
+
+from .bars import aggregate_bars, stock_bars
+from .models import MacroeconomicData, StockAnalysis, StockPrice
+
+logger = logging.getLogger(__name__)
+
+DAILY_MA_WINDOWS = (5, 10, 20, 50, 100, 200)
+WEEKLY_MA_WINDOW = 30   # hafta (weekly_ma)
+MONTHLY_MA_WINDOW = 12  # ay (monthly_ma)
+YEARLY_MA_WINDOW = 36   # ay, 3 yıllık ortalama (yearly_ma)
+
+EMA_FAST = 12
+EMA_SLOW = 26
+MACD_SIGNAL = 9
+WMA_WINDOW = 20
+RSI_PERIOD = 14
+STOCHASTIC_PERIOD = 14
+STOCHASTIC_SMOOTHING = 3
+CCI_PERIOD = 20
+BOLLINGER_WINDOW = 20
+BOLLINGER_WIDTH = 2
+ATR_PERIOD = 14
+MOMENTUM_PERIOD = 10
+WILLIAMS_PERIOD = 14
+MFI_PERIOD = 14
+SUPPORT_RESISTANCE_WINDOW = 20
+FIBONACCI_WINDOW = 100
+VOLATILITY_WINDOW = 20
+RISK_WINDOW = 252  # beta, Sharpe ve Sortino için yaklaşık bir işlem yılı
+TRADING_DAYS = 252
+
+FIBONACCI_LEVELS = {
+    'fib_0_236': 0.236,
+    'fib_0_382': 0.382,
+    'fib_0_5': 0.5,
+    'fib_0_618': 0.618,
+    'fib_0_786': 0.786,
+    'fib_1_0': 1.0,
+}
+
+# Artımlı güncellemede önceki günlerden taşınan değerler (üssel ortalamalar ve OBV birikimi)
+CARRY_FIELDS = ('ema_12', 'ema_26', 'macd_signal', 'obv')
+
+BULK_BATCH_SIZE = 1000
+
+
+def analysis_fields():
+    """StockAnalysis'in gösterge alanlarının (FloatField) adları, model sırasıyla."""
+    return [field.name for field in StockAnalysis._meta.fields if isinstance(field, models.FloatField)]
+
+
+def load_price_frame(stock, start_date=None):
+    """Hissenin fiyat geçmişini tarih sırasıyla float sütunlu bir DataFrame olarak okur."""
+    prices = StockPrice.objects.filter(stock=stock)
+    if start_date is not None:
+        prices = prices.filter(date__gte=start_date)
+
+    rows = prices.order_by('date').values_list(
+        'date', 'opening_price', 'highest_price', 'lowest_price', 'closing_price', 'volume'
+    )
+    frame = pd.DataFrame.from_records(list(rows), columns=['date', 'open', 'high', 'low', 'close', 'volume'])
+    for column in ('open', 'high', 'low', 'close', 'volume'):
+        frame[column] = frame[column].astype(float)
+    frame['date'] = pd.to_datetime(frame['date'])
+    return frame
+
+
+def load_benchmark(start_date=None):
+    """Beta hesabı için BIST 100 kapanışlarını (MacroeconomicData) tarih indeksli seri olarak okur."""
+    data = MacroeconomicData.objects.filter(bist100_close__isnull=False)
+    if start_date is not None:
+        data = data.filter(date__gte=start_date)
+
+    rows = list(data.order_by('date').values_list('date', 'bist100_close'))
+    if not rows:
+        return None
+
+    benchmark = pd.DataFrame.from_records(rows, columns=['date', 'close'])
+    benchmark = benchmark.drop_duplicates('date', keep='last')
+    return pd.Series(benchmark['close'].astype(float).values, index=pd.to_datetime(benchmark['date']))
+
+
+def _wilder(series, period):
+    # Wilder yumuşatması: alpha = 1 / period olan üssel ortalama
+    return series.ewm(alpha=1 / period, adjust=False, min_periods=period).mean()
+
+
+def _pad(values, window, length):
+    # Kayan pencere sonuçlarının başına pencere dolana kadar NaN ekler
+    return np.concatenate([np.full(min(window - 1, length), np.nan), values])
+
+
+def _wma(values, window):
+    if len(values) < window:
+        return np.full(len(values), np.nan)
+    weights = np.arange(1, window + 1, dtype=float)
+    return _pad(sliding_window_view(values, window) @ weights / weights.sum(), window, len(values))
+
+
+def _rolling_mean_deviation(values, window):
+    if len(values) < window:
+        return np.full(len(values), np.nan)
+    windows = sliding_window_view(values, window)
+    deviation = np.abs(windows - windows.mean(axis=1, keepdims=True)).mean(axis=1)
+    return _pad(deviation, window, len(values))
+
+
+def _period_ma(dates, closes, bars, window):
+    """
+    Haftalık/aylık kapanışların (bkz. bars.aggregate_bars) hareketli ortalamasını günlük satırlara
+    eşler. Her gün, içinde bulunduğu dönem o günün kapanışıyla kapanmış sayılır: ortalama önceki
+    window - 1 dönemin kapanışı ile günün kapanışından hesaplanır. Böylece bir günün değeri yalnızca
+    o güne kadarki fiyatlara bağlıdır; dönemin sonraki günleri eklendiğinde değişmez (artımlı
+    güncelleme tam hesaplamayla aynı sonucu verir). Dönemin son günü tamamlanmış dönemin ortalamasıdır.
+    """
+    if not len(bars['close']):
+        return np.full(len(dates), np.nan)
+    previous = pd.Series(bars['close'], dtype=float).rolling(window - 1).sum().shift(1).to_numpy()
+    index = np.searchsorted(bars['period_start'], dates.to_numpy(dtype='datetime64[D]'), side='right') - 1
+    return np.where(index >= 0, (previous[np.clip(index, 0, None)] + closes) / window, np.nan)
+
+
+def _carry_ema(series, span, position, start):
+    # position satırındaki değeri start kabul edip üssel ortalamayı oradan devam ettirir
+    result = series.ewm(span=span, adjust=False).mean()
+    if position is None or start is None:
+        return result
+
+    tail = series.iloc[position:].copy()
+    tail.iloc[0] = start
+    result.iloc[position:] = tail.ewm(span=span, adjust=False).mean().to_numpy()
+    return result
+
+
+def compute_indicators(prices, benchmark=None, carry=None, bars=None):
+    """
+    Tarih sıralı fiyat DataFrame'inden (date, open, high, low, close, volume) tüm
+    StockAnalysis göstergelerini hesaplar. Dönen DataFrame'de 'date' ve alan isimleriyle
+    aynı adlı sütunlar bulunur; hesaplanamayan değerler NaN'dır.
+
+    carry verilirse ('date' ve CARRY_FIELDS değerlerini içeren, son analiz gününe ait sözlük),
+    üssel ortalamalar ve OBV o günden itibaren kaydedilmiş değerlerden devam ettirilir.
+
+    bars, haftalık/aylık ortalamalar için hazır barlardır ({'W': ..., 'M': ...}; bkz.
+    bars.stock_bars). Verilmezse fiyatlardan gruplanır.
+    """
+    dates = prices['date'].reset_index(drop=True)
+    close = prices['close'].reset_index(drop=True)
+    high = prices['high'].reset_index(drop=True)
+    low = prices['low'].reset_index(drop=True)
+    volume = prices['volume'].reset_index(drop=True)
+    values = close.to_numpy(dtype=float)
+
+    result = pd.DataFrame({'date': dates.dt.date})
+
+    carry = carry or {}
+    position = None
+    if carry.get('date') is not None:
+        matches = np.flatnonzero(result['date'].to_numpy() == carry['date'])
+        position = int(matches[0]) if len(matches) else None
+
+    # Hareketli ortalamalar (geçmiş yetersizse mevcut günlerin ortalaması alınır)
+    for window in DAILY_MA_WINDOWS:
+        result[f'ma_{window}'] = close.rolling(window, min_periods=1).mean()
+
+    if bars is None:
+        columns = {'date': dates, 'open': prices['open'], 'high': high, 'low': low, 'close': close, 'volume': volume}
+        bars = {timeframe: aggregate_bars(columns, timeframe) for timeframe in ('W', 'M')}
+    result['weekly_ma'] = _period_ma(dates, values, bars['W'], WEEKLY_MA_WINDOW)
+    result['monthly_ma'] = _period_ma(dates, values, bars['M'], MONTHLY_MA_WINDOW)
+    result['yearly_ma'] = _period_ma(dates, values, bars['M'], YEARLY_MA_WINDOW)
+
+    # Üssel ve ağırlıklı ortalamalar
+    ema_fast = _carry_ema(close, EMA_FAST, position, carry.get('ema_12'))
+    ema_slow = _carry_ema(close, EMA_SLOW, position, carry.get('ema_26'))
+    result['ema_12'] = ema_fast
+    result['ema_26'] = ema_slow
+    result['wma_20'] = _wma(values, WMA_WINDOW)
+
+    # MACD
+    macd = ema_fast - ema_slow
+    result['macd'] = macd
+    result['macd_signal'] = _carry_ema(macd, MACD_SIGNAL, position, carry.get('macd_signal'))
+    result['macd_hist'] = result['macd'] - result['macd_signal']
+
+    # RSI (Wilder)
+    delta = close.diff()
+    average_gain = _wilder(delta.clip(lower=0), RSI_PERIOD)
+    average_loss = _wilder(-delta.clip(upper=0), RSI_PERIOD)
+    result['rsi'] = 100 - 100 / (1 + average_gain / average_loss.replace(0, np.nan))
+    result.loc[(average_loss == 0) & average_gain.notna(), 'rsi'] = 100.0
+
+    # Stokastik osilatör ve Williams %R
+    lowest_low = low.rolling(STOCHASTIC_PERIOD).min()
+    highest_high = high.rolling(STOCHASTIC_PERIOD).max()
+    price_range = (highest_high - lowest_low).replace(0, np.nan)
+    result['stochastic_k'] = 100 * (close - lowest_low) / price_range
+    result['stochastic_d'] = result['stochastic_k'].rolling(STOCHASTIC_SMOOTHING).mean()
+
+    williams_low = low.rolling(WILLIAMS_PERIOD).min()
+    williams_high = high.rolling(WILLIAMS_PERIOD).max()
+    result['williams_r'] = -100 * (williams_high - close) / (williams_high - williams_low).replace(0, np.nan)
+
+    # CCI
+    typical_price = (high + low + close) / 3
+    mean_deviation = pd.Series(_rolling_mean_deviation(typical_price.to_numpy(dtype=float), CCI_PERIOD))
+    result['cci'] = (typical_price - typical_price.rolling(CCI_PERIOD).mean()) / (0.015 * mean_deviation.replace(0, np.nan))
+
+    # Bollinger bantları
+    middle = close.rolling(BOLLINGER_WINDOW).mean()
+    deviation = close.rolling(BOLLINGER_WINDOW).std(ddof=0)
+    result['bollinger_middle'] = middle
+    result['bollinger_upper'] = middle + BOLLINGER_WIDTH * deviation
+    result['bollinger_lower'] = middle - BOLLINGER_WIDTH * deviation
+
+    # ATR (Wilder)
+    previous_close = close.shift(1)
+    true_range = pd.concat([high - low, (high - previous_close).abs(), (low - previous_close).abs()], axis=1).max(axis=1)
+    result['atr'] = _wilder(true_range, ATR_PERIOD)
+
+    result['momentum'] = close - close.shift(MOMENTUM_PERIOD)
+
+    # OBV
+    direction = np.sign(delta.fillna(0))
+    obv = (direction * volume).cumsum()
+    if position is not None and carry.get('obv') is not None:
+        obv = obv - obv.iloc[position] + carry['obv']
+    result['obv'] = obv
+
+    # MFI
+    money_flow = typical_price * volume
+    typical_change = typical_price.diff()
+    positive_flow = money_flow.where(typical_change > 0, 0.0).rolling(MFI_PERIOD).sum()
+    negative_flow = money_flow.where(typical_change < 0, 0.0).rolling(MFI_PERIOD).sum()
+    result['mfi'] = 100 - 100 / (1 + positive_flow / negative_flow.replace(0, np.nan))
+    result.loc[(negative_flow == 0) & positive_flow.notna(), 'mfi'] = 100.0
+
+    # Destek/direnç
+    result['support_level'] = low.rolling(SUPPORT_RESISTANCE_WINDOW).min()
+    result['resistance_level'] = high.rolling(SUPPORT_RESISTANCE_WINDOW).max()
+
+    # Klasik pivot noktaları (bir önceki günün yüksek/düşük/kapanışından)
+    previous_high = high.shift(1)
+    previous_low = low.shift(1)
+    pivot = (previous_high + previous_low + previous_close) / 3
+    result['pivot'] = pivot
+    result['r1'] = 2 * pivot - previous_low
+    result['s1'] = 2 * pivot - previous_high
+    result['r2'] = pivot + (previous_high - previous_low)
+    result['s2'] = pivot - (previous_high - previous_low)
+    result['r3'] = previous_high + 2 * (pivot - previous_low)
+    result['s3'] = previous_low - 2 * (previous_high - pivot)
+
+    # Fibonacci düzeltme seviyeleri (son FIBONACCI_WINDOW günün zirvesinden dibine)
+    swing_high = high.rolling(FIBONACCI_WINDOW, min_periods=1).max()
+    swing_low = low.rolling(FIBONACCI_WINDOW, min_periods=1).min()
+    for field, ratio in FIBONACCI_LEVELS.items():
+        result[field] = swing_high - (swing_high - swing_low) * ratio
+
+    # Risk ölçütleri
+    returns = close.pct_change()
+    result['volatility'] = returns.rolling(VOLATILITY_WINDOW).std() * np.sqrt(TRADING_DAYS) * 100
+
+    mean_return = returns.rolling(RISK_WINDOW).mean()
+    result['sharpe_ratio'] = mean_return / returns.rolling(RISK_WINDOW).std().replace(0, np.nan) * np.sqrt(TRADING_DAYS)
+    downside = np.sqrt((returns.clip(upper=0) ** 2).rolling(RISK_WINDOW).mean())
+    result['sortino_ratio'] = mean_return / downside.replace(0, np.nan) * np.sqrt(TRADING_DAYS)
+
+    if benchmark is not None and not benchmark.empty:
+        benchmark_returns = pd.Series(benchmark.reindex(dates).to_numpy(dtype=float)).pct_change(fill_method=None)
+        covariance = returns.rolling(RISK_WINDOW, min_periods=RISK_WINDOW // 4).cov(benchmark_returns)
+        variance = benchmark_returns.rolling(RISK_WINDOW, min_periods=RISK_WINDOW // 4).var()
+        result['beta'] = covariance / variance.replace(0, np.nan)
+    else:
+        result['beta'] = np.nan
+
+    return result.replace([np.inf, -np.inf], np.nan)
+
+
+def build_analysis_objects(stock, indicators):
+    """
+    compute_indicators çıktısını kaydedilmeye hazır StockAnalysis nesnelerine çevirir.
+    Değerler çift duyarlıklı sayı olarak olduğu gibi yazılır; NaN değerler boş bırakılır.
+    """
+    columns = {}
+    for field in analysis_fields():
+        if field not in indicators:
+            continue
+        series = indicators[field].astype(float)
+        columns[field] = series.astype(object).where(series.notna(), None).tolist()
+
+    fields = list(columns)
+    return [
+        StockAnalysis(stock=stock, date=date, **dict(zip(fields, values)))
+        for date, *values in zip(indicators['date'], *columns.values())
+    ]
+
+
+def rebuild_stock_analysis(stock):
+    """
+    Hissenin tüm analiz geçmişini baştan hesaplar ve kaydeder. Kaydedilen satır sayısını döndürür.
+    """
+    prices = load_price_frame(stock)
+    if prices.empty:
+        return 0
+
+    indicators = compute_indicators(prices, benchmark=load_benchmark(prices['date'].iloc[0]), bars=stock_bars(stock))
+    objects = build_analysis_objects(stock, indicators)
+
+    with transaction.atomic():
+        StockAnalysis.objects.filter(stock=stock).delete()
+        StockAnalysis.objects.bulk_create(objects, batch_size=BULK_BATCH_SIZE)
+
+    logger.info("%s: %s günlük analiz kaydedildi", stock.symbol, len(objects))
+    return len(objects)
+
+
+def warmup_start(last_date):
+    """
+    Artımlı güncelleme için okunması gereken en eski fiyat tarihi: en uzun pencere olan
+    YEARLY_MA_WINDOW ay (ve bir tampon ay) öncesinin ilk günü. 200 günlük, haftalık ve
+    risk pencerelerinin tamamı bu aralığa sığar.
+    """
+    start = pd.Timestamp(last_date) - pd.DateOffset(months=YEARLY_MA_WINDOW + 1)
+    return start.replace(day=1).date()
+
+
+def update_stock_analysis(stock):
+    """
+    Hissenin analizini artımlı olarak günceller: yalnızca son analiz gününden sonraki fiyatlar
+    için göstergeler hesaplanır ve eklenir. Pencereler için gereken geçmiş (warmup_start) ile
+    son analiz gününün üssel ortalama/OBV değerleri okunur; tüm geçmiş yeniden hesaplanmaz.
+
+    Henüz analiz yoksa, son analiz eski sürümle (taşınan değerler boş) üretilmişse ya da
+    analiz edilmiş tarihlerin arasına sonradan fiyat eklenmişse tam yeniden hesaplamaya döner.
+    Eklenen satır sayısını döndürür.
+    """
+    last = (
+        StockAnalysis.objects.filter(stock=stock)
+        .order_by('-date')
+        .values('date', *CARRY_FIELDS)
+        .first()
+    )
+    if last is None or any(last[field] is None for field in CARRY_FIELDS):
+        return rebuild_stock_analysis(stock)
+
+    # Her fiyat gününün bir analiz satırı vardır; sayılar tutmuyorsa geçmişe fiyat eklenmiştir
+    analysed = StockAnalysis.objects.filter(stock=stock, date__lte=last['date']).count()
+    priced = StockPrice.objects.filter(stock=stock, date__lte=last['date']).count()
+    if priced != analysed:
+        return rebuild_stock_analysis(stock)
+
+    if not StockPrice.objects.filter(stock=stock, date__gt=last['date']).exists():
+        return 0
+
+    start_date = warmup_start(last['date'])
+    prices = load_price_frame(stock, start_date=start_date)
+    carry = {'date': last['date'], **{field: float(last[field]) for field in CARRY_FIELDS}}
+
+    indicators = compute_indicators(prices, benchmark=load_benchmark(start_date), carry=carry, bars=stock_bars(stock))
+    indicators = indicators[indicators['date'] > last['date']]
+    objects = build_analysis_objects(stock, indicators)
+
+    # Yalnızca yeni günler eklenir; mevcut analiz satırlarına dokunulmaz
+    StockAnalysis.objects.bulk_create(objects, batch_size=BULK_BATCH_SIZE, ignore_conflicts=True)
+
+    logger.info("%s: %s yeni günlük analiz eklendi", stock.symbol, len(objects))
+    return len(objects)
@@ -0,0 +1,108 @@
+"""
+Hisse fiyat dosyalarını (Investing.com formatındaki CSV/Excel dışa aktarımları)
+toplu olarak veritabanına aktaran motor.
+
+Dosya satır satır değil, sütun bazında (vektörel) işlenir: tarih, fiyat, hacim ve
+değişim sütunları tek seferde dönüştürülür, hissenin mevcut tarihleri tek sorguyla
+okunur ve yeni kayıtlar bulk_create ile partiler halinde yazılır. Sütunlar, dönüşüm ve
+doğrulama kuralları ortak içe aktarma şemasından gelir (bkz. schemas).
+"""
+import logging
+
+from django.utils import timezone
+
+from .schemas import import_frame, parse_frame, read_table, standardize_columns as standardize_schema_columns
+
+logger = logging.getLogger(__name__)
+
+# Standart sütun -> StockPrice alanı (sütun tanımları için bkz. schemas.SCHEMAS['stock_prices'])
+PRICE_FIELDS = {
+    'Open': 'opening_price',
+    'High': 'highest_price',
+    'Low': 'lowest_price',
+    'Close': 'closing_price',
+}
+
+
+def standardize_columns(columns):
+    """
+    Dosya başlığındaki sütun isimlerini standart isimlere çevirir; gerekli sütunlardan
+    biri eksikse ValueError fırlatır.
+    """
+    return standardize_schema_columns('stock_prices', columns)
+
+
+def read_price_file(file_path):
+    """
+    Fiyat dosyasını okur ve sütun isimlerini standart hale getirir.
+    Tüm hücreler metin olarak okunur; sayısal dönüşüm parse_price_frame içinde yapılır.
+    """
+    df = read_table(file_path, as_text=True)
+    df.columns = standardize_columns(df.columns)
+    logger.debug("Mevcut sütunlar: %s", df.columns.tolist())
+    return df
+
+
+def parse_price_frame(df, first_row=2):
+    """
+    Standart sütunlu fiyat DataFrame'ini dönüştürür ve satır bazında doğrular.
+
+    Dönen DataFrame'de 'date', StockPrice fiyat alanları, 'volume', 'daily_change',
+    'row' (dosyadaki satır numarası; ilk veri satırı first_row) ve 'error' (hatalı satırlar
+    için açıklama, aksi halde None) sütunları bulunur. Satırlar dosyadaki sırasını korur.
+    """
+    return parse_frame('stock_prices', df, first_row)
+
+
+def ingest_price_frame(stock, df, first_row=2):
+    """
+    Standart sütunlu fiyat DataFrame'ini hisseye aktarır.
+
+    Mevcut tarihler tek sorguyla okunur; veritabanında veya dosyanın önceki bir satırında
+    bulunan tarihler mükerrer sayılır. Rapor sözlüğü success/duplicate/error sayılarını ve
+    hata ayrıntılarını içerir. Dosya parçalar halinde aktarılıyorsa first_row, parçanın ilk
+    satırının dosyadaki numarasıdır.
+    """
+    return import_frame('stock_prices', df, first_row, stock=stock)
+
+
+def ingest_price_file(stock, file_path):
+    """Fiyat dosyasını okuyup hisseye aktarır ve ingest_price_frame raporunu döndürür."""
+    started = timezone.now()
+    report = ingest_price_frame(stock, read_price_file(file_path))
+    logger.info(
+        "%s: %s satır işlendi (%s yeni, %s mükerrer, %s hata) - %.2f sn",
+        stock.symbol, report['total_rows'], report['success_count'], report['duplicate_count'],
+        report['error_count'], (timezone.now() - started).total_seconds(),
+    )
+    return report
+
+
+def ingest_stock_file(stock_file):
+    """
+    StockFile kaydına ait dosyayı işler ve işleme sonuçlarını kayda yazar.
+    """
+    report = ingest_price_file(stock_file.stock, stock_file.file_path)
+
+    stock_file.is_processed = True
+    stock_file.success_count = report['success_count']
+    stock_file.error_count = report['error_count']
+    stock_file.error_details = '\n'.join(report['error_details'])
+    stock_file.processed_at = timezone.now()
+    stock_file.save()
+
+    return report
+
+
+def format_report_message(report):
+    """İşleme raporundan kullanıcıya gösterilecek özet mesajı oluşturur."""
+    message = f'Dosya işleme tamamlandı:\n'
+    message += f"• Toplam satır sayısı: {report['total_rows']}\n"
+    message += f"• Başarıyla eklenen yeni kayıt: {report['success_count']}\n"
+    message += f"• Zaten mevcut olan kayıt: {report['duplicate_count']}\n"
+    if report['error_count'] > 0:
+        message += f"• Hatalı kayıt: {report['error_count']}\n"
+        message += f"• İşlenemeyen satır oranı: %{(report['error_count'] / report['total_rows'] * 100):.1f}\n"
+
+    message += f"\nGenel başarı oranı: %{report['processed_ratio']:.1f}"
+    return message
@@ -0,0 +1,185 @@
+"""
+Gün içi (dakika/saat) bar deposu.
+
+Barlar satır satır değil, hisse/aralık/gün başına tek bir IntradayBlock satırında saklanır:
+günün tüm barları (time, open, high, low, close, volume) kayıt dizisi olarak paketlenip zlib ile
+sıkıştırılır. Bir hissenin aylarca dakikalık verisi, gün sayısı kadar satırdan tek sorguyla okunup
+doğrudan NumPy dizilerine açılır; bar başına ORM nesnesi oluşturulmaz.
+
+Zamanlar borsa yerel saatiyle (Europe/Istanbul), saat dilimi bilgisi olmadan saklanır.
+"""
+import logging
+import zlib
+
+import numpy as np
+import pandas as pd
+from django.db import transaction
+from django.utils import timezone
+
+from .ingestion import PRICE_FIELDS, read_price_file
+from .models import IntradayBlock
+from .parsing import to_number, to_volume
+
+logger = logging.getLogger(__name__)
+
+BAR_DTYPE = np.dtype([
+    ('time', '<M8[s]'),
+    ('open', '<f8'),
+    ('high', '<f8'),
+    ('low', '<f8'),
+    ('close', '<f8'),
+    ('volume', '<f8'),
+])
+
+BAR_COLUMNS = ('open', 'high', 'low', 'close', 'volume')
+
+INTERVALS = dict(IntradayBlock.INTERVAL_CHOICES)
+
+COMPRESSION_LEVEL = 1
+BULK_BATCH_SIZE = 500
+
+
+def pack_bars(bars):
+    """BAR_DTYPE dizisini sıkıştırılmış baytlara çevirir."""
+    return zlib.compress(np.ascontiguousarray(bars, dtype=BAR_DTYPE).tobytes(), COMPRESSION_LEVEL)
+
+
+def unpack_bars(data):
+    """pack_bars çıktısını BAR_DTYPE dizisine açar."""
+    return np.frombuffer(zlib.decompress(bytes(data)), dtype=BAR_DTYPE)
+
+
+def parse_intraday_frame(df):
+    """
+    Standart sütunlu (bkz. ingestion.read_price_file) gün içi DataFrame'ini dönüştürür.
+    Tarih sütunu saat de içermelidir ('02.01.2024 10:15'); ayrı bir 'Time'/'Saat' sütunu
+    varsa tarihle birleştirilir. (bars, error_details) döndürür; bars zamana göre sıralıdır.
+    """
+    stamps = df['Date'].astype(str).str.strip()
+    time_column = next((col for col in ('Time', 'Saat') if col in df.columns), None)
+    if time_column:
+        stamps = stamps + ' ' + df[time_column].astype(str).str.strip()
+    times = pd.to_datetime(stamps, dayfirst=True, errors='coerce')
+
+    values = {column.lower(): to_number(df[column]) for column in PRICE_FIELDS}
+    values['volume'] = to_volume(df['Volume'])
+
+    valid = times.notna()
+    for column in BAR_COLUMNS:
+        valid &= values[column].notna()
+
+    error_details = [f"Satır {row + 2}: Geçersiz değer" for row in np.flatnonzero(~valid.to_numpy())]
+
+    bars = np.empty(int(valid.sum()), dtype=BAR_DTYPE)
+    bars['time'] = times[valid].to_numpy(dtype='datetime64[s]')
+    for column in BAR_COLUMNS:
+        bars[column] = values[column][valid].to_numpy(dtype=float)
+    return np.sort(bars, order='time', kind='stable'), error_details
+
+
+def merge_bars(existing, new):
+    """İki bar dizisini birleştirir; aynı zamandaki barlarda yeni değer geçerlidir. (bars, yeni_bar_sayısı)"""
+    combined = np.concatenate([new, existing])
+    _, first = np.unique(combined['time'], return_index=True)
+    merged = combined[first]
+    return merged, len(merged) - len(existing)
+
+
+def ingest_intraday_frame(stock, df, interval):
+    """
+    Gün içi barları hisseye aktarır. Etkilenen günlerin blokları tek sorguyla okunur, yeni
+    barlarla birleştirilir ve toplu olarak yazılır. Rapor sözlüğü ingest_price_frame ile
+    aynı alanları içerir; aynı zamana sahip mevcut barlar güncellenir ve mükerrer sayılır.
+    """
+    if interval not in INTERVALS:
+        raise ValueError(f"Geçersiz bar aralığı: {interval}")
+
+    total_rows = len(df)
+    bars, error_details = parse_intraday_frame(df)
+
+    days = bars['time'].astype('datetime64[D]')
+    unique_days, starts = np.unique(days, return_index=True)
+    day_bars = np.split(bars, starts[1:]) if len(bars) else []
+
+    existing = {
+        block.date: block
+        for block in IntradayBlock.objects.filter(
+            stock=stock, interval=interval, date__in=unique_days.astype(object).tolist(),
+        )
+    }
+
+    to_create, to_update = [], []
+    success_count = 0
+    # bulk_update auto_now alanlarını kendisi güncellemez
+    now = timezone.now()
+    for day, new in zip(unique_days.astype(object), day_bars):
+        # Dosyada aynı zaman birden fazla geçiyorsa son satır geçerlidir
+        _, last = np.unique(new['time'][::-1], return_index=True)
+        new = new[::-1][last]
+
+        block = existing.get(day)
+        if block is None:
+            merged, added = new, len(new)
+            block = IntradayBlock(stock=stock, interval=interval, date=day)
+            to_create.append(block)
+        else:
+            merged, added = merge_bars(unpack_bars(block.data), new)
+            block.updated_at = now
+            to_update.append(block)
+
+        block.data = pack_bars(merged)
+        block.bar_count = len(merged)
+        success_count += added
+
+    with transaction.atomic():
+        IntradayBlock.objects.bulk_create(to_create, batch_size=BULK_BATCH_SIZE)
+        IntradayBlock.objects.bulk_update(to_update, ['data', 'bar_count', 'updated_at'], batch_size=BULK_BATCH_SIZE)
+
+    duplicate_count = len(bars) - success_count
+    return {
+        'total_rows': total_rows,
+        'success_count': success_count,
+        'duplicate_count': duplicate_count,
+        'error_count': len(error_details),
+        'error_details': error_details,
+        'processed_ratio': (len(bars) / total_rows * 100) if total_rows else 0,
+        'days': len(unique_days),
+    }
+
+
+def ingest_intraday_file(stock, file_path, interval):
+    """Gün içi fiyat dosyasını (CSV/Excel) okuyup hisseye aktarır."""
+    report = ingest_intraday_frame(stock, read_price_file(file_path), interval)
+    logger.info(
+        "%s (%s): %s satır işlendi (%s yeni, %s mükerrer, %s hata, %s gün)",
+        stock.symbol, interval, report['total_rows'], report['success_count'],
+        report['duplicate_count'], report['error_count'], report['days'],
+    )
+    return report
+
+
+def load_intraday(stock_id, interval, start=None, end=None):
+    """
+    Hissenin [start, end] aralığındaki barlarını zaman sırasıyla sütunlar halinde döndürür:
+    {'time': datetime64[s], 'open', 'high', 'low', 'close', 'volume': float64}. start/end tarih
+    ya da tarih-saat olabilir; yalnızca tarih verilirse günün tamamı dahildir.
+    """
+    queryset = IntradayBlock.objects.filter(stock_id=stock_id, interval=interval)
+    start = pd.Timestamp(start) if start is not None else None
+    end = pd.Timestamp(end) if end is not None else None
+    if start is not None:
+        queryset = queryset.filter(date__gte=start.date())
+    if end is not None:
+        queryset = queryset.filter(date__lte=end.date())
+
+    blocks = [unpack_bars(data) for data in queryset.order_by('date').values_list('data', flat=True)]
+    bars = np.concatenate(blocks) if blocks else np.empty(0, dtype=BAR_DTYPE)
+
+    if start is not None:
+        bars = bars[bars['time'] >= start.to_datetime64()]
+    if end is not None:
+        # Saat belirtilmemişse bitiş gününün tamamı dahil edilir
+        limit = end + pd.Timedelta(days=1) if end == end.normalize() else end + pd.Timedelta(seconds=1)
+        bars = bars[bars['time'] < limit.to_datetime64()]
+
+    return {name: np.array(bars[name]) for name in BAR_DTYPE.names}
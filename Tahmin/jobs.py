@@ -0,0 +1,275 @@
+"""
+Veritabanı tabanlı arka plan iş kuyruğu.
+
+Uzun süren işlemler (dosya işleme, analiz hesaplama, içe aktarma) istek içinde çalıştırılmak
+yerine BackgroundJob tablosuna yazılır; `manage.py run_jobs` ile başlatılan işçi süreçleri
+bekleyen işleri sırayla alıp çalıştırır. Harici bir mesaj kuyruğu gerekmez: işler
+select_for_update(skip_locked=True) ile kilitlenerek alındığından birden fazla işçi aynı
+anda çalışabilir. İşlerin ilerlemesi ve sonucu tabloda tutulur, JSON uç noktalarından izlenir.
+"""
+import logging
+import os
+import socket
+import threading
+import time
+from datetime import timedelta
+
+from django.db import close_old_connections, connection, transaction
+from django.utils import timezone
+
+from .models import BackgroundJob
+
+logger = logging.getLogger(__name__)
+
+# İş tipi -> işleyici fonksiyon. İşleyiciler tasks.py içinde register_job ile kaydedilir.
+JOB_HANDLERS = {}
+
+POLL_INTERVAL = 2.0
+# Bu süre boyunca sinyal vermeyen 'running' işler çökmüş bir işçiye ait sayılır
+STALE_AFTER = timedelta(minutes=30)
+# İşleyici çalıştığı sürece arka plandaki iş parçacığının sinyal (heartbeat_at) yazma aralığı
+HEARTBEAT_INTERVAL = 60.0
+
+
+def register_job(job_type):
+    """İşleyici fonksiyonu verilen iş tipiyle kaydeden dekoratör."""
+    def decorator(func):
+        JOB_HANDLERS[job_type] = func
+        return func
+    return decorator
+
+
+def load_handlers():
+    # İşleyiciler modeller ve ingestion/analiz modüllerine bağlı olduğundan ilk ihtiyaçta yüklenir
+    from . import tasks  # noqa: F401
+    return JOB_HANDLERS
+
+
+class JobContext:
+    """İşleyicilere verilen, ilerleme ve sinyal bildirmeye yarayan nesne."""
+
+    def __init__(self, job):
+        self.job = job
+
+    @property
+    def last_attempt(self):
+        """Bu çalıştırma işin son denemesi mi (başarısız olursa yeniden kuyruğa alınmaz)."""
+        return self.job.attempts >= self.job.max_attempts
+
+    def progress(self, percent, message=''):
+        percent = max(0, min(100, int(percent)))
+        BackgroundJob.objects.filter(id=self.job.id).update(
+            progress=percent,
+            message=message[:255],
+            heartbeat_at=timezone.now(),
+        )
+        self.job.progress = percent
+        self.job.message = message[:255]
+
+
+def enqueue_job(job_type, params=None, user=None, max_attempts=3):
+    """
+    Yeni bir iş kuyruğa ekler ve BackgroundJob kaydını döndürür.
+    params JSON'a çevrilebilir olmalıdır; işleyiciye anahtar kelime argümanı olarak verilir.
+    """
+    if job_type not in load_handlers():
+        raise ValueError(f"Bilinmeyen iş tipi: {job_type}")
+
+    job = BackgroundJob.objects.create(
+        job_type=job_type,
+        params=params or {},
+        created_by=user,
+        max_attempts=max_attempts,
+        message="Kuyrukta bekliyor",
+    )
+    logger.info("İş kuyruğa eklendi: #%s %s", job.id, job_type)
+    return job
+
+
+def run_job_now(job_type, params=None, user=None):
+    """
+    İşi kuyruğa almadan, çağıran süreçte tek denemeyle çalıştırır. Kayıt yine BackgroundJob
+    olarak tutulur; sonucu ya da hatası döndürülen kayıttan okunur.
+    """
+    if job_type not in load_handlers():
+        raise ValueError(f"Bilinmeyen iş tipi: {job_type}")
+
+    now = timezone.now()
+    job = BackgroundJob.objects.create(
+        job_type=job_type,
+        params=params or {},
+        created_by=user,
+        status='running',
+        attempts=1,
+        max_attempts=1,
+        worker=f"{socket.gethostname()}:{os.getpid()}",
+        started_at=now,
+        heartbeat_at=now,
+        message="Çalışıyor",
+    )
+    return run_job(job)
+
+
+def claim_job(worker_name):
+    """
+    Bekleyen en eski işi kilitleyerek alır ve 'running' durumuna çeker.
+    Diğer işçilerin kilitlediği satırlar atlanır. Bekleyen iş yoksa None döndürür.
+    """
+    with transaction.atomic():
+        job = (
+            BackgroundJob.objects.select_for_update(skip_locked=True)
+            .filter(status='pending')
+            .order_by('created_at', 'id')
+            .first()
+        )
+        if job is None:
+            return None
+
+        now = timezone.now()
+        job.status = 'running'
+        job.attempts += 1
+        job.worker = worker_name
+        job.started_at = now
+        job.heartbeat_at = now
+        job.message = "Çalışıyor"
+        job.save(update_fields=['status', 'attempts', 'worker', 'started_at', 'heartbeat_at', 'message'])
+    return job
+
+
+class Heartbeat:
+    """
+    İşleyici çalıştığı sürece işin sinyalini arka planda tazeleyen iş parçacığı. İlerleme
+    bildirmeden uzun süren işleyiciler de böylece STALE_AFTER'ı aşıp yeniden kuyruğa alınmaz.
+    """
+
+    def __init__(self, job, interval=HEARTBEAT_INTERVAL):
+        self.job = job
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"heartbeat-{job.id}", daemon=True)
+
+    def _run(self):
+        try:
+            while not self._stop.wait(self.interval):
+                try:
+                    BackgroundJob.objects.filter(id=self.job.id, status='running').update(heartbeat_at=timezone.now())
+                except Exception:
+                    logger.exception("İş sinyali yazılamadı: #%s", self.job.id)
+        finally:
+            # İş parçacığının kendi veritabanı bağlantısı
+            connection.close()
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
+
+
+def run_job(job):
+    """
+    Alınmış bir işi çalıştırır ve sonucunu (veya hatasını) kayda yazar. Başarısız olan iş
+    deneme hakkı kaldıysa yeniden kuyruğa alınır.
+    """
+    handler = load_handlers().get(job.job_type)
+    started = time.monotonic()
+
+    try:
+        if handler is None:
+            raise ValueError(f"Bilinmeyen iş tipi: {job.job_type}")
+        with Heartbeat(job):
+            result = handler(JobContext(job), **job.params)
+    except Exception as e:
+        logger.exception("İş başarısız oldu: #%s %s", job.id, job.job_type)
+        job.error = str(e)
+        if job.attempts < job.max_attempts:
+            job.status = 'pending'
+            job.message = "Hata oluştu, yeniden denenecek"
+        else:
+            job.status = 'failed'
+            job.message = "Hata oluştu"
+    else:
+        job.status = 'completed'
+        job.result = result
+        job.progress = 100
+        job.message = "Tamamlandı"
+
+    job.finished_at = timezone.now() if job.status != 'pending' else None
+    job.save(update_fields=['status', 'result', 'error', 'progress', 'message', 'finished_at'])
+    logger.info("İş bitti: #%s %s (%s) - %.2f sn", job.id, job.job_type, job.status, time.monotonic() - started)
+    return job
+
+
+def requeue_stale_jobs(stale_after=STALE_AFTER):
+    """
+    Uzun süredir sinyal vermeyen (işçisi çökmüş) işleri yeniden kuyruğa alır;
+    deneme hakkı bitenleri başarısız olarak işaretler.
+    """
+    limit = timezone.now() - stale_after
+
+    failed = 0
+    with transaction.atomic():
+        # Aynı anda çalışan işçiler aynı işi iki kez kuyruğa almasın diye satırlar kilitlenir
+        stale = list(
+            BackgroundJob.objects.select_for_update(skip_locked=True)
+            .filter(status='running', heartbeat_at__lt=limit)
+        )
+        for job in stale:
+            if job.attempts >= job.max_attempts:
+                job.status = 'failed'
+                job.error = "İşçi yanıt vermedi, deneme hakkı doldu"
+                job.finished_at = timezone.now()
+                failed += 1
+            else:
+                job.status = 'pending'
+                job.message = "Yeniden kuyruğa alındı"
+            job.save(update_fields=['status', 'error', 'finished_at', 'message'])
+
+    if stale:
+        logger.warning("%s yarım kalmış iş bulundu (%s başarısız)", len(stale), failed)
+    return len(stale)
+
+
+def run_worker(worker_name=None, poll_interval=POLL_INTERVAL, once=False):
+    """
+    İşçi döngüsü: bekleyen işleri alır ve çalıştırır. once=True ise kuyruk boşaldığında döner.
+    Çalıştırılan iş sayısını döndürür.
+    """
+    worker_name = worker_name or f"{socket.gethostname()}:{os.getpid()}"
+    load_handlers()
+    processed = 0
+
+    logger.info("İşçi başlatıldı: %s", worker_name)
+    while True:
+        close_old_connections()
+        requeue_stale_jobs()
+
+        job = claim_job(worker_name)
+        if job is None:
+            if once:
+                return processed
+            time.sleep(poll_interval)
+            continue
+
+        run_job(job)
+        processed += 1
+
+
+def job_status(job):
+    """İşin durumunu JSON yanıtı için sözlük olarak döndürür."""
+    return {
+        'id': job.id,
+        'job_type': job.job_type,
+        'status': job.status,
+        'status_display': job.get_status_display(),
+        'progress': job.progress,
+        'message': job.message,
+        'result': job.result,
+        'error': job.error or None,
+        'attempts': job.attempts,
+        'created_at': job.created_at.isoformat() if job.created_at else None,
+        'started_at': job.started_at.isoformat() if job.started_at else None,
+        'finished_at': job.finished_at.isoformat() if job.finished_at else None,
+    }
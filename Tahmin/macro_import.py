@@ -0,0 +1,140 @@
+"""
+Makroekonomik veri içe aktarma işlemleri (makro veri, faiz oranları, döviz kurları).
+
+Fonksiyonlar istekten bağımsızdır: okunan DataFrame'i (veya JSON verisini) veritabanına
+yazar ve sonucu bir rapor sözlüğü olarak döndürür. Sütunlar, dönüşüm ve doğrulama kuralları
+içe aktarma şemalarında tanımlıdır; satırlar tek tek değil, tablo olarak toplu
+ekleme/güncelleme ile yazılır (bkz. schemas). Böylece aynı işlemler hem arka plan
+işlerinden hem de komut satırından çağrılabilir. Dosya yapısı hatalıysa ValueError fırlatılır.
+"""
+import logging
+
+import pandas as pd
+
+from .schemas import SCHEMAS, import_frame, parse_frame, standardize_columns, write_parsed
+
+logger = logging.getLogger(__name__)
+
+# Başlık satırı olmadan dışa aktarılmış döviz kuru dosyalarının (Investing.com) sütun sırası
+EXCHANGE_HEADERLESS_COLUMNS = ['Tarih', 'Şimdi', 'Açılış', 'Yüksek', 'Düşük', 'Hac.', 'Fark %']
+
+
+def _report(success_count, error_count, error_details, message, **extra):
+    report = {
+        'success_count': success_count,
+        'error_count': error_count,
+        'error_details': error_details,
+        'message': message,
+    }
+    report.update(extra)
+    return report
+
+
+def import_macro_frame(df):
+    """
+    Makroekonomik veri tablosunu ('tarih' ve MACRO_FIELDS sütunları) içe aktarır. Aynı tarihli
+    kayıt varsa dolu alanları güncellenir, yoksa yeni kayıt eklenir.
+    """
+    result = import_frame('macro', df)
+    return _report(
+        result['success_count'], result['error_count'], result['error_details'],
+        f"{result['success_count']} adet makroekonomik veri başarıyla içe aktarıldı.",
+        updated_count=result['updated_count'],
+    )
+
+
+def import_interest_frame(df):
+    """
+    Birleşik faiz tablosunu (tarih, politika faizi, 2 ve 10 yıllık tahvil faizi) makroekonomik
+    verilere aktarır. Aynı tarihli kayıt varsa yalnızca dolu faiz alanları güncellenir.
+    """
+    result = import_frame('macro_interest', df)
+    return _report(
+        result['success_count'], result['error_count'], result['error_details'],
+        f"{result['success_count']} adet faiz verisi başarıyla kaydedildi/güncellendi.",
+    )
+
+
+def merge_interest_rates(policy_rate_data=None, bond_yield_df=None):
+    """
+    Politika faizi (JSON listesi: date, policy_rate) ve tahvil faizi tablosunu tarih bazında
+    birleştirir. Her iki kaynak da 'interest_rates' şemasıyla dönüştürülür; parse_frame
+    biçiminde (row, alanlar, error) tablo döndürür. Hatalı satırlar birleştirilmeden eklenir.
+    """
+    fields = [spec['field'] for spec in SCHEMAS['interest_rates']['columns'].values()]
+    parts, invalid = [], []
+
+    if policy_rate_data:
+        policy_rate_df = pd.DataFrame(policy_rate_data)
+        policy = parse_frame('interest_rates', policy_rate_df.set_axis(standardize_columns('interest_rates', policy_rate_df.columns), axis=1))
+        invalid.append(policy[policy['error'].notna()])
+        # Aynı tarih birden fazla geçiyorsa son değer kullanılır
+        parts.append(policy.loc[policy['error'].isna(), ['date', 'row', 'policy_rate']].drop_duplicates('date', keep='last'))
+
+    if bond_yield_df is not None:
+        if not set(SCHEMAS['interest_rates']['columns']['date']['headers']) & set(bond_yield_df.columns):
+            raise ValueError('Tahvil faizi dosyasında gerekli sütunlar bulunamadı: tarih')
+        if 'bond_yield_2y' not in bond_yield_df.columns and 'bond_yield_10y' not in bond_yield_df.columns:
+            raise ValueError('Tahvil faizi dosyasında en az bir faiz sütunu (bond_yield_2y veya bond_yield_10y) bulunmalıdır')
+
+        bonds = parse_frame('interest_rates', bond_yield_df.set_axis(standardize_columns('interest_rates', bond_yield_df.columns), axis=1))
+        invalid.append(bonds[bonds['error'].notna()])
+        # Aynı tarih birden fazla geçiyorsa ilk satır kullanılır
+        parts.append(bonds.loc[bonds['error'].isna(), ['date', 'row', 'bond_yield_2y', 'bond_yield_10y']].drop_duplicates('date'))
+
+    merged = parts[0] if parts else pd.DataFrame(columns=['date', 'row'])
+    for part in parts[1:]:
+        merged = merged.merge(part, on='date', how='outer', suffixes=('', '_other'))
+        merged['row'] = merged['row'].fillna(merged.pop('row_other')).astype(int)
+    merged = merged.reindex(columns=fields + ['row']).assign(error=None)
+    merged = merged.astype(object).where(merged.notna(), None)
+    return pd.concat([merged, *invalid], ignore_index=True).reindex(columns=['row', *fields, 'error'])
+
+
+def import_interest_rates(policy_rate_data=None, bond_yield_df=None):
+    """
+    Politika faizi ve tahvil faizi verilerini birleştirip InterestRate tablosuna yazar.
+    Mevcut kayıtlarda yalnızca dolu alanlar güncellenir, yeni kayıtlarda boş alanlar 0 olur.
+    """
+    rates = merge_interest_rates(policy_rate_data, bond_yield_df)
+    if rates.empty:
+        raise ValueError('İşlenecek veri bulunamadı. Lütfen politika faizi veya tahvil faizi verisi ekleyin.')
+
+    # Hiçbir faiz alanı dolu olmayan tarihler atlanır
+    fields = ['policy_rate', 'bond_yield_2y', 'bond_yield_10y']
+    rates = rates[rates[fields].notna().any(axis=1) | rates['error'].notna()]
+    result = write_parsed('interest_rates', rates)
+    for error in result['error_details']:
+        logger.error("Faiz verisi kaydedilemedi: %s", error)
+
+    return _report(
+        result['success_count'], result['error_count'], result['error_details'],
+        f"{result['success_count']} faiz verisi başarıyla yüklendi/güncellendi. {result['error_count']} veri yüklenemedi.",
+    )
+
+
+def import_exchange_frame(df, currency):
+    """
+    Investing.com formatındaki döviz kuru tablosunu (USD/TRY veya EUR/TRY) içe aktarır.
+    Aynı tarih ve para birimi için kayıt varsa güncellenir.
+    """
+    # Başlık satırı olmadan okunan dosyalar için sütun isimlerini ata
+    if 'tarih' not in df.columns and 'Tarih' not in df.columns and len(df.columns) >= 6:
+        df.columns = EXCHANGE_HEADERLESS_COLUMNS[:len(df.columns)]
+
+    result = import_frame('exchange_rates', df, currency=currency)
+    success_count = result['success_count'] - result['updated_count']
+    updated_count = result['updated_count']
+    error_count = result['error_count']
+
+    logger.info("Kayıt özeti: %s yeni, %s güncelleme, %s hata", success_count, updated_count, error_count)
+
+    message = f'{currency}/TRY döviz kuru verileri: '
+    if success_count > 0:
+        message += f'{success_count} yeni kayıt eklendi. '
+    if updated_count > 0:
+        message += f'{updated_count} kayıt güncellendi. '
+    if error_count > 0:
+        message += f'{error_count} işleme hatası. '
+
+    return _report(success_count, error_count, result['error_details'], message.strip(), updated_count=updated_count)
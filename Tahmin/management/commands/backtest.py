@@ -0,0 +1,60 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from Tahmin.backtest import STRATEGIES, run_backtest
+from Tahmin.backtest.engine import DEFAULT_COST, TEST_DAYS, TRAIN_DAYS
+
+
+class Command(BaseCommand):
+    help = (
+        "StockAnalysis sinyallerine dayalı stratejiyi saklanan fiyatlarla geriye dönük test eder: "
+        "parametre taraması (süreç havuzunda) ve walk-forward doğrulama."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('strategy', choices=sorted(STRATEGIES), help="Strateji")
+        parser.add_argument('--symbols', default='', help="Yalnızca bu hisseler (virgülle ayrılmış semboller)")
+        parser.add_argument('--start', default=None, help="Başlangıç tarihi (YYYY-AA-GG)")
+        parser.add_argument('--end', default=None, help="Bitiş tarihi (YYYY-AA-GG)")
+        parser.add_argument('--grid', default=None, help='Parametre taraması, JSON: \'{"lower": [25, 30], "upper": [70]}\'')
+        parser.add_argument('--cost', type=float, default=DEFAULT_COST, help="Tek yönlü işlem maliyeti (oran)")
+        parser.add_argument('--train-days', type=int, default=TRAIN_DAYS, help="Walk-forward eğitim penceresi (gün)")
+        parser.add_argument('--test-days', type=int, default=TEST_DAYS, help="Walk-forward test penceresi (gün)")
+        parser.add_argument('--workers', type=int, default=None, help="Süreç sayısı (varsayılan: çekirdek sayısı)")
+        parser.add_argument('--top', type=int, default=10, help="Kaç parametre kombinasyonu listelensin")
+
+    def handle(self, *args, **options):
+        symbols = [symbol.strip().upper() for symbol in options['symbols'].split(',') if symbol.strip()] or None
+        try:
+            grid = json.loads(options['grid']) if options['grid'] else None
+        except json.JSONDecodeError:
+            raise CommandError("--grid geçerli bir JSON değil")
+
+        try:
+            result = run_backtest(
+                options['strategy'], grid, symbols, options['start'], options['end'], cost=options['cost'],
+                train_days=options['train_days'], test_days=options['test_days'], max_workers=options['workers'],
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        self.stdout.write(f"{result['strategy']}: {result['description']}")
+        self.stdout.write(f"{result['symbols']} hisse, {result['start']} - {result['end']}, {len(result['results'])} kombinasyon")
+        self.stdout.write(f"{'Parametreler':<28} {'Getiri%':>9} {'Yıllık%':>8} {'Sharpe':>7} {'MaxDD%':>8} {'İşlem':>7} {'İsabet%':>8}")
+        for item in result['results'][:options['top']]:
+            params = ', '.join(f"{key}={value}" for key, value in sorted(item['params'].items()))
+            self.stdout.write(
+                f"{params:<28} {item['total_return']:>9.1f} {item['annual_return']:>8.1f} {item['sharpe']:>7.2f} "
+                f"{item['max_drawdown']:>8.1f} {item['trades']:>7} {item['hit_rate']:>8.1f}"
+            )
+
+        wf = result['walk_forward']
+        if wf.get('days'):
+            self.stdout.write(self.style.SUCCESS(
+                f"Walk-forward (örneklem dışı, {len(wf['windows'])} pencere): getiri %{wf['total_return']:.1f}, "
+                f"Sharpe {wf['sharpe']:.2f}, en büyük düşüş %{wf['max_drawdown']:.1f}"
+            ))
+        else:
+            self.stdout.write(self.style.WARNING("Walk-forward için veri yetersiz (eğitim penceresinden kısa)."))
+        self.stdout.write(f"Süre: {result['duration']} sn")
@@ -0,0 +1,63 @@
+import time
+
+import numpy as np
+import pandas as pd
+from django.core.management.base import BaseCommand
+
+from Tahmin.parsing import KINDS, parse_number, parse_numbers
+
+
+def _turkish(values, decimals=2):
+    # 1234.5 -> '1.234,50'
+    return [f"{value:,.{decimals}f}".replace(',', ' ').replace('.', ',').replace(' ', '.') for value in values]
+
+
+def sample_column(kind, rows, seed=0):
+    """Investing.com dışa aktarımlarına benzeyen rastgele Türkçe biçimli metin sütunu (%1 hatalı hücre)."""
+    rng = np.random.default_rng(seed)
+    if kind == 'volume':
+        cells = [
+            number + suffix
+            for number, suffix in zip(_turkish(rng.uniform(0, 1000, rows)), rng.choice(['K', 'M', 'B', ''], rows))
+        ]
+    elif kind == 'percent':
+        cells = [f"{number}%" for number in _turkish(rng.normal(0, 2, rows))]
+    else:
+        cells = _turkish(rng.lognormal(4, 2, rows))
+
+    cells = np.array(cells, dtype=object)
+    broken = rng.random(rows) < 0.01
+    cells[broken] = rng.choice(['-', 'n/a', ''], int(broken.sum()))
+    return cells
+
+
+class Command(BaseCommand):
+    help = (
+        "Türkçe biçimli sayı ayrıştırıcısını (Tahmin.parsing) rastgele üretilmiş sütunlarda hücre hücre "
+        "ayrıştırmayla karşılaştırır; süreleri ve sonuçların aynı olup olmadığını yazar."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1_000_000, help="Sütun başına satır sayısı")
+        parser.add_argument('--kinds', type=str, default=','.join(KINDS), help="Virgülle ayrılmış sayı türleri")
+
+    def handle(self, *args, **options):
+        rows = options['rows']
+        for kind in [kind.strip() for kind in options['kinds'].split(',') if kind.strip()]:
+            cells = sample_column(kind, rows)
+
+            started = time.perf_counter()
+            per_cell = np.array([parse_number(cell, kind) for cell in cells])
+            per_cell_time = time.perf_counter() - started
+
+            started = time.perf_counter()
+            vectorized, invalid = parse_numbers(pd.Series(cells), kind)
+            vectorized_time = time.perf_counter() - started
+
+            same = np.array_equal(per_cell, vectorized, equal_nan=True)
+            style = self.style.SUCCESS if same else self.style.ERROR
+            self.stdout.write(style(
+                f"{kind}: {rows} satır, hücre hücre {per_cell_time:.2f} sn, vektörel {vectorized_time:.2f} sn "
+                f"({per_cell_time / max(vectorized_time, 1e-9):.1f}x), {int(invalid.sum())} geçersiz hücre, "
+                f"sonuçlar {'aynı' if same else 'FARKLI'}"
+            ))
@@ -0,0 +1,29 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from Tahmin.archive import DATASETS, export_archive
+
+
+class Command(BaseCommand):
+    help = (
+        "Fiyat, analiz, döviz, makro ve finansal tablo geçmişini yıla göre bölümlenmiş Parquet "
+        "arşivine yazar (varsayılan: uploads/archives/<zaman damgası>)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', default=None, help="Arşiv klasörü")
+        parser.add_argument('--datasets', nargs='+', choices=list(DATASETS), help="Yalnızca bu veri kümeleri")
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        try:
+            manifest = export_archive(options['output'], options['datasets'])
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        for name, info in manifest['datasets'].items():
+            self.stdout.write(f"{name:<16} {info['rows']:>10} satır")
+        self.stdout.write(self.style.SUCCESS(
+            f"Arşiv yazıldı: {manifest['path']} ({time.monotonic() - started:.1f} sn)"
+        ))
@@ -0,0 +1,31 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from Tahmin.archive import DATASETS, import_archive
+
+
+class Command(BaseCommand):
+    help = (
+        "export_archive ile yazılmış Parquet arşivini veritabanına yükler. Varsayılan olarak aynı "
+        "anahtarlı satırlar güncellenir; --replace ile tablolar önce boşaltılır (hisseler hariç)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="Arşiv klasörü")
+        parser.add_argument('--datasets', nargs='+', choices=list(DATASETS), help="Yalnızca bu veri kümeleri")
+        parser.add_argument('--replace', action='store_true', help="Mevcut satırları silip arşivdekilerle değiştir")
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        try:
+            result = import_archive(options['path'], options['datasets'], replace=options['replace'])
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        for name, info in result.items():
+            line = f"{name:<16} {info['rows']:>10} satır"
+            if info['skipped']:
+                line += f" ({info['skipped']} satır bilinmeyen hisse nedeniyle atlandı)"
+            self.stdout.write(line)
+        self.stdout.write(self.style.SUCCESS(f"Arşiv yüklendi ({time.monotonic() - started:.1f} sn)"))
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from Tahmin.intraday import INTERVALS, ingest_intraday_file
+from Tahmin.models import Stock
+
+
+class Command(BaseCommand):
+    help = "Gün içi (dakika/saat) bar dosyalarını hissenin gün içi bar deposuna aktarır."
+
+    def add_arguments(self, parser):
+        parser.add_argument('symbol', help="Hisse sembolü")
+        parser.add_argument('files', nargs='+', help="CSV/Excel dosyaları")
+        parser.add_argument('--interval', default='1m', choices=sorted(INTERVALS), help="Bar aralığı")
+
+    def handle(self, *args, **options):
+        stock = Stock.objects.filter(symbol=options['symbol'].upper()).first()
+        if stock is None:
+            raise CommandError(f"Hisse bulunamadı: {options['symbol']}")
+
+        for file_path in options['files']:
+            try:
+                report = ingest_intraday_file(stock, file_path, options['interval'])
+            except (OSError, ValueError) as e:
+                self.stdout.write(self.style.ERROR(f"{file_path}: {e}"))
+                continue
+
+            self.stdout.write(self.style.SUCCESS(
+                f"{file_path}: {report['total_rows']} satır, {report['success_count']} yeni bar, "
+                f"{report['duplicate_count']} mükerrer, {report['error_count']} hatalı ({report['days']} gün)"
+            ))
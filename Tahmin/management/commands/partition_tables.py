@@ -0,0 +1,48 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from Tahmin.models import StockPrice, StockAnalysis
+from Tahmin.partitioning import convert_to_partitioned, ensure_partitions, is_partitioned
+
+PARTITIONED_MODELS = (StockPrice, StockAnalysis)
+
+
+class Command(BaseCommand):
+    help = (
+        "StockPrice ve StockAnalysis tablolarını PostgreSQL'de tarihe göre yıllık bölümlere ayırır. "
+        "Tablolar zaten bölümlenmişse yalnızca eksik yıl bölümlerini oluşturur (yılda bir çalıştırılabilir)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--years-ahead', type=int, default=1, help="Bu yıldan sonra kaç yılın bölümü hazırlansın")
+        parser.add_argument('--keep-old', action='store_true', help="Dönüştürülen eski tabloyu (_unpartitioned) silme")
+        parser.add_argument('--dry-run', action='store_true', help="Yalnızca durumu göster")
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError("Tablo bölümleme yalnızca PostgreSQL veritabanlarında desteklenir.")
+
+        through_year = date.today().year + options['years_ahead']
+        for model in PARTITIONED_MODELS:
+            table = model._meta.db_table
+            with transaction.atomic(), connection.cursor() as cursor:
+                if is_partitioned(cursor, table):
+                    if options['dry_run']:
+                        self.stdout.write(f"{table}: bölümlenmiş")
+                        continue
+                    created = ensure_partitions(cursor, table, through_year)
+                    message = f"{table}: yeni bölümler: {', '.join(created)}" if created else f"{table}: bölümler güncel"
+                    self.stdout.write(self.style.SUCCESS(message))
+                    continue
+
+                if options['dry_run']:
+                    self.stdout.write(f"{table}: bölümlenmemiş, dönüştürülecek")
+                    continue
+
+                self.stdout.write(f"{table} dönüştürülüyor...")
+                executed = convert_to_partitioned(
+                    cursor, table, years_ahead=options['years_ahead'], keep_old=options['keep_old'],
+                )
+                self.stdout.write(self.style.SUCCESS(f"{table}: {len(executed)} adımda bölümlendi"))
@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from Tahmin.models import BatchPrediction, Stock
+from Tahmin.prediction.estimators import MODEL_TYPES
+from Tahmin.prediction.universe import predict_universe
+
+
+class Command(BaseCommand):
+    help = "Tüm aktif hisseler için tek geçişte tahmin üretir ve sonuçları BatchPrediction tablosuna yazar."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--model-type', default='xgboost', choices=sorted(MODEL_TYPES), help="Model tipi")
+        parser.add_argument('--months', type=int, default=12, help="Tahmin ufku (ay)")
+        parser.add_argument('--symbols', default='', help="Yalnızca bu hisseler (virgülle ayrılmış semboller)")
+        parser.add_argument('--top', type=int, default=20, help="Beklenen getirisi en yüksek kaç hisse listelensin")
+
+    def handle(self, *args, **options):
+        stocks = Stock.objects.filter(is_active=True)
+        if options['symbols']:
+            stocks = stocks.filter(symbol__in=[symbol.strip().upper() for symbol in options['symbols'].split(',')])
+
+        try:
+            result = predict_universe(
+                options['model_type'], options['months'], stocks=stocks,
+                progress=lambda percent, message: self.stdout.write(f"[%{percent}] {message}"),
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        self.stdout.write(self.style.SUCCESS(result['message']))
+        self.stdout.write(f"Çalıştırma: {result['run_id']} (model {'kayıttan' if result['cached'] else 'yeni eğitildi'})")
+        if result['skipped']:
+            self.stdout.write(self.style.WARNING(f"Yetersiz veri nedeniyle atlananlar: {', '.join(result['skipped'])}"))
+
+        for prediction in BatchPrediction.objects.filter(run_id=result['run_id']).select_related('stock').order_by('-change_percent')[:options['top']]:
+            self.stdout.write(
+                f"{prediction.stock.symbol:<8} {prediction.last_price:>10.2f} → {prediction.predicted_price:>10.2f} "
+                f"({prediction.change_percent:+.2f}%)  {prediction.target_date}"
+            )
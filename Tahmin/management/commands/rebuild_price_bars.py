@@ -0,0 +1,30 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from Tahmin.bars import rebuild_price_bars
+from Tahmin.models import Stock
+
+
+class Command(BaseCommand):
+    help = (
+        "Hisselerin haftalık ve aylık OHLCV barlarını (PriceBar) günlük fiyatlardan baştan oluşturur. "
+        "Fiyat aktarımı barları kendiliğinden günceller; bu komut mevcut veriler için bir kez çalıştırılır."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--symbols', default='', help="Yalnızca bu hisseler (virgülle ayrılmış semboller)")
+
+    def handle(self, *args, **options):
+        stock_ids = None
+        if options['symbols']:
+            symbols = [symbol.strip().upper() for symbol in options['symbols'].split(',') if symbol.strip()]
+            stock_ids = list(Stock.objects.filter(symbol__in=symbols).values_list('id', flat=True))
+            if not stock_ids:
+                raise CommandError("Hisse bulunamadı.")
+
+        started = time.monotonic()
+        result = rebuild_price_bars(stock_ids, progress=lambda percent, message: self.stdout.write(f"[%{percent}] {message}"))
+        self.stdout.write(self.style.SUCCESS(
+            f"Fiyat barları: {result['stocks']} hisse, {result['bars']} bar ({time.monotonic() - started:.1f} sn)"
+        ))
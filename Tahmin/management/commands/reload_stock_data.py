@@ -0,0 +1,37 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from Tahmin.batch import STOCK_DATA_DIR, process_all_stock_folders
+from Tahmin.market_matrix import update_market_matrix
+
+
+class Command(BaseCommand):
+    help = "uploads/stock_data altındaki tüm hisse dosyalarını paralel olarak yeniden içe aktarır."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=None, help="Süreç sayısı (varsayılan: çekirdek sayısı)")
+        parser.add_argument('--base-dir', default=STOCK_DATA_DIR, help="Hisse klasörlerinin bulunduğu dizin")
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        processed = 0
+
+        for result in process_all_stock_folders(options['base_dir'], max_workers=options['workers']):
+            processed += 1
+            if result['status'] == 'success':
+                self.stdout.write(self.style.SUCCESS(
+                    f"{result['stock']}: {result['total_rows']} satır, {result['success_count']} yeni, "
+                    f"{result['duplicate_count']} mükerrer, {result['error_count']} hatalı"
+                ))
+            else:
+                self.stdout.write(self.style.ERROR(f"{result['stock']}: {result['message']}"))
+
+        if not processed:
+            self.stdout.write(self.style.WARNING("İşlenecek dosya bulunamadı!"))
+            return
+
+        self.stdout.write(f"{processed} hisse {time.monotonic() - started:.1f} sn içinde işlendi.")
+
+        result = update_market_matrix()
+        self.stdout.write(f"Piyasa matrisi güncellendi: {result['rows']} gün x {result['symbols']} hisse.")
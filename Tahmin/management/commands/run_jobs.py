@@ -0,0 +1,48 @@
+import multiprocessing
+import os
+import socket
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from Tahmin.jobs import POLL_INTERVAL, run_worker
+
+
+def _worker_main(index, poll_interval, once):
+    # Her işçi süreci kendi veritabanı bağlantısını açar
+    connections.close_all()
+    run_worker(f"{socket.gethostname()}:{os.getpid()}:{index}", poll_interval=poll_interval, once=once)
+
+
+class Command(BaseCommand):
+    help = "Arka plan iş kuyruğundaki (BackgroundJob) bekleyen işleri çalıştıran işçileri başlatır."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=1, help="İşçi süreç sayısı")
+        parser.add_argument('--poll-interval', type=float, default=POLL_INTERVAL, help="Kuyruk boşken bekleme süresi (sn)")
+        parser.add_argument('--once', action='store_true', help="Kuyruk boşalınca çık")
+
+    def handle(self, *args, **options):
+        workers = max(1, options['workers'])
+
+        if workers == 1:
+            processed = run_worker(poll_interval=options['poll_interval'], once=options['once'])
+            self.stdout.write(self.style.SUCCESS(f"{processed} iş çalıştırıldı."))
+            return
+
+        # İşler kendi süreç havuzlarını açabildiğinden işçiler daemon olmayan süreçlerdir
+        connections.close_all()
+        processes = [
+            multiprocessing.Process(target=_worker_main, args=(index, options['poll_interval'], options['once']))
+            for index in range(workers)
+        ]
+        for process in processes:
+            process.start()
+        self.stdout.write(f"{workers} işçi başlatıldı.")
+
+        try:
+            for process in processes:
+                process.join()
+        except KeyboardInterrupt:
+            for process in processes:
+                process.terminate()
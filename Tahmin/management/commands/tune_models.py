@@ -0,0 +1,48 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from Tahmin.prediction.estimators import MODEL_TYPES
+from Tahmin.prediction.tuning import DEFAULT_TRIALS, tune_stocks
+
+
+class Command(BaseCommand):
+    help = (
+        "Hisse bazında tahmin modellerinin hiperparametrelerini arar: denemeler süreç havuzunda paralel "
+        "çalışır, umutsuz denemeler erken durdurulur ve sonuçlar kaydedilir (yarıda kalan arama devam eder)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--symbols', default='', help="Yalnızca bu hisseler (virgülle ayrılmış semboller)")
+        parser.add_argument('--model-type', default='xgboost', help=f"Model tipleri, virgülle ayrılmış ({', '.join(sorted(MODEL_TYPES))})")
+        parser.add_argument('--months', default='12', help="Tahmin ufukları (ay), virgülle ayrılmış")
+        parser.add_argument('--trials', type=int, default=DEFAULT_TRIALS, help="Model başına deneme sayısı")
+        parser.add_argument('--workers', type=int, default=None, help="Süreç sayısı (varsayılan: çekirdek sayısı)")
+        parser.add_argument('--max-minutes', type=float, default=None, help="Toplam süre sınırı (dakika)")
+
+    def handle(self, *args, **options):
+        symbols = [symbol.strip().upper() for symbol in options['symbols'].split(',') if symbol.strip()] or None
+        model_types = [name.strip() for name in options['model_type'].split(',') if name.strip()]
+        try:
+            horizons = [int(value) for value in options['months'].split(',') if value.strip()]
+        except ValueError:
+            raise CommandError("--months tam sayılardan oluşmalı")
+
+        try:
+            result = tune_stocks(
+                symbols, model_types, horizons, n_trials=options['trials'], max_workers=options['workers'],
+                max_minutes=options['max_minutes'],
+                progress=lambda percent, message: self.stdout.write(f"[%{percent}] {message}"),
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        for item in result['tuned']:
+            rmse = f"{item['best_rmse']:.5f}" if item['best_rmse'] is not None else "-"
+            self.stdout.write(
+                f"{item['symbol']:<8} {item['model_type']:<8} {item['time_horizon']:>3}a  rmse={rmse}  "
+                f"{item['completed']} tamamlandı, {item['pruned']} durduruldu, {item['resumed']} devralındı  "
+                f"{item['best_params']}"
+            )
+        if result['skipped']:
+            self.stdout.write(self.style.WARNING(f"Yetersiz veri nedeniyle atlananlar: {', '.join(result['skipped'])}"))
+        style = self.style.WARNING if result['stopped'] else self.style.SUCCESS
+        self.stdout.write(style(result['message']))
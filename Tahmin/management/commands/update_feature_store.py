@@ -0,0 +1,33 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from Tahmin.models import Stock
+from Tahmin.prediction.feature_store import refresh_feature_store
+
+
+class Command(BaseCommand):
+    help = (
+        "Tahmin modellerinin hisse/gün bazında hazır özellik deposunu (uploads/features) fiyat, analiz ve "
+        "makro tablolarıyla eşitler. Yalnızca değişen hisseler güncellenir; --full ile baştan oluşturulur."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--symbols', default='', help="Yalnızca bu hisseler (virgülle ayrılmış semboller)")
+        parser.add_argument('--full', action='store_true', help="Özellikleri baştan hesapla")
+
+    def handle(self, *args, **options):
+        stock_ids = None
+        if options['symbols']:
+            symbols = [symbol.strip().upper() for symbol in options['symbols'].split(',') if symbol.strip()]
+            stock_ids = list(Stock.objects.filter(symbol__in=symbols).values_list('id', flat=True))
+            if not stock_ids:
+                raise CommandError("Hisse bulunamadı.")
+
+        started = time.monotonic()
+        result = refresh_feature_store(stock_ids, full=options['full'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Özellik deposu: {result['stocks']} hisse ({result['full']} baştan, {result['incremental']} artımlı, "
+            f"{result['joined']} yeniden birleştirildi, {result['unchanged']} değişmedi) "
+            f"({time.monotonic() - started:.1f} sn)"
+        ))
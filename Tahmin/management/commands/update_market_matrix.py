@@ -0,0 +1,23 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from Tahmin.market_matrix import update_market_matrix
+
+
+class Command(BaseCommand):
+    help = (
+        "Günlük OHLCV verisinin bellek eşlemeli piyasa matrisini (uploads/market_matrix) fiyat tablosuyla "
+        "eşitler. Yalnızca fiyatı değişen hisseler yeniden yazılır; --full ile baştan oluşturulur."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--full', action='store_true', help="Matrisi baştan oluştur")
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        result = update_market_matrix(full=options['full'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Piyasa matrisi ({result['mode']}): {result['rows']} gün x {result['symbols']} hisse, "
+            f"{result['updated']} hisse yazıldı ({time.monotonic() - started:.1f} sn)"
+        ))
@@ -0,0 +1,322 @@
+"""
+Tüm piyasanın günlük OHLCV verisi için diskte, bellek eşlemeli (memory-mapped) matris deposu.
+
+Her fiyat alanı (open, high, low, close, volume) tarih x hisse boyutlu, satır öncelikli ham bir
+float64 dosyasıdır; eksik günler NaN'dır. Açmak yalnızca meta.json ve tarih dizisini okur,
+matrisler işletim sistemi tarafından ihtiyaç duyuldukça sayfalanır: eğitim ve geriye dönük
+testler tüm piyasayı ORM'den geçirmeden açar, tarih aralıkları ve hisse sütunları kopyasız
+görünümler (view) olarak alınır.
+
+Matris hisse bazında parmak iziyle (kayıt sayısı + son güncelleme) güncel tutulur:
+update_market_matrix yalnızca fiyatı değişen hisselerin sütunlarını yeniden yazar, yeni günleri
+dosyaların sonuna ekler. Geçmişe tarih eklenmesi, hisse silinmesi ya da sütun kapasitesinin
+dolması durumunda matris yeni bir klasörde baştan oluşturulur ve CURRENT işaretçisi ona çevrilir.
+"""
+import json
+import logging
+import os
+import shutil
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+from django.conf import settings
+from django.utils import timezone
+
+from .columnar import fingerprints
+from .models import Stock, StockPrice
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+MATRIX_DIR = os.path.join(settings.BASE_DIR, 'uploads', 'market_matrix')
+MATRIX_FORMAT = 1
+
+FIELDS = {
+    'open': 'opening_price',
+    'high': 'highest_price',
+    'low': 'lowest_price',
+    'close': 'closing_price',
+    'volume': 'volume',
+}
+
+DTYPE = np.dtype('<f8')
+
+# Yeni hisseler için ayrılan boş sütunlar; kapasite dolana kadar hisse eklemek yeniden oluşturma gerektirmez
+SYMBOL_BLOCK = 64
+
+READ_CHUNK_ROWS = 100000
+
+
+class MarketMatrix:
+    """
+    Açılmış matris deposu.
+
+        matrix = open_market_matrix()
+        close = matrix['close']                      # (gün, hisse) memmap görünümü
+        window = matrix.frame('close', start='2023-01-01', symbols=['ASELS', 'THYAO'])
+
+    dates: datetime64[D] dizisi, symbols/stock_ids: sütun sırası.
+    """
+
+    def __init__(self, root, meta):
+        self.root = root
+        self.version = meta['built_at']
+        self.symbols = meta['symbols']
+        self.stock_ids = np.asarray(meta['stock_ids'], dtype='int64')
+        self.dates = np.load(os.path.join(root, 'dates.npy'))
+        self._columns = {symbol: index for index, symbol in enumerate(self.symbols)}
+
+        shape = (meta['rows'], meta['capacity'])
+        self._arrays = {}
+        for field in FIELDS:
+            if shape[0]:
+                data = np.memmap(os.path.join(root, f"{field}.f8"), dtype=DTYPE, mode='r', shape=shape)
+            else:
+                data = np.empty(shape, dtype=DTYPE)
+            self._arrays[field] = data[:, :len(self.symbols)]
+
+    def __getitem__(self, field):
+        return self._arrays[field]
+
+    def __len__(self):
+        return len(self.dates)
+
+    def column(self, symbol):
+        return self._columns[symbol]
+
+    def date_slice(self, start=None, end=None):
+        """[start, end] tarih aralığına karşılık gelen satır dilimi."""
+        first = np.searchsorted(self.dates, np.datetime64(pd.Timestamp(start).date(), 'D')) if start is not None else 0
+        last = (
+            np.searchsorted(self.dates, np.datetime64(pd.Timestamp(end).date(), 'D'), side='right')
+            if end is not None else len(self.dates)
+        )
+        return slice(int(first), int(last))
+
+    def frame(self, field, start=None, end=None, symbols=None):
+        """Alanın tarih indeksli, sembol sütunlu DataFrame'i. symbols verilmezse kopyalanmaz."""
+        rows = self.date_slice(start, end)
+        values = self._arrays[field][rows]
+        columns = self.symbols
+        if symbols is not None:
+            values = values[:, [self._columns[symbol] for symbol in symbols]]
+            columns = list(symbols)
+        return pd.DataFrame(values, index=pd.DatetimeIndex(self.dates[rows]), columns=columns, copy=False)
+
+
+def price_versions():
+    """
+    Fiyatı olan her hissenin parmak izi, tek sorguyla: {stock_id: str}. Değerler
+    columnar.price_version ile aynıdır.
+    """
+    return fingerprints(StockPrice.objects.all(), 'stock_id')
+
+
+def _current_root():
+    pointer = os.path.join(MATRIX_DIR, 'CURRENT')
+    if not os.path.exists(pointer):
+        return None
+    with open(pointer, encoding='utf-8') as f:
+        root = os.path.join(MATRIX_DIR, f.read().strip())
+    return root if os.path.exists(os.path.join(root, 'meta.json')) else None
+
+
+def _read_meta(root):
+    with open(os.path.join(root, 'meta.json'), encoding='utf-8') as f:
+        meta = json.load(f)
+    return meta if meta.get('format') == MATRIX_FORMAT else None
+
+
+def _write_atomic(path, write):
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    write(temp_path)
+    os.replace(temp_path, path)
+
+
+def _write_meta(root, meta):
+    def write(path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+    _write_atomic(os.path.join(root, 'meta.json'), write)
+
+
+def _write_dates(root, dates):
+    def write(path):
+        with open(path, 'wb') as f:
+            np.save(f, dates)
+    _write_atomic(os.path.join(root, 'dates.npy'), write)
+
+
+def open_market_matrix():
+    """Güncel matrisi açar; henüz oluşturulmamışsa None döndürür."""
+    root = _current_root()
+    meta = _read_meta(root) if root else None
+    return MarketMatrix(root, meta) if meta else None
+
+
+@contextmanager
+def _build_lock():
+    # Aynı anda çalışan işçilerin matrisi birlikte güncellemesini önler
+    os.makedirs(MATRIX_DIR, exist_ok=True)
+    with open(os.path.join(MATRIX_DIR, '.lock'), 'w') as lock:
+        if fcntl is not None:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def _open_writable(root, rows, capacity):
+    return {
+        field: np.memmap(os.path.join(root, f"{field}.f8"), dtype=DTYPE, mode='r+', shape=(rows, capacity))
+        for field in FIELDS
+    }
+
+
+def _resize(root, old_rows, rows, capacity):
+    """Dosyaları rows satıra büyütür; yeni satırlar NaN ile doldurulur."""
+    for field in FIELDS:
+        with open(os.path.join(root, f"{field}.f8"), 'r+b') as f:
+            f.truncate(rows * capacity * DTYPE.itemsize)
+    arrays = _open_writable(root, rows, capacity)
+    for data in arrays.values():
+        data[old_rows:] = np.nan
+    return arrays
+
+
+def _fill(arrays, dates, columns, queryset):
+    """
+    Sorgudaki fiyatları matrise yazar. columns: {stock_id: sütun}. Satırlar parça parça okunur;
+    bellekte en fazla READ_CHUNK_ROWS satır tutulur.
+    """
+    rows = queryset.order_by().values_list('stock_id', 'date', *FIELDS.values()).iterator(chunk_size=READ_CHUNK_ROWS)
+    column_of = np.vectorize(columns.get, otypes=['int64'])
+    while True:
+        chunk = [row for _, row in zip(range(READ_CHUNK_ROWS), rows)]
+        if not chunk:
+            break
+        values = list(zip(*chunk))
+        row_index = np.searchsorted(dates, np.array(values[1], dtype='datetime64[D]'))
+        column_index = column_of(np.array(values[0]))
+        for offset, field in enumerate(FIELDS):
+            arrays[field][row_index, column_index] = np.array(values[2 + offset], dtype=float)
+
+
+def _build():
+    """Matrisi yeni bir klasörde baştan oluşturur ve CURRENT işaretçisini ona çevirir."""
+    versions = price_versions()
+    stocks = sorted(Stock.objects.filter(id__in=versions).values_list('symbol', 'id'))
+    dates = np.array(
+        StockPrice.objects.order_by('date').values_list('date', flat=True).distinct(), dtype='datetime64[D]',
+    )
+    capacity = -(-(len(stocks) + 1) // SYMBOL_BLOCK) * SYMBOL_BLOCK
+
+    built_at = timezone.now()
+    name = built_at.strftime('%Y%m%d_%H%M%S_%f')
+    root = os.path.join(MATRIX_DIR, name)
+    os.makedirs(root)
+    for field in FIELDS:
+        open(os.path.join(root, f"{field}.f8"), 'wb').close()
+
+    if len(dates):
+        arrays = _resize(root, 0, len(dates), capacity)
+        columns = {stock_id: index for index, (_, stock_id) in enumerate(stocks)}
+        _fill(arrays, dates, columns, StockPrice.objects.all())
+        for data in arrays.values():
+            data.flush()
+
+    _write_dates(root, dates)
+    meta = {
+        'format': MATRIX_FORMAT,
+        'built_at': built_at.isoformat(),
+        'rows': len(dates),
+        'capacity': capacity,
+        'symbols': [symbol for symbol, _ in stocks],
+        'stock_ids': [stock_id for _, stock_id in stocks],
+        'versions': {str(stock_id): versions[stock_id] for _, stock_id in stocks},
+    }
+    _write_meta(root, meta)
+    def write_pointer(path):
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(name)
+    _write_atomic(os.path.join(MATRIX_DIR, 'CURRENT'), write_pointer)
+
+    # Eski klasörler silinir; onları açık tutan okuyucular (Linux'ta) dosyalar kapanana kadar okumaya devam eder
+    for entry in os.listdir(MATRIX_DIR):
+        path = os.path.join(MATRIX_DIR, entry)
+        if entry != name and os.path.isdir(path):
+            shutil.rmtree(path, ignore_errors=True)
+
+    logger.info("Piyasa matrisi oluşturuldu: %s gün x %s hisse", len(dates), len(stocks))
+    return {'mode': 'full', 'rows': len(dates), 'symbols': len(stocks), 'updated': len(stocks)}
+
+
+def _update(root, meta, versions):
+    # Artımlı güncelleme; yeniden oluşturma gerekiyorsa None döndürür
+    known = {int(stock_id) for stock_id in meta['versions']}
+    if known - set(versions):
+        return None
+
+    changed = [stock_id for stock_id, version in versions.items() if meta['versions'].get(str(stock_id)) != version]
+    if not changed:
+        return {'mode': 'unchanged', 'rows': meta['rows'], 'symbols': len(meta['symbols']), 'updated': 0}
+
+    new_stocks = sorted(Stock.objects.filter(id__in=set(changed) - known).values_list('symbol', 'id'))
+    if len(meta['symbols']) + len(new_stocks) > meta['capacity']:
+        return None
+
+    dates = np.load(os.path.join(root, 'dates.npy'))
+    queryset = StockPrice.objects.filter(stock_id__in=changed)
+    changed_dates = np.array(queryset.order_by('date').values_list('date', flat=True).distinct(), dtype='datetime64[D]')
+    new_dates = np.setdiff1d(changed_dates, dates)
+    if len(new_dates) and len(dates) and new_dates[0] <= dates[-1]:
+        return None
+
+    rows = len(dates) + len(new_dates)
+    if len(new_dates):
+        arrays = _resize(root, len(dates), rows, meta['capacity'])
+        dates = np.concatenate([dates, new_dates])
+    else:
+        arrays = _open_writable(root, rows, meta['capacity'])
+
+    meta['symbols'] += [symbol for symbol, _ in new_stocks]
+    meta['stock_ids'] += [stock_id for _, stock_id in new_stocks]
+    columns = {stock_id: index for index, stock_id in enumerate(meta['stock_ids'])}
+    changed_columns = [columns[stock_id] for stock_id in changed]
+    for data in arrays.values():
+        data[:, changed_columns] = np.nan
+
+    _fill(arrays, dates, columns, queryset)
+    for data in arrays.values():
+        data.flush()
+
+    _write_dates(root, dates)
+    meta['rows'] = rows
+    meta['built_at'] = timezone.now().isoformat()
+    meta['versions'].update({str(stock_id): versions[stock_id] for stock_id in changed})
+    _write_meta(root, meta)
+
+    logger.info("Piyasa matrisi güncellendi: %s hisse, %s yeni gün", len(changed), len(new_dates))
+    return {'mode': 'incremental', 'rows': rows, 'symbols': len(meta['symbols']), 'updated': len(changed)}
+
+
+def update_market_matrix(full=False):
+    """
+    Matrisi fiyat tablosuyla eşitler: yalnızca değişen hisseler yeniden yazılır; gerekirse (ya da
+    full=True ise) baştan oluşturulur. {'mode', 'rows', 'symbols', 'updated'} özetini döndürür.
+    """
+    with _build_lock():
+        root = _current_root()
+        meta = _read_meta(root) if root and not full else None
+        if meta is not None:
+            result = _update(root, meta, price_versions())
+            if result is not None:
+                return result
+        return _build()
@@ -0,0 +1,43 @@
+# Generated by Django 5.1.7 on 2026-10-18 11:01
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Tahmin', '0011_companyfinancial_excel_path_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BackgroundJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('job_type', models.CharField(max_length=50, verbose_name='İş Tipi')),
+                ('params', models.JSONField(blank=True, default=dict, verbose_name='Parametreler')),
+                ('status', models.CharField(choices=[('pending', 'Bekliyor'), ('running', 'Çalışıyor'), ('completed', 'Tamamlandı'), ('failed', 'Başarısız')], default='pending', max_length=10, verbose_name='Durum')),
+                ('progress', models.PositiveSmallIntegerField(default=0, verbose_name='İlerleme (%)')),
+                ('message', models.CharField(blank=True, default='', max_length=255, verbose_name='Durum Mesajı')),
+                ('result', models.JSONField(blank=True, null=True, verbose_name='Sonuç')),
+                ('error', models.TextField(blank=True, default='', verbose_name='Hata')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, verbose_name='Deneme Sayısı')),
+                ('max_attempts', models.PositiveSmallIntegerField(default=3, verbose_name='En Fazla Deneme')),
+                ('worker', models.CharField(blank=True, default='', max_length=100, verbose_name='İşçi')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Oluşturulma Tarihi')),
+                ('started_at', models.DateTimeField(blank=True, null=True, verbose_name='Başlangıç Zamanı')),
+                ('heartbeat_at', models.DateTimeField(blank=True, null=True, verbose_name='Son Sinyal')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='Bitiş Zamanı')),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL, verbose_name='Oluşturan')),
+            ],
+            options={
+                'verbose_name': 'Arka Plan İşi',
+                'verbose_name_plural': 'Arka Plan İşleri',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['status', 'created_at'], name='Tahmin_back_status_e6e8f6_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.1.7 on 2026-10-18 11:11
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Tahmin', '0012_backgroundjob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ModelArtifact',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('model_type', models.CharField(max_length=20, verbose_name='Model Tipi')),
+                ('time_horizon', models.PositiveSmallIntegerField(verbose_name='Tahmin Ufku (Ay)')),
+                ('content_hash', models.CharField(max_length=64, unique=True, verbose_name='İçerik Özeti')),
+                ('data_start', models.DateField(blank=True, null=True, verbose_name='Veri Başlangıcı')),
+                ('data_end', models.DateField(blank=True, null=True, verbose_name='Veri Bitişi')),
+                ('row_count', models.PositiveIntegerField(default=0, verbose_name='Fiyat Kaydı Sayısı')),
+                ('feature_names', models.JSONField(blank=True, default=list, verbose_name='Özellikler')),
+                ('params', models.JSONField(blank=True, default=dict, verbose_name='Hiperparametreler')),
+                ('metrics', models.JSONField(blank=True, default=dict, verbose_name='Doğrulama Metrikleri')),
+                ('file_path', models.CharField(max_length=500, verbose_name='Dosya Yolu')),
+                ('file_size', models.PositiveBigIntegerField(default=0, verbose_name='Dosya Boyutu')),
+                ('use_count', models.PositiveIntegerField(default=0, verbose_name='Kullanım Sayısı')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Oluşturulma Tarihi')),
+                ('last_used_at', models.DateTimeField(blank=True, null=True, verbose_name='Son Kullanım')),
+                ('stock', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='model_artifacts', to='Tahmin.stock', verbose_name='Hisse')),
+            ],
+            options={
+                'verbose_name': 'Model Dosyası',
+                'verbose_name_plural': 'Model Dosyaları',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['stock', 'model_type', 'time_horizon', 'created_at'], name='Tahmin_mode_stock_i_5cc4f9_idx')],
+            },
+        ),
+    ]
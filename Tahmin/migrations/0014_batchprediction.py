@@ -0,0 +1,44 @@
+# Generated by Django 5.1.7 on 2026-10-18 11:13
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Tahmin', '0013_modelartifact'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='modelartifact',
+            name='stock',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='model_artifacts', to='Tahmin.stock', verbose_name='Hisse'),
+        ),
+        migrations.CreateModel(
+            name='BatchPrediction',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('run_id', models.CharField(db_index=True, max_length=32, verbose_name='Çalıştırma')),
+                ('model_type', models.CharField(max_length=20, verbose_name='Model Tipi')),
+                ('time_horizon', models.PositiveSmallIntegerField(verbose_name='Tahmin Ufku (Ay)')),
+                ('as_of', models.DateField(verbose_name='Son Fiyat Tarihi')),
+                ('target_date', models.DateField(verbose_name='Hedef Tarih')),
+                ('last_price', models.FloatField(verbose_name='Son Fiyat')),
+                ('predicted_price', models.FloatField(verbose_name='Tahmini Fiyat')),
+                ('change_percent', models.FloatField(verbose_name='Beklenen Değişim (%)')),
+                ('lower_bound', models.FloatField(verbose_name='Alt Sınır')),
+                ('upper_bound', models.FloatField(verbose_name='Üst Sınır')),
+                ('artifact_hash', models.CharField(max_length=64, verbose_name='Model Özeti')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Oluşturulma Tarihi')),
+                ('stock', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='batch_predictions', to='Tahmin.stock', verbose_name='Hisse')),
+            ],
+            options={
+                'verbose_name': 'Toplu Tahmin',
+                'verbose_name_plural': 'Toplu Tahminler',
+                'ordering': ['-created_at', '-change_percent'],
+                'unique_together': {('run_id', 'stock')},
+            },
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.1.7 on 2026-10-18 11:24
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Tahmin', '0014_batchprediction'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IntradayBlock',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('interval', models.CharField(choices=[('1m', '1 Dakika'), ('5m', '5 Dakika'), ('15m', '15 Dakika'), ('30m', '30 Dakika'), ('1h', '1 Saat')], max_length=3, verbose_name='Bar Aralığı')),
+                ('date', models.DateField(verbose_name='Tarih')),
+                ('bar_count', models.PositiveIntegerField(default=0, verbose_name='Bar Sayısı')),
+                ('data', models.BinaryField(verbose_name='Bar Verisi')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Kayıt Tarihi')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Güncelleme Tarihi')),
+                ('stock', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='intraday_blocks', to='Tahmin.stock', verbose_name='Hisse')),
+            ],
+            options={
+                'verbose_name': 'Gün İçi Bar Bloğu',
+                'verbose_name_plural': 'Gün İçi Bar Blokları',
+                'ordering': ['-date'],
+                'unique_together': {('stock', 'interval', 'date')},
+            },
+        ),
+    ]
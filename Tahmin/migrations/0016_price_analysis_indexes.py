@@ -0,0 +1,41 @@
+# Generated by Django 5.1.7 on 2026-10-18 11:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Tahmin', '0015_intradayblock'),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name='stockanalysis',
+            unique_together=set(),
+        ),
+        migrations.AlterUniqueTogether(
+            name='stockprice',
+            unique_together=set(),
+        ),
+        migrations.AddIndex(
+            model_name='stockanalysis',
+            index=models.Index(fields=['stock', 'created_at'], name='analysis_stock_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='stockprice',
+            index=models.Index(fields=['date'], name='stockprice_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='stockprice',
+            index=models.Index(fields=['stock', 'updated_at'], name='price_stock_updated_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='stockanalysis',
+            constraint=models.UniqueConstraint(fields=('stock', 'date'), name='stockanalysis_stock_date_uniq'),
+        ),
+        migrations.AddConstraint(
+            model_name='stockprice',
+            constraint=models.UniqueConstraint(fields=('stock', 'date'), include=('opening_price', 'highest_price', 'lowest_price', 'closing_price', 'volume'), name='stockprice_stock_date_uniq'),
+        ),
+    ]
@@ -0,0 +1,243 @@
+# Generated by Django 5.1.7 on 2026-10-18 11:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Tahmin', '0016_price_analysis_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='stockanalysis',
+            name='atr',
+            field=models.FloatField(blank=True, null=True, verbose_name='ATR'),
+        ),
+        migrations.AlterField(
+            model_name='stockanalysis',
+            name='beta',
+            field=models.FloatField(blank=True, null=True, verbose_name='Beta'),
+        ),
+        migrations.AlterField(
+            model_name='stockanalysis',
+            name='bollinger_lower',
+            field=models.FloatField(blank=True, null=True, verbose_name='Bollinger Alt'),
+        ),
+        migrations.AlterField(
+            model_name='stockanalysis',
+            name='bollinger_middle',
+            field=models.FloatField(blank=True, null=True, verbose_name='Bollinger Orta'),
+        ),
+        migrations.AlterField(
+            model_name='stockanalysis',
+            name='bollinger_upper',
+            field=models.FloatField(blank=True, null=True, verbose_name='Bollinger Üst'),
+        ),
+        migrations.AlterField(
+            model_name='stockanalysis',
+            name='cci',
+            field=models.FloatField(blank=True, null=True, verbose_name='CCI'),
+        ),
+        migrations.AlterField(
+            model_name='stockanalysis',
+            name='ema_12',
+            field=models.FloatField(blank=True, null=True, verbose_name='EMA 12'),
+        ),
+        migrations.AlterField(
+            model_name='stockanalysis',
+            name='ema_26',
+            field=models.FloatField(blank=True, null=True, verbose_name='EMA 26'),
+        ),
+        migrations.AlterField(
+            model_name='stockanalysis',
+            name='fib_0_236',
+            field=models.FloatField(blank=True, null=True, verbose_name='Fibonacci 0.236'),
+        ),
+        migrations.AlterField(
+            model_name='stockanalysis',
+            name='fib_0_382',
+            field=models.FloatField(blank=True, null=True, verbose_name='Fibonacci 0.382'),
+        ),
+        migrations.AlterField(
+            model_name='stockanalysis',
+            name='fib_0_5',
+            field=models.FloatField(blank=True, null=True, verbose_name='Fibonacci 0.5'),
+        ),
+        migrations.AlterField(
+            model_name='stockanalysis',
+            name='fib_0_618',
+            field=models.FloatField(blank=True, null=True, verbose_name='Fibonacci 0.618'),
+        ),
+        migrations.AlterField(
+            model_name='stockanalysis',
+            name='fib_0_786',
+            field=models.FloatField(blank=True, null=True, verbose_name='Fibonacci 0.786'),
+        ),
+        migrations.AlterField(
+            model_name='stockanalysis',
+            name='fib_1_0',
+            field=models.FloatField(blank=True, null=True, verbose_name='Fibonacci 1.0'),
+        ),
+        migrations.AlterField(
+            model_name='stockanalysis',
+            name='ma_10',
+            field=models.FloatField(blank=True, null=True, verbose_name='10 Günlük Ortalama'),
+        ),
+        migrations.AlterField(
+            model_name='stockanalysis',
+            name='ma_100',
+            field=models.FloatField(blank=True, null=True, verbose_name='100 Günlük Ortalama'),
+        ),
+        migrations.AlterField(
+            model_name='stockanalysis',
+            name='ma_20',
+            field=models.FloatField(blank=True, null=True, verbose_name='20 Günlük Ortalama'),
+        ),
+        migrations.AlterField(
+            model_name='stockanalysis',
+            name='ma_200',
+            field=models.FloatField(blank=True, null=True, verbose_name='200 Günlük Ortalama'),
+        ),
+        migrations.AlterField(
+            model_name='stockanalysis',
+            name='ma_5',
+            field=models.FloatField(blank=True, null=True, verbose_name='5 Günlük Ortalama'),
+        ),
+        migrations.AlterField(
+            model_name='stockanalysis',
+            name='ma_50',
+            field=models.FloatField(blank=True, null=True, verbose_name='50 Günlük Ortalama'),
+        ),
+        migrations.AlterField(
+            model_name='stockanalysis',
+            name='macd',
+            field=models.FloatField(blank=True, null=True, verbose_name='MACD'),
+        ),
+        migrations.AlterField(
+            model_name='stockanalysis',
+            name='macd_hist',
+            field=models.FloatField(blank=True, null=True, verbose_name='MACD Histogram'),
+        ),
+        migrations.AlterField(
+            model_name='stockanalysis',
+            name='macd_signal',
+            field=models.FloatField(blank=True, null=True, verbose_name='MACD Sinyal'),
+        ),
+        migrations.AlterField(
+            model_name='stockanalysis',
+            name='mfi',
+            field=models.FloatField(blank=True, null=True, verbose_name='MFI'),
+        ),
+        migrations.AlterField(
+            model_name='stockanalysis',
+            name='momentum',
+            field=models.FloatField(blank=True, null=True, verbose_name='Momentum'),
+        ),
+        migrations.AlterField(
+            model_name='stockanalysis',
+            name='monthly_ma',
+            field=models.FloatField(blank=True, null=True, verbose_name='Aylık Ortalama'),
+        ),
+        migrations.AlterField(
+            model_name='stockanalysis',
+            name='obv',
+            field=models.FloatField(blank=True, null=True, verbose_name='OBV'),
+        ),
+        migrations.AlterField(
+            model_name='stockanalysis',
+            name='pivot',
+            field=models.FloatField(blank=True, null=True, verbose_name='Pivot'),
+        ),
+        migrations.AlterField(
+            model_name='stockanalysis',
+            name='r1',
+            field=models.FloatField(blank=True, null=True, verbose_name='R1'),
+        ),
+        migrations.AlterField(
+            model_name='stockanalysis',
+            name='r2',
+            field=models.FloatField(blank=True, null=True, verbose_name='R2'),
+        ),
+        migrations.AlterField(
+            model_name='stockanalysis',
+            name='r3',
+            field=models.FloatField(blank=True, null=True, verbose_name='R3'),
+        ),
+        migrations.AlterField(
+            model_name='stockanalysis',
+            name='resistance_level',
+            field=models.FloatField(blank=True, null=True, verbose_name='Direnç Seviyesi'),
+        ),
+        migrations.AlterField(
+            model_name='stockanalysis',
+            name='rsi',
+            field=models.FloatField(blank=True, null=True, verbose_name='RSI'),
+        ),
+        migrations.AlterField(
+            model_name='stockanalysis',
+            name='s1',
+            field=models.FloatField(blank=True, null=True, verbose_name='S1'),
+        ),
+        migrations.AlterField(
+            model_name='stockanalysis',
+            name='s2',
+            field=models.FloatField(blank=True, null=True, verbose_name='S2'),
+        ),
+        migrations.AlterField(
+            model_name='stockanalysis',
+            name='s3',
+            field=models.FloatField(blank=True, null=True, verbose_name='S3'),
+        ),
+        migrations.AlterField(
+            model_name='stockanalysis',
+            name='sharpe_ratio',
+            field=models.FloatField(blank=True, null=True, verbose_name='Sharpe Oranı'),
+        ),
+        migrations.AlterField(
+            model_name='stockanalysis',
+            name='sortino_ratio',
+            field=models.FloatField(blank=True, null=True, verbose_name='Sortino Oranı'),
+        ),
+        migrations.AlterField(
+            model_name='stockanalysis',
+            name='stochastic_d',
+            field=models.FloatField(blank=True, null=True, verbose_name='Stokastik %D'),
+        ),
+        migrations.AlterField(
+            model_name='stockanalysis',
+            name='stochastic_k',
+            field=models.FloatField(blank=True, null=True, verbose_name='Stokastik %K'),
+        ),
+        migrations.AlterField(
+            model_name='stockanalysis',
+            name='support_level',
+            field=models.FloatField(blank=True, null=True, verbose_name='Destek Seviyesi'),
+        ),
+        migrations.AlterField(
+            model_name='stockanalysis',
+            name='volatility',
+            field=models.FloatField(blank=True, null=True, verbose_name='Volatilite'),
+        ),
+        migrations.AlterField(
+            model_name='stockanalysis',
+            name='weekly_ma',
+            field=models.FloatField(blank=True, null=True, verbose_name='Haftalık Ortalama'),
+        ),
+        migrations.AlterField(
+            model_name='stockanalysis',
+            name='williams_r',
+            field=models.FloatField(blank=True, null=True, verbose_name='Williams %R'),
+        ),
+        migrations.AlterField(
+            model_name='stockanalysis',
+            name='wma_20',
+            field=models.FloatField(blank=True, null=True, verbose_name='WMA 20'),
+        ),
+        migrations.AlterField(
+            model_name='stockanalysis',
+            name='yearly_ma',
+            field=models.FloatField(blank=True, null=True, verbose_name='Yıllık Ortalama'),
+        ),
+    ]
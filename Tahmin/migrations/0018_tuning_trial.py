@@ -0,0 +1,40 @@
+# Generated by Django 5.1.7 on 2026-10-18 11:43
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Tahmin', '0017_analysis_float_fields'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TuningTrial',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('study', models.CharField(db_index=True, max_length=64, verbose_name='Çalışma')),
+                ('model_type', models.CharField(max_length=20, verbose_name='Model Tipi')),
+                ('time_horizon', models.PositiveSmallIntegerField(verbose_name='Tahmin Ufku (Ay)')),
+                ('number', models.PositiveIntegerField(verbose_name='Deneme No')),
+                ('params', models.JSONField(default=dict, verbose_name='Hiperparametreler')),
+                ('params_key', models.CharField(max_length=64, verbose_name='Parametre Özeti')),
+                ('fold_scores', models.JSONField(blank=True, default=list, verbose_name='Kat RMSE Değerleri')),
+                ('score', models.FloatField(blank=True, null=True, verbose_name='Ortalama RMSE')),
+                ('state', models.CharField(choices=[('complete', 'Tamamlandı'), ('pruned', 'Erken Durduruldu'), ('failed', 'Başarısız')], max_length=10, verbose_name='Durum')),
+                ('error', models.TextField(blank=True, verbose_name='Hata')),
+                ('duration', models.FloatField(default=0, verbose_name='Süre (sn)')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Oluşturulma Tarihi')),
+                ('stock', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='tuning_trials', to='Tahmin.stock', verbose_name='Hisse')),
+            ],
+            options={
+                'verbose_name': 'Hiperparametre Denemesi',
+                'verbose_name_plural': 'Hiperparametre Denemeleri',
+                'ordering': ['study', 'number'],
+                'indexes': [models.Index(fields=['stock', 'model_type', 'time_horizon', 'created_at'], name='Tahmin_tuni_stock_i_7f7a1c_idx')],
+                'unique_together': {('study', 'params_key')},
+            },
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.1.7 on 2026-10-18 11:55
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Tahmin', '0018_tuning_trial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PriceBar',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('timeframe', models.CharField(choices=[('W', 'Haftalık'), ('M', 'Aylık')], max_length=1, verbose_name='Zaman Dilimi')),
+                ('period_start', models.DateField(verbose_name='Dönem Başlangıcı')),
+                ('last_date', models.DateField(verbose_name='Son İşlem Günü')),
+                ('open', models.FloatField(verbose_name='Açılış')),
+                ('high', models.FloatField(verbose_name='En Yüksek')),
+                ('low', models.FloatField(verbose_name='En Düşük')),
+                ('close', models.FloatField(verbose_name='Kapanış')),
+                ('volume', models.BigIntegerField(verbose_name='İşlem Hacmi')),
+                ('day_count', models.PositiveSmallIntegerField(verbose_name='İşlem Günü Sayısı')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Güncelleme Tarihi')),
+                ('stock', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='bars', to='Tahmin.stock', verbose_name='Hisse')),
+            ],
+            options={
+                'verbose_name': 'Fiyat Barı',
+                'verbose_name_plural': 'Fiyat Barları',
+                'ordering': ['stock', 'timeframe', 'period_start'],
+                'unique_together': {('stock', 'timeframe', 'period_start')},
+            },
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.1.7 on 2026-10-18 12:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Tahmin', '0019_price_bar'),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='stockprice',
+            name='stockprice_stock_date_uniq',
+        ),
+        migrations.AddIndex(
+            model_name='stockprice',
+            index=models.Index(fields=['stock', 'date'], include=('opening_price', 'highest_price', 'lowest_price', 'closing_price', 'volume'), name='stockprice_stock_date_cover'),
+        ),
+        migrations.AddConstraint(
+            model_name='stockprice',
+            constraint=models.UniqueConstraint(fields=('stock', 'date'), name='stockprice_stock_date_uniq'),
+        ),
+    ]
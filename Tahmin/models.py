@@ -42,75 +42,147 @@ class StockPrice(models.Model):
         verbose_name = "Hisse Fiyatı"
         verbose_name_plural = "Hisse Fiyatları"
         ordering = ['-date']
-        unique_together = ['stock', 'date']  # Aynı hisse için aynı tarihte birden fazla kayıt olmamalı
+        constraints = [
+            # Aynı hisse için aynı tarihte birden fazla kayıt olmamalı
+            models.UniqueConstraint(fields=['stock', 'date'], name='stockprice_stock_date_uniq'),
+        ]
+        indexes = [
+            # Fiyat sütunlarını da taşıyan (covering) indeks: tarih aralığı sorguları tabloya gitmeden
+            # indeksten okunur. Kapsayan indeks desteklemeyen veritabanlarında (SQLite) oluşturulmaz.
+            models.Index(
+                fields=['stock', 'date'],
+                include=['opening_price', 'highest_price', 'lowest_price', 'closing_price', 'volume'],
+                name='stockprice_stock_date_cover',
+            ),
+            # Tüm hisseleri kapsayan tarih aralığı sorguları (toplu tahmin, makro birleştirme)
+            models.Index(fields=['date'], name='stockprice_date_idx'),
+            # Sütunsal önbelleğin parmak izi sorgusu (kayıt sayısı + son güncelleme)
+            models.Index(fields=['stock', 'updated_at'], name='price_stock_updated_idx'),
+        ]
+
+# Gün içi (dakika/saat) barlar: her hisse/aralık/gün için tek satır, barlar paketlenmiş dizi olarak saklanır
+class IntradayBlock(models.Model):
+    INTERVAL_CHOICES = [
+        ('1m', '1 Dakika'),
+        ('5m', '5 Dakika'),
+        ('15m', '15 Dakika'),
+        ('30m', '30 Dakika'),
+        ('1h', '1 Saat'),
+    ]
+
+    stock = models.ForeignKey(Stock, on_delete=models.CASCADE, related_name='intraday_blocks', verbose_name="Hisse")
+    interval = models.CharField(max_length=3, choices=INTERVAL_CHOICES, verbose_name="Bar Aralığı")
+    date = models.DateField(verbose_name="Tarih")
+    bar_count = models.PositiveIntegerField(default=0, verbose_name="Bar Sayısı")
+    # zlib ile sıkıştırılmış (time, open, high, low, close, volume) kayıt dizisi; bkz. Tahmin.intraday
+    data = models.BinaryField(verbose_name="Bar Verisi")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Kayıt Tarihi")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Güncelleme Tarihi")
+
+    def __str__(self):
+        return f"{self.stock.symbol} - {self.date} ({self.interval}, {self.bar_count} bar)"
+
+    class Meta:
+        verbose_name = "Gün İçi Bar Bloğu"
+        verbose_name_plural = "Gün İçi Bar Blokları"
+        ordering = ['-date']
+        unique_together = ['stock', 'interval', 'date']
+
+# Günlük fiyatlardan türetilen haftalık/aylık OHLCV barları; fiyat eklendikçe etkilenen dönemler yeniden yazılır (bkz. Tahmin.bars)
+class PriceBar(models.Model):
+    TIMEFRAME_CHOICES = [
+        ('W', 'Haftalık'),
+        ('M', 'Aylık'),
+    ]
+
+    stock = models.ForeignKey(Stock, on_delete=models.CASCADE, related_name='bars', verbose_name="Hisse")
+    timeframe = models.CharField(max_length=1, choices=TIMEFRAME_CHOICES, verbose_name="Zaman Dilimi")
+    period_start = models.DateField(verbose_name="Dönem Başlangıcı")
+    last_date = models.DateField(verbose_name="Son İşlem Günü")
+    open = models.FloatField(verbose_name="Açılış")
+    high = models.FloatField(verbose_name="En Yüksek")
+    low = models.FloatField(verbose_name="En Düşük")
+    close = models.FloatField(verbose_name="Kapanış")
+    volume = models.BigIntegerField(verbose_name="İşlem Hacmi")
+    day_count = models.PositiveSmallIntegerField(verbose_name="İşlem Günü Sayısı")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Güncelleme Tarihi")
+
+    def __str__(self):
+        return f"{self.stock.symbol} - {self.period_start} ({self.timeframe})"
+
+    class Meta:
+        verbose_name = "Fiyat Barı"
+        verbose_name_plural = "Fiyat Barları"
+        ordering = ['stock', 'timeframe', 'period_start']
+        unique_together = ['stock', 'timeframe', 'period_start']
 
 class StockAnalysis(models.Model):
     stock = models.ForeignKey(Stock, on_delete=models.CASCADE, related_name='analyses', verbose_name="Hisse")
     date = models.DateField(verbose_name="Analiz Tarihi")
 
     # Hareketli Ortalamalar (Günlük)
-    ma_5 = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True, verbose_name="5 Günlük Ortalama")
-    ma_10 = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True, verbose_name="10 Günlük Ortalama")
-    ma_20 = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True, verbose_name="20 Günlük Ortalama")
-    ma_50 = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True, verbose_name="50 Günlük Ortalama")
-    ma_100 = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True, verbose_name="100 Günlük Ortalama")
-    ma_200 = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True, verbose_name="200 Günlük Ortalama")
+    ma_5 = models.FloatField(null=True, blank=True, verbose_name="5 Günlük Ortalama")
+    ma_10 = models.FloatField(null=True, blank=True, verbose_name="10 Günlük Ortalama")
+    ma_20 = models.FloatField(null=True, blank=True, verbose_name="20 Günlük Ortalama")
+    ma_50 = models.FloatField(null=True, blank=True, verbose_name="50 Günlük Ortalama")
+    ma_100 = models.FloatField(null=True, blank=True, verbose_name="100 Günlük Ortalama")
+    ma_200 = models.FloatField(null=True, blank=True, verbose_name="200 Günlük Ortalama")
 
     # Hareketli Ortalamalar (Haftalık, Aylık, Yıllık)
-    weekly_ma = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True, verbose_name="Haftalık Ortalama")
-    monthly_ma = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True, verbose_name="Aylık Ortalama")
-    yearly_ma = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True, verbose_name="Yıllık Ortalama")
+    weekly_ma = models.FloatField(null=True, blank=True, verbose_name="Haftalık Ortalama")
+    monthly_ma = models.FloatField(null=True, blank=True, verbose_name="Aylık Ortalama")
+    yearly_ma = models.FloatField(null=True, blank=True, verbose_name="Yıllık Ortalama")
 
     # EMA (Üssel Hareketli Ortalama)
-    ema_12 = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True, verbose_name="EMA 12")
-    ema_26 = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True, verbose_name="EMA 26")
+    ema_12 = models.FloatField(null=True, blank=True, verbose_name="EMA 12")
+    ema_26 = models.FloatField(null=True, blank=True, verbose_name="EMA 26")
 
     # WMA (Ağırlıklı Hareketli Ortalama)
-    wma_20 = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True, verbose_name="WMA 20")
+    wma_20 = models.FloatField(null=True, blank=True, verbose_name="WMA 20")
 
     # Fibonacci Seviyeleri
-    fib_0_236 = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True, verbose_name="Fibonacci 0.236")
-    fib_0_382 = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True, verbose_name="Fibonacci 0.382")
-    fib_0_5 = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True, verbose_name="Fibonacci 0.5")
-    fib_0_618 = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True, verbose_name="Fibonacci 0.618")
-    fib_0_786 = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True, verbose_name="Fibonacci 0.786")
-    fib_1_0 = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True, verbose_name="Fibonacci 1.0")
+    fib_0_236 = models.FloatField(null=True, blank=True, verbose_name="Fibonacci 0.236")
+    fib_0_382 = models.FloatField(null=True, blank=True, verbose_name="Fibonacci 0.382")
+    fib_0_5 = models.FloatField(null=True, blank=True, verbose_name="Fibonacci 0.5")
+    fib_0_618 = models.FloatField(null=True, blank=True, verbose_name="Fibonacci 0.618")
+    fib_0_786 = models.FloatField(null=True, blank=True, verbose_name="Fibonacci 0.786")
+    fib_1_0 = models.FloatField(null=True, blank=True, verbose_name="Fibonacci 1.0")
 
     # İndikatörler
-    rsi = models.DecimalField(max_digits=5, decimal_places=2, null=True, blank=True, verbose_name="RSI")
-    macd = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True, verbose_name="MACD")
-    macd_signal = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True, verbose_name="MACD Sinyal")
-    macd_hist = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True, verbose_name="MACD Histogram")
-    stochastic_k = models.DecimalField(max_digits=5, decimal_places=2, null=True, blank=True, verbose_name="Stokastik %K")
-    stochastic_d = models.DecimalField(max_digits=5, decimal_places=2, null=True, blank=True, verbose_name="Stokastik %D")
-    cci = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True, verbose_name="CCI")
-    bollinger_upper = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True, verbose_name="Bollinger Üst")
-    bollinger_middle = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True, verbose_name="Bollinger Orta")
-    bollinger_lower = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True, verbose_name="Bollinger Alt")
-    atr = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True, verbose_name="ATR")
-    momentum = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True, verbose_name="Momentum")
-    williams_r = models.DecimalField(max_digits=5, decimal_places=2, null=True, blank=True, verbose_name="Williams %R")
-    obv = models.DecimalField(max_digits=15, decimal_places=2, null=True, blank=True, verbose_name="OBV")
-    mfi = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True, verbose_name="MFI")
+    rsi = models.FloatField(null=True, blank=True, verbose_name="RSI")
+    macd = models.FloatField(null=True, blank=True, verbose_name="MACD")
+    macd_signal = models.FloatField(null=True, blank=True, verbose_name="MACD Sinyal")
+    macd_hist = models.FloatField(null=True, blank=True, verbose_name="MACD Histogram")
+    stochastic_k = models.FloatField(null=True, blank=True, verbose_name="Stokastik %K")
+    stochastic_d = models.FloatField(null=True, blank=True, verbose_name="Stokastik %D")
+    cci = models.FloatField(null=True, blank=True, verbose_name="CCI")
+    bollinger_upper = models.FloatField(null=True, blank=True, verbose_name="Bollinger Üst")
+    bollinger_middle = models.FloatField(null=True, blank=True, verbose_name="Bollinger Orta")
+    bollinger_lower = models.FloatField(null=True, blank=True, verbose_name="Bollinger Alt")
+    atr = models.FloatField(null=True, blank=True, verbose_name="ATR")
+    momentum = models.FloatField(null=True, blank=True, verbose_name="Momentum")
+    williams_r = models.FloatField(null=True, blank=True, verbose_name="Williams %R")
+    obv = models.FloatField(null=True, blank=True, verbose_name="OBV")
+    mfi = models.FloatField(null=True, blank=True, verbose_name="MFI")
 
     # Destek/Direnç
-    support_level = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True, verbose_name="Destek Seviyesi")
-    resistance_level = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True, verbose_name="Direnç Seviyesi")
+    support_level = models.FloatField(null=True, blank=True, verbose_name="Destek Seviyesi")
+    resistance_level = models.FloatField(null=True, blank=True, verbose_name="Direnç Seviyesi")
 
     # Pivot Noktaları
-    pivot = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True, verbose_name="Pivot")
-    s1 = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True, verbose_name="S1")
-    s2 = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True, verbose_name="S2")
-    s3 = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True, verbose_name="S3")
-    r1 = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True, verbose_name="R1")
-    r2 = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True, verbose_name="R2")
-    r3 = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True, verbose_name="R3")
+    pivot = models.FloatField(null=True, blank=True, verbose_name="Pivot")
+    s1 = models.FloatField(null=True, blank=True, verbose_name="S1")
+    s2 = models.FloatField(null=True, blank=True, verbose_name="S2")
+    s3 = models.FloatField(null=True, blank=True, verbose_name="S3")
+    r1 = models.FloatField(null=True, blank=True, verbose_name="R1")
+    r2 = models.FloatField(null=True, blank=True, verbose_name="R2")
+    r3 = models.FloatField(null=True, blank=True, verbose_name="R3")
 
     # Diğer
-    volatility = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True, verbose_name="Volatilite")
-    beta = models.DecimalField(max_digits=5, decimal_places=2, null=True, blank=True, verbose_name="Beta")
-    sharpe_ratio = models.DecimalField(max_digits=5, decimal_places=2, null=True, blank=True, verbose_name="Sharpe Oranı")
-    sortino_ratio = models.DecimalField(max_digits=5, decimal_places=2, null=True, blank=True, verbose_name="Sortino Oranı")
+    volatility = models.FloatField(null=True, blank=True, verbose_name="Volatilite")
+    beta = models.FloatField(null=True, blank=True, verbose_name="Beta")
+    sharpe_ratio = models.FloatField(null=True, blank=True, verbose_name="Sharpe Oranı")
+    sortino_ratio = models.FloatField(null=True, blank=True, verbose_name="Sortino Oranı")
 
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="Kayıt Tarihi")
     updated_at = models.DateTimeField(auto_now=True, verbose_name="Güncelleme Tarihi")
@@ -122,7 +194,13 @@ class StockAnalysis(models.Model):
         verbose_name = "Hisse Analizi"
         verbose_name_plural = "Hisse Analizleri"
         ordering = ['-date']
-        unique_together = ['stock', 'date']
+        constraints = [
+            models.UniqueConstraint(fields=['stock', 'date'], name='stockanalysis_stock_date_uniq'),
+        ]
+        indexes = [
+            # Sütunsal önbelleğin parmak izi sorgusu (kayıt sayısı + son kayıt zamanı)
+            models.Index(fields=['stock', 'created_at'], name='analysis_stock_created_idx'),
+        ]
 
 class StockFile(models.Model):
     stock = models.ForeignKey(Stock, on_delete=models.CASCADE, related_name='files')
@@ -545,3 +623,130 @@ class SeasonalEffect(models.Model):
         verbose_name_plural = "Mevsimsel Etkiler"
         ordering = ['sector', 'season']
         unique_together = ['sector', 'season']
+
+# Uzun süren işlemler (dosya işleme, analiz, içe aktarma) için veritabanı tabanlı iş kuyruğu
+class BackgroundJob(models.Model):
+    STATUS_CHOICES = [
+        ('pending', 'Bekliyor'),
+        ('running', 'Çalışıyor'),
+        ('completed', 'Tamamlandı'),
+        ('failed', 'Başarısız'),
+    ]
+
+    job_type = models.CharField(max_length=50, verbose_name="İş Tipi")
+    params = models.JSONField(default=dict, blank=True, verbose_name="Parametreler")
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending', verbose_name="Durum")
+    progress = models.PositiveSmallIntegerField(default=0, verbose_name="İlerleme (%)")
+    message = models.CharField(max_length=255, blank=True, default='', verbose_name="Durum Mesajı")
+    result = models.JSONField(null=True, blank=True, verbose_name="Sonuç")
+    error = models.TextField(blank=True, default='', verbose_name="Hata")
+    attempts = models.PositiveSmallIntegerField(default=0, verbose_name="Deneme Sayısı")
+    max_attempts = models.PositiveSmallIntegerField(default=3, verbose_name="En Fazla Deneme")
+    worker = models.CharField(max_length=100, blank=True, default='', verbose_name="İşçi")
+    created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, verbose_name="Oluşturan")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Oluşturulma Tarihi")
+    started_at = models.DateTimeField(null=True, blank=True, verbose_name="Başlangıç Zamanı")
+    heartbeat_at = models.DateTimeField(null=True, blank=True, verbose_name="Son Sinyal")
+    finished_at = models.DateTimeField(null=True, blank=True, verbose_name="Bitiş Zamanı")
+
+    def __str__(self):
+        return f"#{self.id} {self.job_type} ({self.get_status_display()})"
+
+    @property
+    def is_finished(self):
+        return self.status in ('completed', 'failed')
+
+    class Meta:
+        verbose_name = "Arka Plan İşi"
+        verbose_name_plural = "Arka Plan İşleri"
+        ordering = ['-created_at']
+        indexes = [models.Index(fields=['status', 'created_at'])]
+
+# Eğitilmiş tahmin modellerinin kayıt defteri; aynı girdilerle yeniden eğitim yapılmaz
+class ModelArtifact(models.Model):
+    # Tüm hisselerle eğitilen (toplu tahmin) modellerde hisse boştur
+    stock = models.ForeignKey(Stock, on_delete=models.CASCADE, null=True, blank=True, related_name='model_artifacts', verbose_name="Hisse")
+    model_type = models.CharField(max_length=20, verbose_name="Model Tipi")
+    time_horizon = models.PositiveSmallIntegerField(verbose_name="Tahmin Ufku (Ay)")
+    content_hash = models.CharField(max_length=64, unique=True, verbose_name="İçerik Özeti")
+    data_start = models.DateField(null=True, blank=True, verbose_name="Veri Başlangıcı")
+    data_end = models.DateField(null=True, blank=True, verbose_name="Veri Bitişi")
+    row_count = models.PositiveIntegerField(default=0, verbose_name="Fiyat Kaydı Sayısı")
+    feature_names = models.JSONField(default=list, blank=True, verbose_name="Özellikler")
+    params = models.JSONField(default=dict, blank=True, verbose_name="Hiperparametreler")
+    metrics = models.JSONField(default=dict, blank=True, verbose_name="Doğrulama Metrikleri")
+    file_path = models.CharField(max_length=500, verbose_name="Dosya Yolu")
+    file_size = models.PositiveBigIntegerField(default=0, verbose_name="Dosya Boyutu")
+    use_count = models.PositiveIntegerField(default=0, verbose_name="Kullanım Sayısı")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Oluşturulma Tarihi")
+    last_used_at = models.DateTimeField(null=True, blank=True, verbose_name="Son Kullanım")
+
+    def __str__(self):
+        symbol = self.stock.symbol if self.stock_id else "Tüm hisseler"
+        return f"{symbol} {self.model_type} {self.time_horizon}a ({self.content_hash[:12]})"
+
+    class Meta:
+        verbose_name = "Model Dosyası"
+        verbose_name_plural = "Model Dosyaları"
+        ordering = ['-created_at']
+        indexes = [models.Index(fields=['stock', 'model_type', 'time_horizon', 'created_at'])]
+
+# Tüm hisse evreni için tek seferde üretilen tahminler; her çalıştırma bir run_id ile gruplanır
+class BatchPrediction(models.Model):
+    run_id = models.CharField(max_length=32, db_index=True, verbose_name="Çalıştırma")
+    stock = models.ForeignKey(Stock, on_delete=models.CASCADE, related_name='batch_predictions', verbose_name="Hisse")
+    model_type = models.CharField(max_length=20, verbose_name="Model Tipi")
+    time_horizon = models.PositiveSmallIntegerField(verbose_name="Tahmin Ufku (Ay)")
+    as_of = models.DateField(verbose_name="Son Fiyat Tarihi")
+    target_date = models.DateField(verbose_name="Hedef Tarih")
+    last_price = models.FloatField(verbose_name="Son Fiyat")
+    predicted_price = models.FloatField(verbose_name="Tahmini Fiyat")
+    change_percent = models.FloatField(verbose_name="Beklenen Değişim (%)")
+    lower_bound = models.FloatField(verbose_name="Alt Sınır")
+    upper_bound = models.FloatField(verbose_name="Üst Sınır")
+    artifact_hash = models.CharField(max_length=64, verbose_name="Model Özeti")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Oluşturulma Tarihi")
+
+    def __str__(self):
+        return f"{self.stock.symbol} {self.as_of} → {self.target_date}: {self.change_percent:+.2f}%"
+
+    class Meta:
+        verbose_name = "Toplu Tahmin"
+        verbose_name_plural = "Toplu Tahminler"
+        ordering = ['-created_at', '-change_percent']
+        unique_together = ['run_id', 'stock']
+
+# Hiperparametre aramasındaki her deneme; aynı çalışma (study) yeniden başlatıldığında
+# tamamlanan denemeler tekrar çalıştırılmaz
+class TuningTrial(models.Model):
+    STATE_CHOICES = [
+        ('complete', 'Tamamlandı'),
+        ('pruned', 'Erken Durduruldu'),
+        ('failed', 'Başarısız'),
+    ]
+
+    study = models.CharField(max_length=64, db_index=True, verbose_name="Çalışma")
+    # Tüm hisselerle yapılan aramalarda hisse boştur
+    stock = models.ForeignKey(Stock, on_delete=models.CASCADE, null=True, blank=True, related_name='tuning_trials', verbose_name="Hisse")
+    model_type = models.CharField(max_length=20, verbose_name="Model Tipi")
+    time_horizon = models.PositiveSmallIntegerField(verbose_name="Tahmin Ufku (Ay)")
+    number = models.PositiveIntegerField(verbose_name="Deneme No")
+    params = models.JSONField(default=dict, verbose_name="Hiperparametreler")
+    params_key = models.CharField(max_length=64, verbose_name="Parametre Özeti")
+    fold_scores = models.JSONField(default=list, blank=True, verbose_name="Kat RMSE Değerleri")
+    score = models.FloatField(null=True, blank=True, verbose_name="Ortalama RMSE")
+    state = models.CharField(max_length=10, choices=STATE_CHOICES, verbose_name="Durum")
+    error = models.TextField(blank=True, verbose_name="Hata")
+    duration = models.FloatField(default=0, verbose_name="Süre (sn)")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Oluşturulma Tarihi")
+
+    def __str__(self):
+        symbol = self.stock.symbol if self.stock_id else "Tüm hisseler"
+        return f"{symbol} {self.model_type} {self.time_horizon}a #{self.number} ({self.get_state_display()})"
+
+    class Meta:
+        verbose_name = "Hiperparametre Denemesi"
+        verbose_name_plural = "Hiperparametre Denemeleri"
+        ordering = ['study', 'number']
+        unique_together = ['study', 'params_key']
+        indexes = [models.Index(fields=['stock', 'model_type', 'time_horizon', 'created_at'])]
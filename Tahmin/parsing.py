@@ -0,0 +1,212 @@
+"""
+Türkçe biçimli piyasa verileri için sütun bazında (vektörel) sayı ve tarih dönüştürücüleri.
+
+Desteklenen biçimler: '44,98', '1.234,56' (nokta binlik, virgül ondalık ayırıcı), '44.98'
+(virgül yoksa nokta ondalık ayırıcıdır), '36,85M' / '795,44K' / '1,2B' (hacim), '0,45%' ve
+'%0,45' (yüzde). Sayı içindeki boşluklar yok sayılır ('1 234,5' -> 1234.5).
+
+Metin sütunu hücre hücre Python'da işlenmez: sütun tek seferde sabit genişlikli bir karakter
+matrisine (hücre x karakter) çevrilir, rakamlar, ayırıcılar, işaret ve sonekler NumPy
+maskeleriyle bulunur ve değer tamsayı basamaklardan 10'un kuvvetine bölünerek hesaplanır.
+En fazla 15 basamaklı değerler float() ile birebir aynı sonucu verir. Bu kalıba uymayan
+hücreler (bilimsel gösterim, çok uzun metinler vb.) tek tek parse_number ile yeniden denenir;
+yine de çözülemeyenler NaN olur ve geçersiz olarak işaretlenir (bkz. parse_numbers).
+"""
+import math
+
+import numpy as np
+import pandas as pd
+
+VOLUME_MULTIPLIERS = {'K': 1e3, 'M': 1e6, 'B': 1e9}
+
+KINDS = ('number', 'volume', 'percent')
+
+# Karakter matrisinde işlenecek en uzun hücre; daha uzun olanlar tek tek çözülür
+MAX_WIDTH = 32
+
+# float64'ün tamsayıları kayıpsız tuttuğu basamak sayısı (2**53 > 10**15)
+MAX_DIGITS = 15
+
+POW10 = 10.0 ** np.arange(MAX_DIGITS + 1)
+
+_SUFFIXES = {ord(letter): multiplier for suffix, multiplier in VOLUME_MULTIPLIERS.items() for letter in (suffix, suffix.lower())}
+# Sonek karakter kodu -> çarpan (sonek yoksa 1)
+_MULTIPLIERS = np.ones(128)
+_MULTIPLIERS[list(_SUFFIXES)] = list(_SUFFIXES.values())
+
+
+def parse_number(value, kind='number'):
+    """
+    Tek bir hücreyi float'a çevirir; çevrilemezse NaN döndürür. kind: 'number', 'volume'
+    (K/M/B soneki) ya da 'percent' (% işareti). Sütunlar için parse_numbers kullanılmalıdır.
+    """
+    if value is None or isinstance(value, bool):
+        return math.nan
+    if isinstance(value, (int, float, np.number)):
+        return float(value)
+
+    text = ''.join(str(value).split())
+    multiplier = 1.0
+    if kind == 'percent':
+        text = text.replace('%', '')
+    elif kind == 'volume' and text[-1:].upper() in VOLUME_MULTIPLIERS:
+        multiplier = VOLUME_MULTIPLIERS[text[-1].upper()]
+        text = text[:-1]
+    if ',' in text:
+        text = text.replace('.', '').replace(',', '.')
+    try:
+        return float(text) * multiplier
+    except ValueError:
+        return math.nan
+
+
+def _parse_matrix(text, kind):
+    # Sabit genişlikli metin dizisinden (değerler, çözüldü mü, boş mu); çözülemeyenler parse_number'a kalır
+    count, width = len(text), text.dtype.itemsize // 4
+    values = np.full(count, np.nan)
+    if not count or not width:
+        return values, np.zeros(count, dtype=bool), np.ones(count, dtype=bool)
+
+    # Karakter konumları üzerinde döngü: matris (konum x hücre) biçimine çevrilir ve her adımda
+    # o konumdaki karakter tüm hücreler için tek vektör işlemiyle işlenir. Tanınan karakterlerin
+    # tamamı ASCII'dir; diğerleri (127) geçersiz sayılır, böylece matris bayt olarak tutulur.
+    chars = np.ascontiguousarray(text).view(np.uint32).reshape(count, width).T
+    chars = np.where(chars == 0xA0, ord(' '), np.minimum(chars, 127)).astype(np.uint8)
+    # Virgül varsa ondalık ayırıcıdır ve noktalar binlik ayırıcıdır; yoksa nokta ondalık ayırıcıdır
+    has_comma = (chars == ord(',')).any(axis=0)
+    no_comma = ~has_comma
+
+    # Basamaklar float64'te toplanır; MAX_DIGITS basamağa kadar kayıpsızdır
+    mantissa = np.zeros(count)
+    digits, fraction, decimals, signs, marks, suffix = (np.zeros(count, dtype=np.uint8) for _ in range(6))
+    started, negative, blank_cell = np.zeros(count, dtype=bool), np.zeros(count, dtype=bool), np.ones(count, dtype=bool)
+    ok = np.ones(count, dtype=bool)
+
+    for column in chars:
+        blank = (column == 0) | (column == ord(' ')) | (column == ord('\t'))
+        digit = (column >= ord('0')) & (column <= ord('9'))
+        comma, dot = column == ord(','), column == ord('.')
+        minus = column == ord('-')
+        sign = minus | (column == ord('+'))
+        known = blank | digit | comma | dot | sign
+
+        # İşaret yalnızca ilk rakamdan/ayırıcıdan önce gelebilir
+        ok &= ~(sign & started)
+        if kind == 'volume':
+            # Sonekten (K/M/B) sonra yalnızca boşluk gelebilir
+            ok &= ~((suffix > 0) & ~blank)
+            letter = np.zeros(count, dtype=bool)
+            for code in _SUFFIXES:
+                letter |= column == code
+            np.maximum(suffix, column * letter, out=suffix)
+            marks += letter
+            known |= letter
+        elif kind == 'percent':
+            percent = column == ord('%')
+            marks += percent
+            known |= percent
+        ok &= known
+
+        step = digit.view(np.uint8)
+        mantissa *= step * 9 + 1
+        mantissa += (column - ord('0')) * step
+        digits += digit
+        fraction += digit & (decimals > 0)
+        decimals += (comma & has_comma) | (dot & no_comma)
+        signs += sign
+        negative |= minus
+        started |= digit | comma | dot
+        blank_cell &= blank
+
+    ok &= (digits >= 1) & (digits <= MAX_DIGITS) & (decimals <= 1) & (signs <= 1) & (marks <= 1)
+    multiplier = _MULTIPLIERS[suffix] if kind == 'volume' else 1.0
+    values[ok] = (mantissa / POW10[np.minimum(fraction, MAX_DIGITS)] * np.where(negative, -1.0, 1.0) * multiplier)[ok]
+    return values, ok, blank_cell
+
+
+def parse_numbers(values, kind='number'):
+    """
+    Türkçe biçimli sayı sütununu tek seferde float64 dizisine çevirir. kind: 'number', 'volume'
+    ya da 'percent'. (değerler, geçersiz) döndürür: çevrilemeyen hücreler NaN'dır ve geçersiz
+    maskesinde True olur; boş hücreler (None, NaN, boş metin) NaN'dır ama geçersiz sayılmaz.
+    """
+    if kind not in KINDS:
+        raise ValueError(f"Geçersiz sayı türü: {kind}")
+    cells = np.asarray(values, dtype=object) if not isinstance(values, np.ndarray) else values
+    if cells.dtype.kind in 'iuf':
+        result = cells.astype(float)
+        return result, np.zeros(len(result), dtype=bool)
+
+    cells = cells.astype(object)
+    missing = pd.isna(cells)
+    text = cells.astype(str)
+    text[missing] = ''
+
+    if text.dtype.itemsize // 4 <= MAX_WIDTH:
+        result, parsed, empty = _parse_matrix(text, kind)
+    else:
+        result = np.full(len(text), np.nan)
+        parsed = np.zeros(len(text), dtype=bool)
+        empty = np.zeros(len(text), dtype=bool)
+        short = np.char.str_len(text) <= MAX_WIDTH
+        result[short], parsed[short], empty[short] = _parse_matrix(text[short].astype(f'U{MAX_WIDTH}'), kind)
+        empty[~short] = [not cell.strip() for cell in text[~short]]
+
+    retry = np.flatnonzero(~parsed & ~empty)
+    if len(retry):
+        result[retry] = [parse_number(cell, kind) for cell in text[retry]]
+    return result, ~empty & np.isnan(result)
+
+
+def _series(values, kind):
+    values = pd.Series(values)
+    return pd.Series(parse_numbers(values.to_numpy(), kind)[0], index=values.index)
+
+
+def to_number(values):
+    """
+    Türkçe biçimli sayı sütununu float'a çevirir ('44,98' -> 44.98, '1.234,56' -> 1234.56).
+    Çevrilemeyen hücreler NaN olur.
+    """
+    return _series(values, 'number')
+
+
+def to_volume(values):
+    """
+    Hacim sütununu float'a çevirir ('36,85M' -> 36850000.0, '795,44K' -> 795440.0).
+    Çevrilemeyen hücreler NaN olur.
+    """
+    return _series(values, 'volume')
+
+
+def to_percent(values):
+    """Yüzde sütununu ('0,45%' -> 0.45) float'a çevirir."""
+    return _series(values, 'percent')
+
+
+def to_text(values):
+    """Metin sütunu; baştaki/sondaki boşluklar atılır, boş hücreler NaN olur."""
+    values = pd.Series(values)
+    text = values.astype(str).str.strip()
+    return text.where(values.notna() & (text != ''))
+
+
+def parse_dates(values):
+    """
+    Tarih sütununu (gün.ay.yıl) tek seferde dönüştürür.
+    Ortak formata uymayan hücreler tek tek yeniden denenir; yine de çözülemeyenler NaT olur.
+    ISO biçimli (yıl-ay-gün) metinler gün önce okunmaz.
+    """
+    values = pd.Series(values)
+    dates = pd.to_datetime(values, dayfirst=True, errors='coerce')
+
+    if values.dtype == object:
+        iso = values.astype(str).str.match(r'\d{4}-\d{1,2}-\d{1,2}')
+        if iso.any():
+            dates[iso] = pd.to_datetime(values[iso], format='ISO8601', errors='coerce')
+
+    retry = dates.isna() & values.notna()
+    if retry.any():
+        dates[retry] = [pd.to_datetime(value, dayfirst=True, errors='coerce') for value in values[retry]]
+
+    return dates
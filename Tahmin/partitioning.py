@@ -0,0 +1,175 @@
+"""
+PostgreSQL üzerinde StockPrice ve StockAnalysis tablolarının yıllık aralıklara bölünmesi
+(declarative range partitioning).
+
+Bölümlenmiş tabloda sorgular yalnızca ilgili yılların bölümlerine gider ("son 30 gün" tek
+bölüme); her bölümün indeksi küçük kalır ve eski yıllar ayrı ayrı bakıma alınabilir.
+Django modelleri değişmez: tablo adı, sütunlar, indeks ve kısıt adları aynı kalır. PostgreSQL
+bölümlenmiş tablolarda benzersiz kısıtların bölüm anahtarını içermesini gerektirdiğinden birincil
+anahtar (id, date) olur; (stock, date) benzersiz kısıtı zaten date içerir.
+"""
+import logging
+from datetime import date
+
+from django.db import connection
+
+logger = logging.getLogger(__name__)
+
+OLD_SUFFIX = '_unpartitioned'
+
+
+def _quote(name):
+    return connection.ops.quote_name(name)
+
+
+def partition_name(table, year=None):
+    return f"{table}_default" if year is None else f"{table}_y{year}"
+
+
+def year_bounds(year):
+    return date(year, 1, 1).isoformat(), date(year + 1, 1, 1).isoformat()
+
+
+def is_partitioned(cursor, table):
+    cursor.execute("SELECT relkind FROM pg_class WHERE oid = to_regclass(%s)", [_quote(table)])
+    row = cursor.fetchone()
+    return bool(row) and row[0] == 'p'
+
+
+def existing_partitions(cursor, table):
+    cursor.execute(
+        "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+        "WHERE i.inhparent = to_regclass(%s)",
+        [_quote(table)],
+    )
+    return {row[0] for row in cursor.fetchall()}
+
+
+def _table_definitions(cursor, table):
+    """Tablonun kısıt ve (kısıta bağlı olmayan) indeks tanımları: ([(ad, tip, tanım)], [(ad, tanım)])."""
+    cursor.execute(
+        "SELECT conname, contype, pg_get_constraintdef(oid) FROM pg_constraint "
+        "WHERE conrelid = to_regclass(%s) AND contype IN ('p', 'u', 'f', 'c') ORDER BY contype",
+        [_quote(table)],
+    )
+    constraints = cursor.fetchall()
+
+    cursor.execute(
+        "SELECT c.relname, pg_get_indexdef(i.indexrelid) FROM pg_index i "
+        "JOIN pg_class c ON c.oid = i.indexrelid "
+        "WHERE i.indrelid = to_regclass(%s) "
+        "AND NOT EXISTS (SELECT 1 FROM pg_constraint k WHERE k.conindid = i.indexrelid)",
+        [_quote(table)],
+    )
+    return constraints, cursor.fetchall()
+
+
+def convert_to_partitioned(cursor, table, partition_key='date', years_ahead=1, keep_old=False):
+    """
+    Normal tabloyu partition_key üzerinden yıllık bölümlenmiş tabloya çevirir ve verileri taşır.
+    Aynı işlem (transaction) içinde çalıştırılmalıdır. Çalıştırılan SQL listesini döndürür.
+    """
+    executed = []
+
+    def run(sql, params=None):
+        cursor.execute(sql, params)
+        executed.append(sql)
+
+    old_table = f"{table}{OLD_SUFFIX}"
+    constraints, indexes = _table_definitions(cursor, table)
+
+    cursor.execute(
+        f"SELECT EXTRACT(YEAR FROM MIN({_quote(partition_key)}))::int FROM {_quote(table)}"
+    )
+    first_year = cursor.fetchone()[0] or date.today().year
+
+    # Eski tablo ve indeks/kısıt adları serbest bırakılır (indeks adı değişince bağlı kısıtınki de değişir)
+    run(f"ALTER TABLE {_quote(table)} RENAME TO {_quote(old_table)}")
+    for name, contype, _ in constraints:
+        if contype in ('p', 'u'):
+            run(f"ALTER INDEX {_quote(name)} RENAME TO {_quote(name + OLD_SUFFIX)}")
+        else:
+            run(f"ALTER TABLE {_quote(old_table)} RENAME CONSTRAINT {_quote(name)} TO {_quote(name + OLD_SUFFIX)}")
+    for name, _ in indexes:
+        run(f"ALTER INDEX {_quote(name)} RENAME TO {_quote(name + OLD_SUFFIX)}")
+
+    run(
+        f"CREATE TABLE {_quote(table)} (LIKE {_quote(old_table)} INCLUDING DEFAULTS INCLUDING IDENTITY) "
+        f"PARTITION BY RANGE ({_quote(partition_key)})"
+    )
+
+    for name, contype, definition in constraints:
+        if contype == 'p':
+            definition = f"PRIMARY KEY (id, {_quote(partition_key)})"
+        run(f"ALTER TABLE {_quote(table)} ADD CONSTRAINT {_quote(name)} {definition}")
+    for name, definition in indexes:
+        # Tanımlar yeniden adlandırmadan önce alındığından özgün indeks ve tablo adlarını içerir;
+        # bölümlenmiş tabloda oluşturulan indeks tüm bölümlere uygulanır
+        run(definition)
+
+    for year in range(first_year, date.today().year + years_ahead + 1):
+        start, end = year_bounds(year)
+        run(
+            f"CREATE TABLE {_quote(partition_name(table, year))} PARTITION OF {_quote(table)} "
+            f"FOR VALUES FROM ('{start}') TO ('{end}')"
+        )
+    run(f"CREATE TABLE {_quote(partition_name(table))} PARTITION OF {_quote(table)} DEFAULT")
+
+    run(f"INSERT INTO {_quote(table)} SELECT * FROM {_quote(old_table)}")
+
+    # Kimlik (id) dizisi: IDENTITY sütunlarında yeni dizi eski en büyük değerden devam eder;
+    # serial sütunlarda eski dizi yeni tabloya devredilir.
+    cursor.execute("SELECT pg_get_serial_sequence(%s, 'id'), pg_get_serial_sequence(%s, 'id')",
+                   [_quote(table), _quote(old_table)])
+    new_sequence, old_sequence = cursor.fetchone()
+    if new_sequence and new_sequence != old_sequence:
+        run(f"SELECT setval('{new_sequence}', COALESCE((SELECT MAX(id) FROM {_quote(table)}), 0) + 1, false)")
+    elif old_sequence:
+        run(f"ALTER SEQUENCE {old_sequence} OWNED BY {_quote(table)}.id")
+
+    if not keep_old:
+        run(f"DROP TABLE {_quote(old_table)}")
+
+    run(f"ANALYZE {_quote(table)}")
+    return executed
+
+
+def ensure_partitions(cursor, table, through_year, partition_key='date'):
+    """
+    through_year dahil eksik yıllık bölümleri oluşturur. Varsayılan bölümde o yıla ait
+    satırlar varsa önce yeni bölüme taşınır. Oluşturulan bölüm adlarını döndürür.
+    """
+    existing = existing_partitions(cursor, table)
+    default = partition_name(table)
+    years = sorted(
+        int(name.rsplit('_y', 1)[1]) for name in existing if name != default and '_y' in name
+    )
+    start_year = years[-1] + 1 if years else date.today().year
+
+    created = []
+    for year in range(start_year, through_year + 1):
+        name = partition_name(table, year)
+        start, end = year_bounds(year)
+        key = _quote(partition_key)
+
+        cursor.execute(
+            f"SELECT EXISTS (SELECT 1 FROM {_quote(default)} WHERE {key} >= %s AND {key} < %s)",
+            [start, end],
+        )
+        if cursor.fetchone()[0]:
+            cursor.execute(f"ALTER TABLE {_quote(table)} DETACH PARTITION {_quote(default)}")
+            cursor.execute(
+                f"CREATE TABLE {_quote(name)} PARTITION OF {_quote(table)} FOR VALUES FROM ('{start}') TO ('{end}')"
+            )
+            cursor.execute(
+                f"INSERT INTO {_quote(table)} SELECT * FROM {_quote(default)} WHERE {key} >= %s AND {key} < %s",
+                [start, end],
+            )
+            cursor.execute(f"DELETE FROM {_quote(default)} WHERE {key} >= %s AND {key} < %s", [start, end])
+            cursor.execute(f"ALTER TABLE {_quote(table)} ATTACH PARTITION {_quote(default)} DEFAULT")
+        else:
+            cursor.execute(
+                f"CREATE TABLE {_quote(name)} PARTITION OF {_quote(table)} FOR VALUES FROM ('{start}') TO ('{end}')"
+            )
+        created.append(name)
+    return created
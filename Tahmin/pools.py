@@ -0,0 +1,41 @@
+"""
+Django modellerine erişen işler için süreç havuzu.
+
+Alt süreçler spawn ile başlatıldığında Django henüz yüklenmemiştir; fork ile başlatıldığında ise
+üst sürecin veritabanı bağlantılarını kopyalar ve bu bağlantılar süreçler arasında paylaşılmamalıdır.
+process_pool, üst süreçteki bağlantıları havuz açılmadan önce kapatır ve her alt süreçte Django'yu
+(gerekirse) yükleyip bağlantıları kapattıktan sonra modüle özgü başlatıcıyı çalıştırır. Başlatıcı
+alt sürece modül ve isim olarak aktarılır: modeller içeren modülü Django yüklenmeden içe aktarmak
+spawn ile başlayan süreçlerde hata verir.
+"""
+import importlib
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.db import connections
+
+
+def _init_django():
+    """Alt süreçte Django'yu yükler (spawn) ve fork ile kopyalanan bağlantıları kapatır."""
+    from django.apps import apps
+    if not apps.ready:
+        django.setup()
+    connections.close_all()
+
+
+def _init_worker(initializer, initargs):
+    _init_django()
+    if initializer is not None:
+        module, name = initializer
+        getattr(importlib.import_module(module), name)(*initargs)
+
+
+def process_pool(max_workers, initializer=None, initargs=()):
+    """
+    Django'ya hazır alt süreçlerle ProcessPoolExecutor. initializer verilirse her alt süreçte
+    Django yüklendikten sonra initargs ile çağrılır.
+    """
+    if initializer is not None:
+        initializer = (initializer.__module__, initializer.__name__)
+    connections.close_all()
+    return ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker, initargs=(initializer, initargs))
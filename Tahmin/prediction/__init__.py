@@ -0,0 +1,30 @@
+"""
+Hisse fiyatı tahmin motoru.
+
+Modeller scikit-learn üzerine kurulu, CPU dostu tahmincilerdir (bkz. estimators). Eğitilmiş
+modeller süreç içi önbellekte (cache.model_cache) tutulur; web uygulaması tahminleri
+service modülü üzerinden yapar.
+"""
+from .cache import ModelCache, model_cache
+from .estimators import BaseModel, LSTMModel, XGBoostModel, HybridModel, MODEL_TYPES, create_model
+from .explainer import ModelExplainer
+from .optimizer import ModelOptimizer
+from .orchestrator import ModelOrchestrator
+from .reporting import ReportExporter
+from .tracker import ModelTracker
+
+__all__ = [
+    'BaseModel',
+    'LSTMModel',
+    'XGBoostModel',
+    'HybridModel',
+    'MODEL_TYPES',
+    'create_model',
+    'ModelCache',
+    'model_cache',
+    'ModelExplainer',
+    'ModelOptimizer',
+    'ModelOrchestrator',
+    'ModelTracker',
+    'ReportExporter',
+]
@@ -0,0 +1,87 @@
+"""
+Eğitilmiş modeller için süreç içi LRU önbellek.
+
+Anahtar (sembol, model tipi, ufuk, veri sürümü) dörtlüsüdür; hissenin fiyatları değiştiğinde
+veri sürümü değişir ve eski model kendiliğinden kullanılmaz hale gelir. Aynı hisse için tekrar
+eden tahminler modeli yeniden eğitmez ya da diskten yüklemez.
+"""
+import threading
+from collections import OrderedDict
+
+DEFAULT_MAX_MODELS = 32
+
+
+class ModelCache:
+    """İş parçacığı güvenli, en az kullanılanı çıkaran (LRU) model önbelleği."""
+
+    def __init__(self, max_models=DEFAULT_MAX_MODELS):
+        self.max_models = max_models
+        self._models = OrderedDict()
+        self._lock = threading.Lock()
+        self._key_locks = {}
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(symbol, model_type, time_horizon, data_version, params_version=''):
+        return (symbol, model_type, int(time_horizon), data_version, params_version)
+
+    def get(self, key):
+        with self._lock:
+            model = self._models.get(key)
+            if model is None:
+                self.misses += 1
+                return None
+            self._models.move_to_end(key)
+            self.hits += 1
+            return model
+
+    def put(self, key, model):
+        with self._lock:
+            # Aynı hisse/model/ufuk için eski veri sürümlerine ait modeller atılır
+            stale = [k for k in self._models if k[:3] == key[:3] and k != key]
+            for k in stale:
+                del self._models[k]
+
+            self._models[key] = model
+            self._models.move_to_end(key)
+            while len(self._models) > self.max_models:
+                self._models.popitem(last=False)
+
+    def get_or_create(self, key, factory):
+        """Önbellekte yoksa factory() ile modeli üretir ve saklar. (model, önbellekten_mi) döndürür."""
+        model = self.get(key)
+        if model is not None:
+            return model, True
+
+        # Aynı anahtar için eşzamanlı eğitimleri tek bir eğitime indirger
+        with self._key_lock(key):
+            model = self.get(key)
+            if model is not None:
+                return model, True
+            model = factory()
+            self.put(key, model)
+            return model, False
+
+    def _key_lock(self, key):
+        with self._lock:
+            return self._key_locks.setdefault(key[:3], threading.Lock())
+
+    def invalidate(self, symbol=None):
+        with self._lock:
+            if symbol is None:
+                self._models.clear()
+            else:
+                for key in [k for k in self._models if k[0] == symbol]:
+                    del self._models[key]
+
+    def stats(self):
+        with self._lock:
+            return {'models': len(self._models), 'hits': self.hits, 'misses': self.misses}
+
+    def __len__(self):
+        return len(self._models)
+
+
+# Süreç genelinde paylaşılan önbellek
+model_cache = ModelCache()
@@ -0,0 +1,169 @@
+"""
+Tahmin modelleri. Hepsi scikit-learn tahmincileri üzerine kuruludur ve CPU üzerinde
+saniyeler içinde eğitilebilir:
+
+- LSTMModel: son günlerin getiri dizisini de girdi alan çok katmanlı algılayıcı (MLP);
+  dizi modeli yerine geçen hafif bir yaklaşım.
+- XGBoostModel: gradyan artırmalı ağaçlar; xgboost kuruluysa XGBRegressor, değilse
+  scikit-learn HistGradientBoostingRegressor kullanılır.
+- HybridModel: ikisinin ağırlıklı ortalaması.
+"""
+from datetime import datetime
+
+import joblib
+import numpy as np
+from sklearn.ensemble import HistGradientBoostingRegressor, VotingRegressor
+from sklearn.neural_network import MLPRegressor
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import StandardScaler
+
+from .features import horizon_days
+
+try:
+    from xgboost import XGBRegressor
+except ImportError:
+    XGBRegressor = None
+
+RANDOM_STATE = 42
+
+
+class BaseModel:
+    """Ortak eğitim/tahmin/kaydetme arayüzü."""
+
+    model_type = None
+    sequence_length = 0
+    default_params = {}
+
+    def __init__(self, model_name=None, time_horizon=12, params=None):
+        self.model_name = model_name or f"{self.model_type}_model_{time_horizon}m"
+        self.time_horizon = int(time_horizon)
+        self.params = {**self.default_params, **(params or {})}
+        self.estimator = None
+        self.feature_names = []
+        self.metrics = {}
+        self.data_version = None
+        self.trained_at = None
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} {self.model_name}>"
+
+    @property
+    def horizon(self):
+        """Tahmin ufku (işlem günü)."""
+        return horizon_days(self.time_horizon)
+
+    @property
+    def is_trained(self):
+        return self.estimator is not None
+
+    def build_estimator(self):
+        raise NotImplementedError
+
+    def fit(self, X, y, feature_names=None):
+        self.estimator = self.build_estimator()
+        self.estimator.fit(X, y)
+        self.feature_names = list(feature_names or [])
+        self.trained_at = datetime.now()
+        return self
+
+    def predict(self, X):
+        if not self.is_trained:
+            raise ValueError(f"{self.model_name} henüz eğitilmedi")
+        return np.asarray(self.estimator.predict(X), dtype=float)
+
+    def save(self, path):
+        joblib.dump(self, path)
+        return path
+
+    @staticmethod
+    def load(path):
+        return joblib.load(path)
+
+
+def _mlp(params):
+    return make_pipeline(
+        StandardScaler(),
+        MLPRegressor(
+            hidden_layer_sizes=tuple(params['hidden_layer_sizes']),
+            alpha=params['alpha'],
+            learning_rate_init=params['learning_rate_init'],
+            max_iter=params['max_iter'],
+            early_stopping=True,
+            random_state=RANDOM_STATE,
+        ),
+    )
+
+
+def _gradient_boosting(params):
+    if XGBRegressor is not None:
+        return XGBRegressor(
+            n_estimators=params['n_estimators'],
+            max_depth=params['max_depth'],
+            learning_rate=params['learning_rate'],
+            subsample=0.8,
+            random_state=RANDOM_STATE,
+            n_jobs=1,
+        )
+    return HistGradientBoostingRegressor(
+        max_iter=params['n_estimators'],
+        max_depth=params['max_depth'],
+        learning_rate=params['learning_rate'],
+        random_state=RANDOM_STATE,
+    )
+
+
+MLP_PARAMS = {
+    'hidden_layer_sizes': (64, 32),
+    'alpha': 1e-3,
+    'learning_rate_init': 1e-3,
+    'max_iter': 300,
+}
+
+BOOSTING_PARAMS = {
+    'n_estimators': 300,
+    'max_depth': 4,
+    'learning_rate': 0.05,
+}
+
+
+class LSTMModel(BaseModel):
+    model_type = 'lstm'
+    sequence_length = 20
+    default_params = MLP_PARAMS
+
+    def build_estimator(self):
+        return _mlp(self.params)
+
+
+class XGBoostModel(BaseModel):
+    model_type = 'xgboost'
+    default_params = BOOSTING_PARAMS
+
+    def build_estimator(self):
+        return _gradient_boosting(self.params)
+
+
+class HybridModel(BaseModel):
+    model_type = 'hybrid'
+    sequence_length = 20
+    default_params = {**MLP_PARAMS, **BOOSTING_PARAMS, 'weights': (0.4, 0.6)}
+
+    def build_estimator(self):
+        return VotingRegressor(
+            [('lstm', _mlp(self.params)), ('xgboost', _gradient_boosting(self.params))],
+            weights=list(self.params['weights']),
+        )
+
+
+MODEL_TYPES = {
+    'lstm': LSTMModel,
+    'xgboost': XGBoostModel,
+    'hybrid': HybridModel,
+}
+
+
+def create_model(model_type, model_name=None, time_horizon=12, params=None):
+    """Model tipine göre (lstm, xgboost, hybrid) yeni bir model nesnesi oluşturur."""
+    if model_type not in MODEL_TYPES:
+        raise ValueError(f"Geçersiz model tipi: {model_type}")
+    return MODEL_TYPES[model_type](model_name=model_name, time_horizon=time_horizon, params=params)
@@ -0,0 +1,59 @@
+"""
+Model açıklaması: permütasyon önem derecesiyle hangi özelliklerin tahmini etkilediğini ölçer.
+"""
+import json
+import os
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+from sklearn.inspection import permutation_importance
+
+from .optimizer import rmse
+
+
+class ModelExplainer:
+    """Eğitilmiş bir model için özellik önemlerini hesaplar ve dosyalara yazar."""
+
+    def __init__(self, output_dir='explanations', n_repeats=5, random_state=42):
+        self.output_dir = output_dir
+        self.n_repeats = n_repeats
+        self.random_state = random_state
+
+    def explain(self, model, X, y, feature_names=None, n_samples=100):
+        """Son n_samples satır üzerinde önemleri hesaplar; sonuç ve rapor dosyalarını döndürür."""
+        X, y = X[-n_samples:], y[-n_samples:]
+        feature_names = feature_names or model.feature_names or [f'f{i}' for i in range(X.shape[1])]
+
+        result = permutation_importance(
+            model.estimator, X, y,
+            scoring=lambda estimator, data, target: -rmse(target, estimator.predict(data)),
+            n_repeats=self.n_repeats,
+            random_state=self.random_state,
+        )
+        importances = sorted(
+            zip(feature_names, result.importances_mean.tolist(), result.importances_std.tolist()),
+            key=lambda item: item[1],
+            reverse=True,
+        )
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        json_path = os.path.join(self.output_dir, f"{model.model_name}_importance.json")
+        with open(json_path, 'w', encoding='utf-8') as file:
+            json.dump([{'feature': name, 'importance': mean, 'std': std} for name, mean, std in importances],
+                      file, ensure_ascii=False, indent=2)
+
+        chart_path = os.path.join(self.output_dir, f"{model.model_name}_importance.png")
+        top = importances[:15][::-1]
+        fig, ax = plt.subplots(figsize=(8, 6))
+        ax.barh([name for name, _, _ in top], [mean for _, mean, _ in top], xerr=[std for _, _, std in top])
+        ax.set_title(f"{model.model_name} - Özellik Önemleri")
+        ax.set_xlabel("RMSE artışı")
+        fig.tight_layout()
+        fig.savefig(chart_path)
+        plt.close(fig)
+
+        return {
+            'importances': {name: mean for name, mean, _ in importances},
+            'report_files': [json_path, chart_path],
+        }
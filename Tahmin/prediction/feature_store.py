@@ -0,0 +1,244 @@
+"""
+Tahmin modelleri için hisse/gün bazında hazır özellik deposu.
+
+Her hisse için tek bir dosya (<FEATURE_DIR>/<stock_id>.npz) tutulur. Fiyat geçmişinin her günü
+için şu sütunlar tek bir float64 matriste saklanır:
+
+- fiyattan türetilen özellikler (gecikmeli getiriler, oynaklık, ortalamalardan uzaklık vb.;
+  bkz. features.feature_columns),
+- StockAnalysis gösterge sütunları (ta_ önekiyle),
+- o gün itibarıyla açıklanmış son makro ve döviz değerleri (macro_ önekiyle; yayım gecikmeleri
+  için bkz. asof).
+
+Eğitim ve tahmin, özellikleri ham fiyatlardan yeniden hesaplamak yerine bu matristen okur
+(bkz. feature_frame).
+
+Depo, kaynakların parmak izleriyle güncel tutulur. Fiyatlara yalnızca yeni günler eklendiyse
+fiyat özellikleri, son WARMUP_ROWS günlük pencere üzerinden yalnızca yeni günler için hesaplanıp
+eklenir. Geçmiş fiyatlar ya da özellik tanımı değiştiyse dosya baştan oluşturulur. Analiz ve
+makro sütunları kaynakları değiştiğinde yeniden birleştirilir.
+"""
+import json
+import logging
+import os
+
+import numpy as np
+import pandas as pd
+from django.conf import settings
+from django.utils import timezone
+
+from ..asof import MACRO_SERIES, asof_join, load_macro_series, macro_version
+from ..columnar import (
+    analysis_columns, analysis_columns_list, analysis_version, fingerprint, price_columns, price_version,
+)
+from ..models import Stock, StockPrice
+from .features import feature_columns, feature_spec
+
+logger = logging.getLogger(__name__)
+
+FEATURE_DIR = os.path.join(settings.BASE_DIR, 'uploads', 'features')
+STORE_FORMAT = 1
+
+# Artımlı güncellemede yeni günlerin özellikleri için geriye dönük okunan gün sayısı. En uzun
+# pencere 200 gündür; üstel ortalamaların (RSI, MACD) başlangıç etkisi bu uzunlukta sönümlenir.
+WARMUP_ROWS = 400
+
+ANALYSIS_PREFIX = 'ta_'
+MACRO_PREFIX = 'macro_'
+
+
+def store_path(stock_id):
+    return os.path.join(FEATURE_DIR, f"{int(stock_id)}.npz")
+
+
+def price_feature_names():
+    """Fiyattan türetilen (dizi gecikmeleri hariç) özellik sütunları, hesaplanma sırasıyla."""
+    sample = pd.Series([1.0])
+    return [name for name, _ in feature_columns(sample, sample, sample, sample)]
+
+
+def store_columns():
+    return [
+        *price_feature_names(),
+        *(ANALYSIS_PREFIX + field for field in analysis_columns_list()),
+        *(MACRO_PREFIX + name for name in MACRO_SERIES),
+    ]
+
+
+def store_spec():
+    """Depo içeriğini tanımlayan ayarlar; değişirse dosyalar baştan oluşturulur."""
+    return {
+        'format': STORE_FORMAT,
+        'features': feature_spec(),
+        'columns': store_columns(),
+        'macro_lags': {name: spec[-1] for name, spec in MACRO_SERIES.items()},
+    }
+
+
+def load_macro():
+    """Tüm makro seriler ve sürümleri: {'version': str, 'series': {ad: (bilinme tarihleri, değerler)}}."""
+    return {'version': macro_version(), 'series': load_macro_series()}
+
+
+def compute_price_features(prices):
+    """Fiyat sütunlarından (bkz. columnar.price_columns) fiyat özellikleri matrisi (gün, özellik)."""
+    frame = {column: pd.Series(prices[column]) for column in ('close', 'high', 'low', 'volume')}
+    columns = feature_columns(frame['close'], frame['high'], frame['low'], frame['volume'])
+    values = np.column_stack([np.asarray(series, dtype=float) for _, series in columns])
+    values[~np.isfinite(values)] = np.nan
+    return values
+
+
+def _join_analysis(dates, analysis):
+    fields = analysis_columns_list()
+    block = np.full((len(dates), len(fields)), np.nan)
+    analysis_dates = analysis['date']
+    if not len(analysis_dates) or not len(dates):
+        return block
+    positions = np.minimum(np.searchsorted(analysis_dates, dates), len(analysis_dates) - 1)
+    found = analysis_dates[positions] == dates
+    for index, field in enumerate(fields):
+        block[found, index] = analysis[field][positions[found]]
+    return block
+
+
+def _join_macro(dates, macro):
+    return np.column_stack([
+        asof_join(dates, *macro['series'][name]) for name in MACRO_SERIES
+    ]) if MACRO_SERIES else np.empty((len(dates), 0))
+
+
+def read_store(stock_id):
+    """Hissenin kayıtlı özellik dosyası: {'dates', 'values', 'columns', 'meta'} (yoksa None)."""
+    path = store_path(stock_id)
+    if not os.path.exists(path):
+        return None
+    with np.load(path, allow_pickle=False) as data:
+        store = {
+            'dates': data['dates'],
+            'values': data['values'],
+            'columns': data['columns'].tolist(),
+            'meta': json.loads(str(data['meta'])),
+        }
+    return store if store['meta'].get('format') == STORE_FORMAT else None
+
+
+def _write_store(stock_id, store):
+    os.makedirs(FEATURE_DIR, exist_ok=True)
+    path = store_path(stock_id)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, 'wb') as f:
+        np.savez(
+            f, dates=store['dates'], values=store['values'], columns=np.array(store['columns']),
+            meta=np.array(json.dumps(store['meta'])),
+        )
+    os.replace(temp_path, path)
+
+
+def _appended_only(stock_id, stored):
+    # Kayıtlı son güne kadarki fiyatlar değişmediyse (sayı ve son güncelleme aynıysa) yalnızca yeni gün eklenmiştir
+    if not len(stored['dates']):
+        return False
+    last_date = stored['dates'][-1].item()
+    prefix = fingerprint(StockPrice.objects.filter(stock_id=stock_id, date__lte=last_date))
+    return prefix == stored['meta']['versions']['prices']
+
+
+def refresh_features(stock_id, full=False, macro=None):
+    """
+    Hissenin özellik dosyasını kaynaklarla eşitler. macro, birden fazla hisse güncellenirken bir
+    kez okunan load_macro() çıktısıdır. (depo, mod) döndürür; mod 'unchanged', 'joined' (yalnızca
+    analiz/makro sütunları yenilendi), 'incremental' ya da 'full' olur.
+    """
+    spec = store_spec()
+    stored = None if full else read_store(stock_id)
+    if stored is not None and stored['meta']['spec'] != spec:
+        stored = None
+
+    versions = {
+        'prices': price_version(stock_id),
+        'analysis': analysis_version(stock_id),
+        'macro': macro['version'] if macro is not None else macro_version(),
+    }
+    if stored is not None and stored['meta']['versions'] == versions:
+        return stored, 'unchanged'
+
+    prices = price_columns(stock_id, versions['prices'])
+    # Önbellekten açılan datetime64 dizilerinin dtype'ı npz'ye yazılamayan boş metadata taşır
+    dates = prices['date'].view('datetime64[D]')
+    price_count = len(price_feature_names())
+
+    if stored is not None and stored['meta']['versions']['prices'] == versions['prices']:
+        price_block, mode = stored['values'][:, :price_count], 'joined'
+    elif stored is not None and _appended_only(stock_id, stored):
+        known = len(stored['dates'])
+        start = max(0, known - WARMUP_ROWS)
+        tail = compute_price_features({column: values[start:] for column, values in prices.items()})
+        price_block, mode = np.vstack([stored['values'][:, :price_count], tail[known - start:]]), 'incremental'
+    else:
+        price_block, mode = compute_price_features(prices) if len(dates) else np.empty((0, price_count)), 'full'
+
+    macro = macro if macro is not None else load_macro()
+    values = np.hstack([
+        price_block,
+        _join_analysis(dates, analysis_columns(stock_id, versions['analysis'])),
+        _join_macro(dates, macro),
+    ])
+    store = {
+        'dates': dates,
+        'values': values,
+        'columns': spec['columns'],
+        'meta': {
+            'format': STORE_FORMAT,
+            'spec': spec,
+            'versions': versions,
+            'rows': len(dates),
+            'built_at': timezone.now().isoformat(),
+        },
+    }
+    _write_store(stock_id, store)
+    logger.debug("Özellik deposu güncellendi (%s): hisse %s, %s gün", mode, stock_id, len(dates))
+    return store, mode
+
+
+def refresh_feature_store(stock_ids=None, full=False, progress=None):
+    """
+    Fiyatı olan hisselerin (ya da verilenlerin) özellik dosyalarını günceller; makro seriler bir
+    kez okunur. Mod başına hisse sayısını döndürür.
+    """
+    report = progress or (lambda percent, message: None)
+    if stock_ids is None:
+        stock_ids = list(Stock.objects.filter(prices__isnull=False).distinct().values_list('id', flat=True))
+
+    macro = load_macro()
+    counts = {'unchanged': 0, 'joined': 0, 'incremental': 0, 'full': 0}
+    for index, stock_id in enumerate(stock_ids):
+        _, mode = refresh_features(stock_id, full=full, macro=macro)
+        counts[mode] += 1
+        report(100 * (index + 1) // max(len(stock_ids), 1), f"{index + 1}/{len(stock_ids)} hisse")
+
+    logger.info("Özellik deposu: %s", counts)
+    return {'stocks': len(stock_ids), **counts}
+
+
+def load_features(stock_id, columns=None, refresh=True):
+    """
+    Hissenin depodaki özellikleri, tarih indeksli DataFrame olarak. refresh=True ise depo önce
+    kaynaklarla eşitlenir. columns verilirse yalnızca o sütunlar döndürülür.
+    """
+    store = refresh_features(stock_id)[0] if refresh else read_store(stock_id)
+    if store is None:
+        return pd.DataFrame(columns=columns or store_columns(), dtype=float)
+    frame = pd.DataFrame(store['values'], index=pd.DatetimeIndex(store['dates'], name='date'), columns=store['columns'])
+    return frame[columns] if columns is not None else frame
+
+
+def feature_frame(stock_id, sequence_length=0):
+    """
+    Modellerin beklediği özellik tablosu: features.build_feature_frame ile aynı sütunlar, fiyat
+    geçmişinin sırasıyla satırlar (indeks 0..n-1). Dizi gecikmeleri günlük getiriden (ret_1) türetilir.
+    """
+    frame = load_features(stock_id, price_feature_names()).reset_index(drop=True)
+    for lag in range(sequence_length):
+        frame[f'ret_lag_{lag}'] = frame['ret_1'].shift(lag)
+    return frame
@@ -0,0 +1,151 @@
+"""
+Tahmin modelleri için fiyat geçmişinden özellik (feature) ve hedef üretimi.
+
+Hedef, tahmin ufku kadar işlem günü sonraki kapanışın bugünkü kapanışa oranının
+logaritmasıdır (log getiri). Özellikler yalnızca o güne kadarki veriyi kullanır.
+"""
+import numpy as np
+import pandas as pd
+
+TRADING_DAYS_PER_MONTH = 21
+
+# Farklı kaynaklardaki fiyat sütunları -> standart isimler
+PRICE_ALIASES = {
+    'date': 'date',
+    'opening_price': 'open',
+    'open': 'open',
+    'highest_price': 'high',
+    'high': 'high',
+    'lowest_price': 'low',
+    'low': 'low',
+    'closing_price': 'close',
+    'close': 'close',
+    'volume': 'volume',
+}
+
+RETURN_WINDOWS = (1, 5, 21, 63)
+VOLATILITY_WINDOWS = (21, 63)
+MA_WINDOWS = (20, 50, 200)
+RSI_WINDOW = 14
+VOLUME_WINDOW = 21
+
+# Özellik hesaplaması değiştiğinde artırılır; kayıtlı modeller bu sürümle eşleşmezse yeniden eğitilir
+FEATURE_VERSION = 1
+
+
+def horizon_days(time_horizon):
+    """Ay cinsinden tahmin ufkunu işlem günü sayısına çevirir."""
+    return int(time_horizon) * TRADING_DAYS_PER_MONTH
+
+
+def normalize_prices(data, target_column='closing_price'):
+    """
+    Fiyat DataFrame'ini tarih sıralı date/open/high/low/close/volume sütunlarına indirger.
+    Kapanış dışındaki eksik sütunlar kapanıştan (hacim için 0) türetilir.
+    """
+    frame = data.rename(columns={target_column: 'close'}) if target_column in data.columns else data
+    frame = frame.rename(columns={col: PRICE_ALIASES[col] for col in frame.columns if col in PRICE_ALIASES})
+    if 'close' not in frame.columns:
+        raise ValueError(f"Fiyat verisinde hedef sütun bulunamadı: {target_column}")
+
+    prices = pd.DataFrame({'close': frame['close'].astype(float)})
+    for column in ('open', 'high', 'low'):
+        prices[column] = frame[column].astype(float) if column in frame.columns else prices['close']
+    prices['volume'] = frame['volume'].astype(float) if 'volume' in frame.columns else 0.0
+
+    if 'date' in frame.columns:
+        prices.insert(0, 'date', pd.to_datetime(frame['date']))
+        prices = prices.sort_values('date')
+
+    return prices.reset_index(drop=True)
+
+
+def feature_spec(sequence_length=0):
+    """Özellik kümesini tanımlayan (model kayıt defteri özetine giren) ayarlar."""
+    return {
+        'version': FEATURE_VERSION,
+        'return_windows': list(RETURN_WINDOWS),
+        'volatility_windows': list(VOLATILITY_WINDOWS),
+        'ma_windows': list(MA_WINDOWS),
+        'rsi_window': RSI_WINDOW,
+        'volume_window': VOLUME_WINDOW,
+        'sequence_length': sequence_length,
+    }
+
+
+def feature_columns(close, high, low, volume, sequence_length=0):
+    """
+    Özellikleri (ad, değerler) çiftleri olarak üretir. Girdiler tek bir hissenin Series'leri ya
+    da her sütunu bir hisse olan geniş DataFrame'ler olabilir; tüm işlemler sütun bazında
+    (her hisse kendi geçmişiyle) hesaplanır.
+    """
+    log_close = np.log(close.where(close > 0))
+    daily = log_close.diff()
+
+    for window in RETURN_WINDOWS:
+        yield f'ret_{window}', log_close.diff(window)
+    for window in VOLATILITY_WINDOWS:
+        yield f'vol_{window}', daily.rolling(window).std()
+    for window in MA_WINDOWS:
+        yield f'ma_gap_{window}', close / close.rolling(window).mean() - 1
+
+    delta = close.diff()
+    gain = delta.clip(lower=0).ewm(alpha=1 / RSI_WINDOW, adjust=False).mean()
+    loss = (-delta.clip(upper=0)).ewm(alpha=1 / RSI_WINDOW, adjust=False).mean()
+    yield 'rsi', 1 - 1 / (1 + gain / loss.replace(0, np.nan))
+
+    macd = close.ewm(span=12, adjust=False).mean() - close.ewm(span=26, adjust=False).mean()
+    yield 'macd_hist', (macd - macd.ewm(span=9, adjust=False).mean()) / close
+
+    yield 'range', (high - low) / close
+    log_volume = np.log1p(volume.clip(lower=0))
+    volume_std = log_volume.rolling(VOLUME_WINDOW).std().replace(0, np.nan)
+    yield 'volume_z', ((log_volume - log_volume.rolling(VOLUME_WINDOW).mean()) / volume_std).fillna(0)
+
+    for lag in range(sequence_length):
+        yield f'ret_lag_{lag}', daily.shift(lag)
+
+
+def build_feature_frame(prices, sequence_length=0):
+    """
+    Her gün için özellik satırı üretir. sequence_length > 0 ise son günlerin günlük log
+    getirileri de (dizi modeli girdisi olarak) ret_lag_0..n sütunlarıyla eklenir.
+    """
+    features = pd.DataFrame(dict(feature_columns(
+        prices['close'], prices['high'], prices['low'], prices['volume'], sequence_length,
+    )), index=prices.index)
+    return features.replace([np.inf, -np.inf], np.nan)
+
+
+def build_target(prices, horizon):
+    """horizon işlem günü sonrası için log getiri hedefi (son horizon gün NaN)."""
+    log_close = np.log(prices['close'].where(prices['close'] > 0))
+    return log_close.shift(-horizon) - log_close
+
+
+def _feature_frame(prices, sequence_length, features):
+    # Hazır özellikler (bkz. feature_store.feature_frame) fiyatlarla aynı satırlara sahipse kullanılır
+    if features is not None and len(features) == len(prices):
+        return features.set_axis(prices.index)
+    return build_feature_frame(prices, sequence_length)
+
+
+def training_matrix(prices, horizon, sequence_length=0, features=None):
+    """
+    Eğitim için (X, y, feature_names) döndürür; özellikleri ya da hedefi eksik günler atılır.
+    Satırlar tarih sırasındadır. features, özellik deposundan okunmuş hazır tablodur; verilmezse
+    özellikler fiyatlardan hesaplanır.
+    """
+    features = _feature_frame(prices, sequence_length, features)
+    target = build_target(prices, horizon)
+    valid = features.notna().all(axis=1) & target.notna()
+    return features[valid].to_numpy(), target[valid].to_numpy(), list(features.columns)
+
+
+def latest_features(prices, sequence_length=0, features=None):
+    """Son günün özellik satırını (1, n) dizisi olarak döndürür."""
+    features = _feature_frame(prices, sequence_length, features)
+    last = features.iloc[[-1]]
+    if last.isna().any(axis=None):
+        raise ValueError("Son gün için özellikler hesaplanamadı (yetersiz fiyat geçmişi)")
+    return last.to_numpy()
@@ -0,0 +1,310 @@
+"""
+Zaman serisi çapraz doğrulamasıyla rastgele arama yapan hiperparametre optimizasyonu.
+
+Denemeler süreç havuzunda paralel çalışır: özellik matrisi (X, y) ve katlar her sürece bir kez
+aktarılır (fork ile başlayanlar kopyalamadan devralır), denemeler yalnızca parametreleri taşır.
+Her deneme katları sırayla değerlendirir; ilk katlardaki ortalama RMSE, tamamlanmış denemelerin
+aynı katlardaki ortalamalarının medyanından kötüyse kalan katlar çalıştırılmaz (erken durdurma).
+persist=True ile denemeler TuningTrial tablosuna yazılır; aynı çalışmaya (bkz. study_key)
+yeniden başlatılan arama tamamlanmış denemeleri tekrar çalıştırmaz.
+"""
+import hashlib
+import json
+import logging
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, wait
+
+import numpy as np
+from sklearn.model_selection import TimeSeriesSplit
+
+from ..models import TuningTrial
+from ..pools import process_pool
+
+logger = logging.getLogger(__name__)
+
+# Model tipine göre denenecek değerler
+SEARCH_SPACES = {
+    'lstm': {
+        'hidden_layer_sizes': [(32,), (64,), (64, 32), (128, 64)],
+        'alpha': [1e-4, 1e-3, 1e-2],
+        'learning_rate_init': [5e-4, 1e-3, 3e-3],
+    },
+    'xgboost': {
+        'n_estimators': [100, 200, 300, 500],
+        'max_depth': [2, 3, 4, 6],
+        'learning_rate': [0.02, 0.05, 0.1],
+    },
+    'hybrid': {
+        'hidden_layer_sizes': [(32,), (64, 32)],
+        'n_estimators': [200, 300],
+        'max_depth': [3, 4],
+        'weights': [(0.3, 0.7), (0.4, 0.6), (0.5, 0.5)],
+    },
+}
+
+# Erken durdurma, en az bu kadar deneme tamamlandıktan sonra devreye girer
+PRUNING_STARTUP_TRIALS = 5
+
+# Süreç başına aktarılan (X, y, katlar) (bkz. _init_worker)
+_worker_data = None
+
+
+def rmse(y_true, y_pred):
+    return float(np.sqrt(np.mean((np.asarray(y_true) - np.asarray(y_pred)) ** 2)))
+
+
+def params_key(params):
+    """Parametre kombinasyonunun özeti; aynı çalışmadaki denemeleri ayırt eder."""
+    return hashlib.sha256(json.dumps(params, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def study_key(model, X, y, cv_splits, data_range=None):
+    """
+    Aramanın özeti: model tipi/ufku, temel parametreler, kat sayısı ve veri. data_range verilirse
+    (ör. hisse ve tarih aralığı, bkz. tuning.study_range) veri onunla temsil edilir; aralık aynı
+    kaldıkça eklenen yeni günler aramayı yeniden başlatmaz. Verilmezse özellik matrisinin kendisi
+    özete girer ve arama yalnızca birebir aynı veriyle devam eder.
+    """
+    digest = hashlib.sha256()
+    config = {
+        'model_type': model.model_type,
+        'time_horizon': model.time_horizon,
+        'params': model.params,
+        'cv_splits': cv_splits,
+        'features': np.shape(X)[1:],
+        'data_range': data_range,
+    }
+    digest.update(json.dumps(config, sort_keys=True, default=str).encode())
+    if data_range is None:
+        digest.update(np.ascontiguousarray(X, dtype=float).tobytes())
+        digest.update(np.ascontiguousarray(y, dtype=float).tobytes())
+    return digest.hexdigest()
+
+
+def run_trial(model_class, model_name, time_horizon, params, X, y, folds, thresholds=None):
+    """
+    Parametreleri katlarda sırayla değerlendirir. thresholds[k], ilk k+1 katın ortalama RMSE'si
+    için üst sınırdır; aşılırsa kalan katlar çalıştırılmaz. (kat RMSE'leri, durduruldu_mu) döndürür.
+    """
+    scores = []
+    for index, (train_index, test_index) in enumerate(folds):
+        candidate = model_class(model_name, time_horizon, params)
+        candidate.fit(X[train_index], y[train_index])
+        scores.append(rmse(y[test_index], candidate.predict(X[test_index])))
+        if thresholds and index < len(thresholds) and np.mean(scores) > thresholds[index]:
+            return scores, True
+    return scores, False
+
+
+def _execute_trial(model_class, model_name, time_horizon, params, X, y, folds, thresholds):
+    # Hatalı deneme aramayı durdurmaz, 'failed' olarak kaydedilir
+    started = time.monotonic()
+    try:
+        scores, pruned = run_trial(model_class, model_name, time_horizon, params, X, y, folds, thresholds)
+        error = None
+    except Exception as e:
+        scores, pruned, error = [], False, str(e)
+    return scores, pruned, error, time.monotonic() - started
+
+
+def _init_worker(X, y, folds):
+    # Denemeler süreçler arasında paylaştırıldığından tahmincilerin kendi iş parçacığı havuzları
+    # (OpenMP/BLAS) tek iş parçacığıyla sınırlanır; aksi halde çekirdekler aşırı yüklenir
+    global _worker_data
+    from threadpoolctl import threadpool_limits
+    threadpool_limits(1)
+    _worker_data = (X, y, folds)
+
+
+def _trial_in_worker(model_class, model_name, time_horizon, params, thresholds):
+    X, y, folds = _worker_data
+    return _execute_trial(model_class, model_name, time_horizon, params, X, y, folds, thresholds)
+
+
+def tuned_params(stock, model_type, time_horizon):
+    """Hisse/model tipi/ufuk için son aramada bulunan en iyi parametreler (arama yoksa boş)."""
+    trials = TuningTrial.objects.filter(stock=stock, model_type=model_type, time_horizon=time_horizon, state='complete')
+    study = trials.order_by('-created_at').values_list('study', flat=True).first()
+    if study is None:
+        return {}
+    return trials.filter(study=study).order_by('score').values_list('params', flat=True).first() or {}
+
+
+class ModelOptimizer:
+    """
+    Modelin arama uzayından n_trials parametre kombinasyonu seçer ve her birini zaman sıralı
+    katlarla (eğitim ve doğrulama arasında tahmin ufku kadar boşluk bırakarak) değerlendirir.
+    max_workers > 1 ise denemeler süreç havuzunda paralel çalışır; timeout (saniye) dolduğunda
+    yeni deneme başlatılmaz.
+    """
+
+    def __init__(self, n_trials=20, cv_splits=3, random_state=42, max_workers=1, pruning=True,
+                 timeout=None, persist=False, stock=None):
+        self.n_trials = n_trials
+        self.cv_splits = cv_splits
+        self.random_state = random_state
+        self.max_workers = max_workers
+        self.pruning = pruning
+        self.timeout = timeout
+        self.persist = persist
+        self.stock = stock
+        self.study = None
+        self.trials = []
+
+    def sample_params(self, model_type, rng):
+        space = SEARCH_SPACES.get(model_type, {})
+        return {name: values[rng.integers(len(values))] for name, values in space.items()}
+
+    def candidates(self, model_type):
+        """n_trials rastgele seçimden tekrar etmeyen parametre kombinasyonları (random_state'e göre sabit)."""
+        rng = np.random.default_rng(self.random_state)
+        unique = {}
+        for _ in range(self.n_trials):
+            params = self.sample_params(model_type, rng)
+            unique.setdefault(params_key(params), params)
+        return unique
+
+    def folds(self, model, n_samples):
+        gap = min(model.horizon, max(0, n_samples // (self.cv_splits + 1) - 1))
+        splitter = TimeSeriesSplit(n_splits=self.cv_splits, gap=gap)
+        return list(splitter.split(np.empty((n_samples, 1))))
+
+    def evaluate(self, model, params, X, y):
+        """Parametreleri zaman sıralı çapraz doğrulamayla değerlendirir; ortalama RMSE döndürür."""
+        scores, _ = run_trial(model.__class__, model.model_name, model.time_horizon,
+                              {**model.params, **params}, X, y, self.folds(model, len(y)))
+        return float(np.mean(scores))
+
+    def thresholds(self, n_folds):
+        """Her kat için tamamlanmış denemelerin o kata kadarki ortalama RMSE'lerinin medyanı."""
+        completed = [trial['fold_scores'] for trial in self.trials if trial['state'] == 'complete']
+        if not self.pruning or len(completed) < PRUNING_STARTUP_TRIALS:
+            return None
+        # Son kat için sınır yoktur: tüm katları biten deneme zaten tamamlanmıştır
+        return [float(np.median([np.mean(scores[:index + 1]) for scores in completed])) for index in range(n_folds - 1)]
+
+    def load_trials(self):
+        """Çalışmanın tamamlanmış ve erken durdurulmuş denemeleri; başarısız denemeler yeniden çalıştırılır."""
+        if not self.persist:
+            return []
+        rows = TuningTrial.objects.filter(study=self.study, state__in=['complete', 'pruned']).order_by('number')
+        return [
+            {'number': row.number, 'params': row.params, 'rmse': row.score, 'fold_scores': row.fold_scores,
+             'state': row.state, 'duration': row.duration, 'resumed': True}
+            for row in rows
+        ]
+
+    def record(self, model, number, params, scores, pruned, error, duration):
+        state = 'failed' if error else 'pruned' if pruned else 'complete'
+        score = float(np.mean(scores)) if scores else None
+        self.trials.append({
+            'number': number, 'params': params, 'rmse': score, 'fold_scores': scores,
+            'state': state, 'duration': round(duration, 3), 'resumed': False,
+        })
+
+        if self.persist:
+            TuningTrial.objects.update_or_create(
+                study=self.study, params_key=params_key(params),
+                defaults={
+                    'stock': self.stock,
+                    'model_type': model.model_type,
+                    'time_horizon': model.time_horizon,
+                    'number': number,
+                    'params': params,
+                    'fold_scores': scores,
+                    'score': score,
+                    'state': state,
+                    'error': error or '',
+                    'duration': duration,
+                },
+            )
+
+        if error:
+            logger.warning("%s deneme %s başarısız: %s %s", model.model_name, number, error, params)
+        else:
+            logger.info("%s deneme %s (%s, %s kat): rmse=%.5f %s", model.model_name, number, state,
+                        len(scores), score, params)
+
+    def optimize(self, model, X, y, progress=None, data_range=None):
+        """
+        En iyi parametreleri ve tüm denemeleri döndürür; modelin kendisini değiştirmez.
+        data_range, kalıcı aramanın hangi çalışmaya ait olduğunu belirler (bkz. study_key).
+        """
+        report = progress or (lambda percent, message: None)
+        started = time.monotonic()
+        deadline = started + self.timeout if self.timeout else None
+        folds = self.folds(model, len(y))
+
+        self.study = study_key(model, X, y, self.cv_splits, data_range) if self.persist else None
+        self.trials = self.load_trials()
+        done = {params_key(trial['params']) for trial in self.trials}
+        next_number = max((trial['number'] for trial in self.trials), default=0) + 1
+        pending = [
+            (next_number + index, params)
+            for index, params in enumerate(
+                params for key, params in self.candidates(model.model_type).items() if key not in done
+            )
+        ]
+        if self.trials:
+            logger.info("%s: %s deneme önceki aramadan devralındı, %s deneme kaldı",
+                        model.model_name, len(self.trials), len(pending))
+
+        total = len(self.trials) + len(pending)
+        max_workers = min(self.max_workers or os.cpu_count() or 1, max(len(pending), 1))
+
+        def expired():
+            return deadline is not None and time.monotonic() >= deadline
+
+        def finish(number, params, outcome):
+            self.record(model, number, params, *outcome)
+            report(100 * len(self.trials) // max(total, 1), f"{model.model_name}: {len(self.trials)}/{total} deneme")
+
+        if max_workers == 1:
+            for number, params in pending:
+                if expired():
+                    break
+                outcome = _execute_trial(model.__class__, model.model_name, model.time_horizon,
+                                         {**model.params, **params}, X, y, folds, self.thresholds(len(folds)))
+                finish(number, params, outcome)
+        else:
+            queue = iter(pending)
+            running = {}
+            with process_pool(max_workers, _init_worker, (X, y, folds)) as executor:
+                # Her yeni deneme, o ana kadar tamamlananlara göre hesaplanan sınırlarla başlatılır
+                def submit():
+                    while len(running) < max_workers and not expired():
+                        item = next(queue, None)
+                        if item is None:
+                            return
+                        number, params = item
+                        future = executor.submit(_trial_in_worker, model.__class__, model.model_name, model.time_horizon,
+                                                 {**model.params, **params}, self.thresholds(len(folds)))
+                        running[future] = item
+
+                submit()
+                while running:
+                    finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        number, params = running.pop(future)
+                        finish(number, params, future.result())
+                    submit()
+
+        self.trials.sort(key=lambda trial: trial['number'])
+        states = [trial['state'] for trial in self.trials]
+        summary = {
+            'study': self.study,
+            'completed': states.count('complete'),
+            'pruned': states.count('pruned'),
+            'failed': states.count('failed'),
+            'resumed': sum(trial['resumed'] for trial in self.trials),
+            'remaining': total - len(self.trials),
+            'duration': round(time.monotonic() - started, 2),
+        }
+
+        completed = [trial for trial in self.trials if trial['state'] == 'complete']
+        if not completed:
+            return {'best_params': {}, 'best_rmse': None, 'trials': self.trials, **summary}
+
+        best = min(completed, key=lambda trial: trial['rmse'])
+        return {'best_params': best['params'], 'best_rmse': best['rmse'], 'trials': self.trials, **summary}
@@ -0,0 +1,205 @@
+"""
+Model yaşam döngüsünü (oluşturma, eğitim, kaydetme/yükleme, tahmin, açıklama, raporlama)
+tek noktadan yöneten sınıf.
+"""
+import logging
+import os
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from .estimators import BaseModel, create_model
+from .explainer import ModelExplainer
+from .features import normalize_prices, training_matrix, latest_features
+from .optimizer import ModelOptimizer, rmse
+from .reporting import ReportExporter
+from .tracker import ModelTracker
+
+logger = logging.getLogger(__name__)
+
+MIN_TRAINING_SAMPLES = 100
+VALIDATION_SIZE = 0.2
+CONFIDENCE_Z = 1.96
+
+REPORT_TYPES = ('basic', 'detailed', 'technical', 'fundamental', 'complete')
+
+
+class ModelOrchestrator:
+    """Modelleri base_dir altında (models, reports, explanations, tracking) yönetir."""
+
+    def __init__(self, base_dir='prediction_output'):
+        self.base_dir = base_dir
+        self.models_dir = os.path.join(base_dir, 'models')
+        self.reports_dir = os.path.join(base_dir, 'reports')
+        self.explanations_dir = os.path.join(base_dir, 'explanations')
+        self.tracker = ModelTracker(os.path.join(base_dir, 'tracking'))
+
+    def train_test_split(self, data, test_size=0.2, time_based=True):
+        """Veriyi eğitim ve test kümelerine ayırır; time_based ise son kısım test olur."""
+        if time_based:
+            ordered = data.sort_values('date') if 'date' in data.columns else data
+            split = int(len(ordered) * (1 - test_size))
+            return ordered.iloc[:split].copy(), ordered.iloc[split:].copy()
+
+        test = data.sample(frac=test_size, random_state=42)
+        return data.drop(test.index).copy(), test.copy()
+
+    def create_model(self, model_type, model_name=None, time_horizon=12, params=None):
+        return create_model(model_type, model_name=model_name, time_horizon=time_horizon, params=params)
+
+    def model_path(self, model_name):
+        return os.path.join(self.models_dir, f"{model_name}.joblib")
+
+    def save_model(self, model):
+        os.makedirs(self.models_dir, exist_ok=True)
+        return model.save(self.model_path(model.model_name))
+
+    def load_model(self, model_name, model_type=None):
+        path = self.model_path(model_name)
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Model bulunamadı: {path}")
+
+        model = BaseModel.load(path)
+        if model_type is not None and model.model_type != model_type:
+            raise ValueError(f"{model_name} bir {model.model_type} modeli, {model_type} beklendi")
+        return model
+
+    def train_model(self, model, data, target_column='closing_price', optimize=False,
+                    stock_symbol=None, n_trials=20, save=True, max_workers=1, features=None):
+        """
+        Modeli fiyat geçmişinden eğitir (doğrulama için bkz. fit_and_evaluate). features, özellik
+        deposundan okunmuş hazır özellik tablosudur (bkz. feature_store.feature_frame).
+        (model, history, metrics) döndürür.
+        """
+        prices = normalize_prices(data, target_column)
+        X, y, feature_names = training_matrix(prices, model.horizon, model.sequence_length, features)
+        if len(y) < MIN_TRAINING_SAMPLES:
+            raise ValueError(
+                f"Eğitim için yeterli veri yok: {len(y)} örnek "
+                f"({model.time_horizon} aylık ufuk için daha uzun fiyat geçmişi gerekli)"
+            )
+
+        history = {'samples': len(y), 'features': len(feature_names)}
+        if optimize and n_trials:
+            search = ModelOptimizer(n_trials=n_trials, max_workers=max_workers).optimize(model, X, y)
+            model.params.update(search['best_params'])
+            history['optimization'] = search
+
+        metrics = self.fit_and_evaluate(model, X, y, feature_names, history)
+
+        self.tracker.log_run(model.model_name, stock_symbol, metrics, model.params, model.data_version)
+        if save:
+            self.save_model(model)
+
+        logger.info("%s eğitildi (%s örnek): %s", model.model_name, len(y), metrics)
+        return model, history, metrics
+
+    def fit_and_evaluate(self, model, X, y, feature_names, history=None, gap=None):
+        """
+        Zaman sıralı (X, y) üzerinde doğrulama metriklerini hesaplar ve modeli tüm örneklerle
+        yeniden eğitir. Doğrulama için son VALIDATION_SIZE oranı ayrılır; eğitim hedefleri
+        doğrulama dönemine taşmayacak şekilde arada gap satır (varsayılan: ufuk) boşluk bırakılır.
+        """
+        history = history if history is not None else {}
+        gap = model.horizon if gap is None else gap
+        split = int(len(y) * (1 - VALIDATION_SIZE))
+        train_end = split - gap if split - gap >= MIN_TRAINING_SAMPLES else split
+        model.fit(X[:train_end], y[:train_end], feature_names)
+        predicted = model.predict(X[split:])
+        actual = y[split:]
+
+        metrics = {
+            'rmse': rmse(actual, predicted),
+            'mae': float(np.mean(np.abs(actual - predicted))),
+            'direction_accuracy': float(np.mean(np.sign(actual) == np.sign(predicted))),
+            'price_mape': float(np.mean(np.abs(np.exp(predicted - actual) - 1)) * 100),
+        }
+        history.update({'train_samples': int(train_end), 'validation_samples': int(len(actual))})
+
+        # Son model tüm örneklerle eğitilir
+        model.fit(X, y, feature_names)
+        model.metrics = metrics
+        estimator = getattr(model.estimator, 'steps', [[None, model.estimator]])[-1][1]
+        if hasattr(estimator, 'loss_curve_'):
+            history['loss_curve'] = [float(value) for value in estimator.loss_curve_]
+        return metrics
+
+    def predict_stock(self, model, stock_data, stock_info=None, target_column='closing_price', features=None):
+        """
+        Son günün özelliklerinden ufuk sonundaki fiyatı tahmin eder. Doğrulama RMSE'sinden
+        yaklaşık %95 güven aralığı ve aylık ara değerler de döndürülür.
+        """
+        prices = normalize_prices(stock_data, target_column)
+        predicted_return = float(model.predict(latest_features(prices, model.sequence_length, features))[0])
+        last_price = float(prices['close'].iloc[-1])
+        final_prediction = last_price * float(np.exp(predicted_return))
+
+        spread = CONFIDENCE_Z * model.metrics.get('rmse', 0.0)
+        result = {
+            'symbol': (stock_info or {}).get('symbol'),
+            'model_name': model.model_name,
+            'model_type': model.model_type,
+            'time_horizon': model.time_horizon,
+            'last_price': last_price,
+            'final_prediction': final_prediction,
+            'percent_change': (final_prediction / last_price - 1) * 100,
+            'lower_bound': last_price * float(np.exp(predicted_return - spread)),
+            'upper_bound': last_price * float(np.exp(predicted_return + spread)),
+            'confidence_interval': (float(np.exp(spread)) - 1) * 100,
+            'forecast': [
+                {'month': month, 'price': last_price * float(np.exp(predicted_return * month / model.time_horizon))}
+                for month in range(1, model.time_horizon + 1)
+            ],
+        }
+        if 'date' in prices.columns:
+            last_date = prices['date'].iloc[-1]
+            result['last_date'] = last_date.date().isoformat()
+            result['target_date'] = (last_date + pd.offsets.BDay(model.horizon)).date().isoformat()
+        return result
+
+    def generate_model_explanation(self, model, data, n_samples=100, target_column='closing_price'):
+        prices = normalize_prices(data, target_column)
+        X, y, feature_names = training_matrix(prices, model.horizon, model.sequence_length)
+        if not len(y):
+            raise ValueError("Açıklama için yeterli veri yok")
+        return ModelExplainer(self.explanations_dir).explain(model, X, y, feature_names, n_samples=n_samples)
+
+    def generate_report(self, model, stock_data, stock_info, prediction_result,
+                        report_type='detailed', export_formats=('json',)):
+        """Tahmin raporunu oluşturur; (report_result, export_paths) döndürür."""
+        if report_type not in REPORT_TYPES:
+            raise ValueError(f"Geçersiz rapor tipi: {report_type}")
+
+        summary = {
+            'Hisse': stock_info.get('symbol'),
+            'Model': model.model_name,
+            'Ufuk (ay)': model.time_horizon,
+            'Son Fiyat': round(prediction_result['last_price'], 2),
+            'Tahmin': round(prediction_result['final_prediction'], 2),
+            'Değişim (%)': round(prediction_result['percent_change'], 2),
+            'Alt Sınır': round(prediction_result['lower_bound'], 2),
+            'Üst Sınır': round(prediction_result['upper_bound'], 2),
+        }
+        if report_type in ('detailed', 'technical', 'complete'):
+            summary.update({f"Metrik: {name}": round(value, 4) for name, value in model.metrics.items()})
+        if report_type in ('technical', 'complete'):
+            summary.update({f"Parametre: {name}": str(value) for name, value in model.params.items()})
+
+        report = {
+            'title': f"{stock_info.get('name', stock_info.get('symbol'))} - {model.time_horizon} Aylık Tahmin",
+            'report_type': report_type,
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'summary': summary,
+            'forecast': prediction_result.get('forecast', []),
+        }
+
+        basename = f"{stock_info.get('symbol')}_{model.model_name}_{datetime.now():%Y%m%d%H%M%S}"
+        exporter = ReportExporter(self.reports_dir)
+        report_path = exporter.export(report, ['json'], basename)['json']
+        export_paths = exporter.export(report, [fmt for fmt in export_formats if fmt != 'json'], basename)
+
+        return {'report_path': report_path, 'report': report}, export_paths
+
+    def analyze_model_performance(self, model_name, stock_symbol=None):
+        return self.tracker.performance_report(model_name, stock_symbol)
@@ -0,0 +1,145 @@
+"""
+Eğitilmiş modeller için içerik adresli kayıt defteri.
+
+Her model, eğitildiği girdilerin özetiyle (fiyat verisinin kendisi ve tarih aralığı, özellik
+kümesi, model tipi/ufku ve hiperparametreler) adreslenir: dosya <özet>.joblib olarak saklanır,
+ayrıntıları ModelArtifact tablosuna yazılır. Girdiler değişmediyse (örneğin gece çalışan toplu
+tahminlerde fiyatı güncellenmeyen hisseler) model yeniden eğitilmek yerine dosyadan yüklenir.
+"""
+import hashlib
+import json
+import logging
+import os
+
+import numpy as np
+from django.conf import settings
+from django.db import IntegrityError
+from django.db.models import F
+from django.utils import timezone
+
+from ..models import ModelArtifact
+from .estimators import BaseModel
+from .features import feature_spec
+
+logger = logging.getLogger(__name__)
+
+ARTIFACT_DIR = os.path.join(settings.BASE_DIR, 'uploads', 'predictions', 'artifacts')
+
+# Her hisse/model tipi/ufuk için saklanan en fazla model dosyası
+ARTIFACTS_TO_KEEP = 3
+
+HASHED_COLUMNS = ('open', 'high', 'low', 'close', 'volume')
+
+
+def artifact_hash(model, prices, options=None):
+    """
+    Modelin eğitim girdilerinin SHA-256 özeti. prices, normalize_prices çıktısıdır (birden fazla
+    hisse içeriyorsa stock_id sütunu da özete girer); değerlerden biri bile değişirse özet de
+    değişir. options, eğitimi etkileyen diğer ayarlardır.
+    """
+    digest = hashlib.sha256()
+    config = {
+        'model_type': model.model_type,
+        'time_horizon': model.time_horizon,
+        'params': model.params,
+        'features': feature_spec(model.sequence_length),
+        'options': options or {},
+    }
+    digest.update(json.dumps(config, sort_keys=True, default=str).encode())
+
+    if 'stock_id' in prices.columns:
+        digest.update(prices['stock_id'].to_numpy(dtype='int64').tobytes())
+    if 'date' in prices.columns:
+        digest.update(prices['date'].to_numpy(dtype='datetime64[D]').tobytes())
+    for column in HASHED_COLUMNS:
+        digest.update(np.ascontiguousarray(prices[column].to_numpy(dtype=float)).tobytes())
+    return digest.hexdigest()
+
+
+def find_artifact(content_hash):
+    return ModelArtifact.objects.filter(content_hash=content_hash).first()
+
+
+def load_artifact(artifact):
+    """Kayıtlı modeli dosyadan yükler ve kullanım bilgisini günceller; dosya yoksa kaydı siler."""
+    if not os.path.exists(artifact.file_path):
+        logger.warning("Model dosyası bulunamadı, kayıt siliniyor: %s", artifact.file_path)
+        artifact.delete()
+        return None
+
+    model = BaseModel.load(artifact.file_path)
+    ModelArtifact.objects.filter(id=artifact.id).update(use_count=F('use_count') + 1, last_used_at=timezone.now())
+    return model
+
+
+def register_artifact(stock, model, content_hash, prices):
+    """Eğitilmiş modeli <özet>.joblib olarak kaydeder ve ModelArtifact kaydını oluşturur."""
+    os.makedirs(ARTIFACT_DIR, exist_ok=True)
+    path = os.path.join(ARTIFACT_DIR, f"{content_hash}.joblib")
+
+    # Yarım yazılmış dosyanın başka bir süreç tarafından okunmaması için önce geçici dosyaya yazılır
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    model.save(temp_path)
+    os.replace(temp_path, path)
+
+    dates = prices['date'] if 'date' in prices.columns else None
+    try:
+        artifact, _ = ModelArtifact.objects.get_or_create(
+            content_hash=content_hash,
+            defaults={
+                'stock': stock,
+                'model_type': model.model_type,
+                'time_horizon': model.time_horizon,
+                'data_start': dates.min().date() if dates is not None else None,
+                'data_end': dates.max().date() if dates is not None else None,
+                'row_count': len(prices),
+                'feature_names': model.feature_names,
+                'params': json.loads(json.dumps(model.params, default=str)),
+                'metrics': model.metrics,
+                'file_path': path,
+                'file_size': os.path.getsize(path),
+                'last_used_at': timezone.now(),
+            },
+        )
+    except IntegrityError:
+        # Aynı modeli eşzamanlı eğiten başka bir süreç kaydı önce oluşturdu
+        artifact = find_artifact(content_hash)
+
+    prune_artifacts(stock, model.model_type, model.time_horizon)
+    return artifact
+
+
+def prune_artifacts(stock, model_type, time_horizon, keep=ARTIFACTS_TO_KEEP):
+    """Hisse/model tipi/ufuk için en yeni keep kayıt dışındakileri dosyalarıyla birlikte siler."""
+    stale = ModelArtifact.objects.filter(
+        stock=stock, model_type=model_type, time_horizon=time_horizon,
+    ).order_by('-created_at')[keep:]
+
+    removed = 0
+    for artifact in stale:
+        if os.path.exists(artifact.file_path):
+            os.remove(artifact.file_path)
+        artifact.delete()
+        removed += 1
+    return removed
+
+
+def get_or_train(stock, model, prices, train, options=None):
+    """
+    Yeni (eğitilmemiş) model nesnesinin girdi özetine karşılık gelen kayıtlı modeli yükler;
+    yoksa train(model) ile eğitip kaydeder. prices, normalize_prices çıktısıdır.
+    (model, content_hash, kayıttan_mı) döndürür.
+    """
+    content_hash = artifact_hash(model, prices, options)
+
+    artifact = find_artifact(content_hash)
+    if artifact is not None:
+        loaded = load_artifact(artifact)
+        if loaded is not None:
+            logger.info("%s kayıt defterinden yüklendi (%s)", loaded.model_name, content_hash[:12])
+            return loaded, content_hash, True
+
+    model.data_version = content_hash
+    train(model)
+    register_artifact(stock, model, content_hash, prices)
+    return model, content_hash, False
@@ -0,0 +1,72 @@
+"""
+Tahmin raporlarının JSON, CSV, Excel ve PDF olarak dışa aktarımı.
+"""
+import json
+import os
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import pandas as pd
+from matplotlib.backends.backend_pdf import PdfPages
+
+
+class ReportExporter:
+    """
+    Rapor sözlüğünü ({'title', 'summary': {...}, 'forecast': [{'month', 'price'}...]})
+    istenen biçimlerde dosyaya yazar.
+    """
+
+    SUPPORTED_FORMATS = ('json', 'csv', 'excel', 'pdf')
+
+    def __init__(self, output_dir='reports'):
+        self.output_dir = output_dir
+
+    def export(self, report, formats, basename):
+        os.makedirs(self.output_dir, exist_ok=True)
+        paths = {}
+        for fmt in formats:
+            if fmt not in self.SUPPORTED_FORMATS:
+                continue
+            paths[fmt] = getattr(self, f'_export_{fmt}')(report, os.path.join(self.output_dir, basename))
+        return paths
+
+    def _export_json(self, report, base):
+        path = f"{base}.json"
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump(report, file, ensure_ascii=False, indent=2, default=str)
+        return path
+
+    def _export_csv(self, report, base):
+        path = f"{base}.csv"
+        pd.DataFrame(report.get('forecast', [])).to_csv(path, index=False)
+        return path
+
+    def _export_excel(self, report, base):
+        path = f"{base}.xlsx"
+        with pd.ExcelWriter(path) as writer:
+            pd.DataFrame(list(report['summary'].items()), columns=['Alan', 'Değer']).to_excel(writer, sheet_name='Özet', index=False)
+            pd.DataFrame(report.get('forecast', [])).to_excel(writer, sheet_name='Tahmin', index=False)
+        return path
+
+    def _export_pdf(self, report, base):
+        path = f"{base}.pdf"
+        with PdfPages(path) as pdf:
+            fig, ax = plt.subplots(figsize=(8.27, 11.69))
+            ax.axis('off')
+            lines = [report.get('title', 'Tahmin Raporu'), ''] + [f"{key}: {value}" for key, value in report['summary'].items()]
+            ax.text(0.05, 0.95, '\n'.join(lines), va='top', family='monospace', fontsize=10)
+            pdf.savefig(fig)
+            plt.close(fig)
+
+            if report.get('forecast'):
+                forecast = pd.DataFrame(report['forecast'])
+                fig, ax = plt.subplots(figsize=(11.69, 8.27))
+                ax.plot(forecast['month'], forecast['price'], marker='o')
+                ax.set_xlabel('Ay')
+                ax.set_ylabel('Tahmini Fiyat')
+                ax.set_title(report.get('title', 'Tahmin'))
+                ax.grid(True, alpha=0.3)
+                pdf.savefig(fig)
+                plt.close(fig)
+        return path
@@ -0,0 +1,124 @@
+"""
+Web uygulaması için tahmin servisi: hissenin fiyat geçmişinden modeli eğitir (ya da
+önbellekten alır) ve tahmin üretir. İşlem adımları önbellekteki durum kaydına yazılır;
+tahmin sayfası bu kaydı prediction-status uç noktasından izler.
+"""
+import logging
+import os
+
+import pandas as pd
+from django.conf import settings
+from django.core.cache import cache
+
+from ..columnar import price_columns, price_version
+from .cache import model_cache
+from .estimators import MODEL_TYPES
+from .feature_store import feature_frame
+from .features import normalize_prices
+from .optimizer import params_key, tuned_params
+from .orchestrator import ModelOrchestrator
+from .registry import get_or_train
+
+logger = logging.getLogger(__name__)
+
+PREDICTION_DIR = os.path.join(settings.BASE_DIR, 'uploads', 'predictions')
+STATUS_TIMEOUT = 60 * 60
+
+orchestrator = ModelOrchestrator(base_dir=PREDICTION_DIR)
+
+
+def _status_key(stock_id):
+    return f"tahmin:prediction-status:{stock_id}"
+
+
+def set_prediction_status(stock_id, status, step, message='', error=None):
+    cache.set(_status_key(stock_id), {
+        'status': status,
+        'step': step,
+        'message': message,
+        'error': error,
+    }, STATUS_TIMEOUT)
+
+
+def get_prediction_status(stock_id):
+    """Hissenin son tahmin işleminin durumu (status, step, message, error)."""
+    return cache.get(_status_key(stock_id)) or {
+        'status': 'idle',
+        'step': 'waiting',
+        'message': 'Çalışan bir tahmin işlemi yok.',
+        'error': None,
+    }
+
+
+def price_frame(stock_id, version=None):
+    """Hissenin fiyat geçmişini (sütunsal önbellekten) tahmin modellerinin beklediği DataFrame'e çevirir."""
+    return pd.DataFrame(price_columns(stock_id, version))
+
+
+def model_name_for(symbol, model_type, time_horizon):
+    return f"{symbol}_{model_type}_{int(time_horizon)}m"
+
+
+def get_trained_model(stock, model_type, time_horizon, version=None, prices=None):
+    """
+    Hissenin güncel fiyat verisiyle eğitilmiş modeli döndürür. Sırasıyla süreç içi önbellek ve
+    model kayıt defteri (aynı girdilerle eğitilmiş model dosyası) denenir; ikisi de yoksa model
+    eğitilir ve kaydedilir. (model, önbellekten_mi) döndürür; kayıt defterinden yüklenen modeller
+    de önbellekten sayılır.
+    """
+    if model_type not in MODEL_TYPES:
+        raise ValueError(f"Geçersiz model tipi: {model_type}")
+
+    version = version or price_version(stock.id)
+    # Hisse için hiperparametre araması yapıldıysa (bkz. tuning) en iyi parametreler kullanılır;
+    # yeni bir arama bittiğinde önbellekteki ve kayıt defterindeki eski model kullanılmaz
+    params = tuned_params(stock, model_type, time_horizon)
+    tuned = params_key(params)
+    key = model_cache.make_key(stock.symbol, model_type, time_horizon, version, tuned)
+    model_name = model_name_for(stock.symbol, model_type, time_horizon)
+    from_registry = False
+
+    def build():
+        nonlocal from_registry
+        frame = normalize_prices(prices if prices is not None else price_frame(stock.id, version), 'close')
+        model = orchestrator.create_model(model_type, model_name=model_name, time_horizon=time_horizon,
+                                          params=params)
+
+        def train(model):
+            set_prediction_status(stock.id, 'running', 'model_training', f"{model_name} modeli eğitiliyor")
+            orchestrator.train_model(model, frame, target_column='close', stock_symbol=stock.symbol, save=False,
+                                     features=feature_frame(stock.id, model.sequence_length))
+
+        model, _, from_registry = get_or_train(stock, model, frame, train, {'tuned_params': tuned})
+        return model
+
+    model, cached = model_cache.get_or_create(key, build)
+    return model, cached or from_registry
+
+
+def predict_for_stock(stock, model_type='hybrid', time_horizon=12):
+    """
+    Hisse için tahmin yapar ve sonuç sözlüğünü döndürür. Aynı fiyat verisiyle tekrarlanan
+    istekler önbellekteki modeli kullanır, yeniden eğitim yapılmaz.
+    """
+    try:
+        set_prediction_status(stock.id, 'running', 'data_preparation', f"{stock.symbol} fiyat verileri hazırlanıyor")
+        version = price_version(stock.id)
+        prices = price_frame(stock.id, version)
+        if prices.empty:
+            raise ValueError(f"{stock.name} için fiyat verisi bulunamadı. Önce fiyat verilerini yükleyin.")
+
+        model, cached = get_trained_model(stock, model_type, time_horizon, version, prices)
+
+        set_prediction_status(stock.id, 'running', 'prediction', "Tahmin üretiliyor")
+        result = orchestrator.predict_stock(model, prices, {'symbol': stock.symbol, 'name': stock.name}, target_column='close',
+                                            features=feature_frame(stock.id, model.sequence_length))
+        result['cached'] = cached
+        result['metrics'] = model.metrics
+        result['artifact'] = model.data_version
+    except Exception as e:
+        set_prediction_status(stock.id, 'error', 'error', str(e), error=str(e))
+        raise
+
+    set_prediction_status(stock.id, 'completed', 'completed', "Tahmin tamamlandı")
+    return result
@@ -0,0 +1,61 @@
+"""
+Model eğitim çalıştırmalarının (parametreler ve metrikler) kaydı ve performans özeti.
+"""
+import json
+import os
+from datetime import datetime
+
+import pandas as pd
+
+
+class ModelTracker:
+    """Her model için eğitim kayıtlarını JSON satırları (<model>.jsonl) olarak saklar."""
+
+    def __init__(self, tracking_dir='tracking'):
+        self.tracking_dir = tracking_dir
+
+    def _path(self, model_name):
+        return os.path.join(self.tracking_dir, f"{model_name}.jsonl")
+
+    def log_run(self, model_name, stock_symbol, metrics, params=None, data_version=None):
+        os.makedirs(self.tracking_dir, exist_ok=True)
+        record = {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'model_name': model_name,
+            'stock_symbol': stock_symbol,
+            'metrics': metrics,
+            'params': {key: list(value) if isinstance(value, tuple) else value for key, value in (params or {}).items()},
+            'data_version': data_version,
+        }
+        with open(self._path(model_name), 'a', encoding='utf-8') as file:
+            file.write(json.dumps(record, ensure_ascii=False) + '\n')
+        return record
+
+    def get_runs(self, model_name, stock_symbol=None):
+        path = self._path(model_name)
+        if not os.path.exists(path):
+            return []
+        with open(path, encoding='utf-8') as file:
+            runs = [json.loads(line) for line in file if line.strip()]
+        if stock_symbol is not None:
+            runs = [run for run in runs if run['stock_symbol'] == stock_symbol]
+        return runs
+
+    def performance_report(self, model_name, stock_symbol=None):
+        """Kayıtlı çalıştırmaların metriklerini CSV olarak yazar ve özetini döndürür."""
+        runs = self.get_runs(model_name, stock_symbol)
+        if not runs:
+            return {'success': False, 'message': f"{model_name} için kayıtlı eğitim bulunamadı"}
+
+        frame = pd.DataFrame([{'timestamp': run['timestamp'], **run['metrics']} for run in runs])
+        csv_path = os.path.join(self.tracking_dir, f"{model_name}_{stock_symbol or 'all'}_performance.csv")
+        frame.to_csv(csv_path, index=False)
+
+        numeric = frame.drop(columns=['timestamp']).select_dtypes('number')
+        return {
+            'success': True,
+            'runs': len(runs),
+            'latest': runs[-1]['metrics'],
+            'mean': numeric.mean().to_dict(),
+            'report_files': [csv_path],
+        }
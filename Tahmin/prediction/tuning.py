@@ -0,0 +1,112 @@
+"""
+Hisse bazında toplu hiperparametre araması (gece çalıştırılmak üzere).
+
+Her hissenin fiyat geçmişi bir kez okunur, özellikler özellik deposundan alınır; eğitim
+matrisleri ufuk ve dizi uzunluğuna göre önbelleğe alınıp aynı hissedeki model tipleri ve tüm
+denemeler arasında paylaşılır. Aramalar ModelOptimizer ile paralel ve erken durdurmalı çalışır,
+denemeler TuningTrial tablosuna yazılır:
+süre sınırı dolduğunda yarıda kalan arama bir sonraki çalıştırmada kaldığı yerden devam eder.
+Arama hisse, ilk fiyat tarihi ve son fiyat tarihinin ayıyla anılır (bkz. study_range): gece
+eklenen yeni günler ay içinde aramayı sürdürür (önceki denemelerin puanları birkaç gün kısa
+veriyle hesaplanmış olur); yeni ayda ya da ilk tarih değiştiğinde arama baştan başlar.
+Bulunan parametreler tahmin servisinde kullanılır (bkz. optimizer.tuned_params).
+"""
+import logging
+import time
+
+from ..models import Stock
+from .estimators import MODEL_TYPES, create_model
+from .feature_store import feature_frame
+from .features import normalize_prices, training_matrix
+from .optimizer import ModelOptimizer
+from .orchestrator import MIN_TRAINING_SAMPLES
+from .service import model_name_for, price_frame
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TRIALS = 30
+
+
+def study_range(stock, frame):
+    """Aramanın veri aralığı: hisse, ilk fiyat tarihi ve son fiyat tarihinin ayı."""
+    dates = frame['date']
+    return {'stock': stock.id, 'start': dates.iloc[0].date().isoformat(), 'month': dates.iloc[-1].strftime('%Y-%m')}
+
+
+def tune_stocks(symbols=None, model_types=('xgboost',), time_horizons=(12,), n_trials=DEFAULT_TRIALS,
+                max_workers=None, max_minutes=None, progress=None):
+    """
+    Aktif hisselerin (ya da verilen sembollerin) her model tipi ve ufku için arama yapar.
+    max_minutes dolduğunda yeni deneme başlatılmaz. Hisse bazında özet döndürür.
+    """
+    for model_type in model_types:
+        if model_type not in MODEL_TYPES:
+            raise ValueError(f"Geçersiz model tipi: {model_type}")
+
+    report = progress or (lambda percent, message: None)
+    started = time.monotonic()
+    deadline = started + max_minutes * 60 if max_minutes else None
+
+    stocks = Stock.objects.filter(is_active=True).order_by('symbol')
+    if symbols:
+        stocks = stocks.filter(symbol__in=symbols)
+    stocks = list(stocks)
+    if not stocks:
+        raise ValueError("Arama yapılacak hisse bulunamadı.")
+
+    total = len(stocks) * len(model_types) * len(time_horizons)
+    tuned, skipped = [], []
+    stopped = False
+
+    for stock in stocks:
+        prices = price_frame(stock.id)
+        if prices.empty:
+            skipped.append(stock.symbol)
+            continue
+        frame = normalize_prices(prices, 'close')
+        matrices = {}
+
+        for time_horizon in time_horizons:
+            for model_type in model_types:
+                remaining = deadline - time.monotonic() if deadline else None
+                if remaining is not None and remaining <= 0:
+                    stopped = True
+                    break
+
+                model = create_model(model_type, model_name=model_name_for(stock.symbol, model_type, time_horizon),
+                                     time_horizon=time_horizon)
+                key = (model.horizon, model.sequence_length)
+                if key not in matrices:
+                    matrices[key] = training_matrix(frame, *key, features=feature_frame(stock.id, model.sequence_length))
+                X, y, _ = matrices[key]
+                if len(y) < MIN_TRAINING_SAMPLES:
+                    skipped.append(model.model_name)
+                    continue
+
+                report(100 * (len(tuned) + len(skipped)) // total, f"{model.model_name} aranıyor")
+                search = ModelOptimizer(
+                    n_trials=n_trials, max_workers=max_workers, timeout=remaining, persist=True, stock=stock,
+                ).optimize(model, X, y, data_range=study_range(stock, frame))
+                tuned.append({
+                    'symbol': stock.symbol,
+                    'model_type': model_type,
+                    'time_horizon': int(time_horizon),
+                    'best_params': search['best_params'],
+                    'best_rmse': search['best_rmse'],
+                    **{name: search[name] for name in ('completed', 'pruned', 'failed', 'resumed', 'remaining', 'duration')},
+                })
+            if stopped:
+                break
+        if stopped:
+            break
+
+    duration = time.monotonic() - started
+    logger.info("Hiperparametre araması: %s model, %.1f sn%s", len(tuned), duration, " (süre doldu)" if stopped else "")
+    return {
+        'tuned': tuned,
+        'skipped': skipped,
+        'stopped': stopped,
+        'duration': round(duration, 2),
+        'message': f"{len(tuned)} model için hiperparametre araması yapıldı ({duration:.1f} sn)."
+                   + (" Süre sınırı doldu; kalan denemeler bir sonraki çalıştırmada devam eder." if stopped else ""),
+    }
@@ -0,0 +1,211 @@
+"""
+Tüm hisse evreni için tek geçişte toplu tahmin.
+
+Aktif hisselerin fiyatları tek sorguyla okunur ve her sütunu bir hisse olan geniş matrislere
+yerleştirilir (her hissenin son günü son satırdadır). Özellikler bu matrisler üzerinde sütun
+bazında, tüm hisseler için aynı anda hesaplanır. Model tüm hisselerin örnekleriyle (havuz
+modeli) eğitilir, model kayıt defterinde saklanır ve tahminler tek predict çağrısıyla üretilip
+BatchPrediction tablosuna yazılır.
+"""
+import logging
+import math
+import time
+import uuid
+from datetime import timedelta
+
+import numpy as np
+import pandas as pd
+from django.db.models import Max
+
+from ..models import BatchPrediction, Stock, StockPrice
+from .estimators import MODEL_TYPES, create_model
+from .features import build_target, feature_columns, horizon_days
+from .orchestrator import CONFIDENCE_Z, MIN_TRAINING_SAMPLES
+from .registry import get_or_train
+from .service import orchestrator
+
+logger = logging.getLogger(__name__)
+
+# Eğitimde kullanılan geçmiş (işlem günü) ve örnekleme aralığı. Ufku aşan hedefler birbirine
+# çok benzediğinden her SAMPLE_STRIDE günden biri alınır; bellek ve süre hisse sayısıyla
+# doğrusal kalır.
+TRAINING_DAYS = 3 * 252
+SAMPLE_STRIDE = 5
+
+# Özelliklerin ısınması için gereken en uzun pencere (200 günlük ortalama)
+WARMUP_DAYS = 200
+
+PRICE_FIELDS = {
+    'open': 'opening_price',
+    'high': 'highest_price',
+    'low': 'lowest_price',
+    'close': 'closing_price',
+    'volume': 'volume',
+}
+
+
+def load_universe_prices(stock_ids, trading_days):
+    """
+    Hisselerin son trading_days işlem gününü kapsayan fiyatlarını tek sorguyla okur.
+    stock_id ve tarih sırasında uzun bir DataFrame (stock_id, date, open, high, low, close, volume) döndürür.
+    """
+    queryset = StockPrice.objects.filter(stock_id__in=stock_ids)
+    latest = queryset.aggregate(latest=Max('date'))['latest']
+    if latest is None:
+        return pd.DataFrame(columns=['stock_id', 'date', *PRICE_FIELDS])
+
+    # İşlem günü -> takvim günü (hafta sonu ve tatiller için pay bırakılır)
+    start = latest - timedelta(days=math.ceil(trading_days * 365 / 245))
+    rows = queryset.filter(date__gte=start).order_by('stock_id', 'date').values_list(
+        'stock_id', 'date', *PRICE_FIELDS.values(),
+    )
+    frame = pd.DataFrame.from_records(list(rows), columns=['stock_id', 'date', *PRICE_FIELDS])
+    frame['date'] = pd.to_datetime(frame['date'])
+    for column in PRICE_FIELDS:
+        frame[column] = frame[column].astype(float)
+    return frame
+
+
+def price_panel(frame):
+    """
+    Uzun fiyat tablosunu sağa hizalı geniş matrislere çevirir: {'stock_ids', 'dates', 'open',
+    'high', 'low', 'close', 'volume'}. Fiyat matrisleri (gün x hisse) DataFrame'lerdir; kısa
+    geçmişli hisselerin baş kısmı NaN'dır.
+    """
+    stock_ids, starts, counts = np.unique(frame['stock_id'].to_numpy(), return_index=True, return_counts=True)
+    rows = int(counts.max())
+    group = np.repeat(np.arange(len(stock_ids)), counts)
+    position = (rows - counts)[group] + (np.arange(len(frame)) - starts[group])
+
+    panel = {'stock_ids': stock_ids}
+    dates = np.full((rows, len(stock_ids)), np.datetime64('NaT'), dtype='datetime64[ns]')
+    dates[position, group] = frame['date'].to_numpy()
+    panel['dates'] = dates
+
+    for column in PRICE_FIELDS:
+        values = np.full((rows, len(stock_ids)), np.nan)
+        values[position, group] = frame[column].to_numpy()
+        panel[column] = pd.DataFrame(values, columns=stock_ids)
+    return panel
+
+
+def panel_matrices(panel, horizon, sequence_length=0, training_days=TRAINING_DAYS, stride=SAMPLE_STRIDE):
+    """
+    Tüm hisseler için özellikleri bir kerede hesaplar. (X_train, y_train, X_latest, feature_names)
+    döndürür; X_train satırları zaman sıralıdır (her örnek gününde tüm hisseler), X_latest her
+    hissenin son gününe aittir.
+    """
+    rows = len(panel['close'])
+    last_target_row = rows - 1 - horizon
+    sample_rows = np.arange(last_target_row, max(last_target_row - training_days, -1), -stride)[::-1]
+
+    feature_names, train_parts, latest_parts = [], [], []
+    for name, values in feature_columns(panel['close'], panel['high'], panel['low'], panel['volume'], sequence_length):
+        values = values.to_numpy()
+        feature_names.append(name)
+        train_parts.append(values[sample_rows])
+        latest_parts.append(values[-1])
+
+    X_train = np.stack(train_parts, axis=-1).reshape(-1, len(feature_names))
+    y_train = build_target(panel, horizon).to_numpy()[sample_rows].reshape(-1)
+    X_latest = np.stack(latest_parts, axis=-1)
+
+    X_train[~np.isfinite(X_train)] = np.nan
+    X_latest[~np.isfinite(X_latest)] = np.nan
+    valid = ~np.isnan(X_train).any(axis=1) & np.isfinite(y_train)
+    return X_train[valid], y_train[valid], X_latest, feature_names
+
+
+def predict_universe(model_type='xgboost', time_horizon=12, stocks=None, progress=None):
+    """
+    Aktif hisselerin (ya da verilen hisselerin) tamamı için tahmin üretir ve sonuçları tek bir
+    run_id ile BatchPrediction tablosuna yazar. progress(yüzde, mesaj) verilirse adımlar bildirilir.
+    Çalıştırma özetini döndürür.
+    """
+    if model_type not in MODEL_TYPES:
+        raise ValueError(f"Geçersiz model tipi: {model_type}")
+
+    report = progress or (lambda percent, message: None)
+    started = time.monotonic()
+    stocks = list(stocks if stocks is not None else Stock.objects.filter(is_active=True))
+    symbols = {stock.id: stock.symbol for stock in stocks}
+
+    horizon = horizon_days(time_horizon)
+    report(5, f"{len(stocks)} hissenin fiyatları okunuyor")
+    frame = load_universe_prices(list(symbols), TRAINING_DAYS + horizon + WARMUP_DAYS)
+    if frame.empty:
+        raise ValueError("Toplu tahmin için fiyat verisi bulunamadı. Önce fiyat verilerini yükleyin.")
+
+    report(20, "Özellikler hesaplanıyor")
+    panel = price_panel(frame)
+    model = create_model(model_type, model_name=f"universe_{model_type}_{int(time_horizon)}m", time_horizon=time_horizon)
+    X_train, y_train, X_latest, feature_names = panel_matrices(panel, horizon, model.sequence_length)
+
+    def train(model):
+        if len(y_train) < MIN_TRAINING_SAMPLES:
+            raise ValueError(f"Eğitim için yeterli veri yok: {len(y_train)} örnek")
+        report(40, f"Model {len(y_train)} örnekle eğitiliyor")
+        # Doğrulama boşluğu: ufuk kadar örnek günü, her günde tüm hisseler
+        gap = math.ceil(horizon / SAMPLE_STRIDE) * len(panel['stock_ids'])
+        orchestrator.fit_and_evaluate(model, X_train, y_train, feature_names, gap=gap)
+
+    options = {'training_days': TRAINING_DAYS, 'stride': SAMPLE_STRIDE}
+    model, content_hash, cached = get_or_train(None, model, frame, train, options)
+
+    report(80, "Tahminler yazılıyor")
+    ready = ~np.isnan(X_latest).any(axis=1)
+    predicted_returns = np.full(len(X_latest), np.nan)
+    if ready.any():
+        predicted_returns[ready] = model.predict(X_latest[ready])
+
+    last_prices = panel['close'].to_numpy()[-1]
+    last_dates = pd.DatetimeIndex(panel['dates'][-1])
+    spread = CONFIDENCE_Z * model.metrics.get('rmse', 0.0)
+    run_id = uuid.uuid4().hex
+
+    predictions, skipped = [], []
+    for index, stock_id in enumerate(panel['stock_ids']):
+        if not ready[index]:
+            skipped.append(symbols[stock_id])
+            continue
+        last_price = float(last_prices[index])
+        predicted_return = float(predicted_returns[index])
+        predictions.append(BatchPrediction(
+            run_id=run_id,
+            stock_id=int(stock_id),
+            model_type=model_type,
+            time_horizon=int(time_horizon),
+            as_of=last_dates[index].date(),
+            target_date=(last_dates[index] + pd.offsets.BDay(horizon)).date(),
+            last_price=last_price,
+            predicted_price=last_price * math.exp(predicted_return),
+            change_percent=(math.exp(predicted_return) - 1) * 100,
+            lower_bound=last_price * math.exp(predicted_return - spread),
+            upper_bound=last_price * math.exp(predicted_return + spread),
+            artifact_hash=content_hash,
+        ))
+    BatchPrediction.objects.bulk_create(predictions, batch_size=1000)
+
+    # Fiyatı hiç olmayan hisseler de atlanmış sayılır
+    priced = set(panel['stock_ids'].tolist())
+    skipped += [symbol for stock_id, symbol in symbols.items() if stock_id not in priced]
+    duration = time.monotonic() - started
+    logger.info("Toplu tahmin %s: %s hisse, %.1f sn", run_id, len(predictions), duration)
+
+    return {
+        'run_id': run_id,
+        'model_type': model_type,
+        'time_horizon': int(time_horizon),
+        'predicted_count': len(predictions),
+        'skipped': sorted(skipped),
+        'artifact': content_hash,
+        'cached': cached,
+        'metrics': model.metrics,
+        'duration': round(duration, 2),
+        'message': f"{len(predictions)} hisse için {time_horizon} aylık tahmin üretildi ({duration:.1f} sn).",
+    }
+
+
+def latest_run_id():
+    """En son toplu tahmin çalıştırmasının run_id değeri (yoksa None)."""
+    return BatchPrediction.objects.order_by('-created_at').values_list('run_id', flat=True).first()
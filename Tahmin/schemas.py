@@ -0,0 +1,387 @@
+"""
+Tablo biçimli veri kaynakları (fiyat, döviz kuru, faiz, makro ve enflasyon verileri) için
+bildirime dayalı içe aktarma şemaları ve bunları işleyen ortak motor.
+
+Her kaynak SCHEMAS içinde tanımlanır: hedef model, satırı tanımlayan anahtar alanlar, yazma
+biçimi ve sütunlar. Sütun tanımı dosyadaki olası başlıkları, değer türünü (CONVERTERS) ve
+karşılık gelen model alanını içerir; sayısal sınırlar, ondalık basamaklar, seçenekler ve metin
+uzunlukları model alanından türetilir. İsteğe bağlı anahtarlar:
+
+    required  sütun dosyada bulunmalı mı (varsayılan True)
+    default   sütun dosyada yoksa yazılacak değer
+    blank     boş hücreye izin verilir, boş değer (None) yazılır
+    coerce    çevrilemeyen hücre hata sayılmaz, boş değer yazılır
+    label     hata mesajındaki açıklama
+    min       alt sınır
+
+Motor tabloyu parçalar halinde işler: başlıklar standart adlara çevrilir, her sütun tek seferde
+dönüştürülüp doğrulanır, hatalı satırlar satır numarasıyla raporlanır ve geçerli satırlar toplu
+olarak yazılır; satır satır işleme yapılmaz. Yazma biçimleri:
+
+    insert  anahtarı tabloda ya da dosyanın önceki bir satırında bulunan satırlar mükerrer
+            sayılır, yalnızca yeniler eklenir (fiyat dosyaları)
+    upsert  yeni anahtarlar eklenir, mevcut kayıtların dolu gelen alanları güncellenir (bkz. upsert)
+"""
+import logging
+
+import numpy as np
+import pandas as pd
+from django.db import IntegrityError, models, transaction
+
+from .bars import update_price_bars
+from .models import ExchangeRate, InflationData, InterestRate, MacroeconomicData, StockPrice
+from .parsing import parse_dates, to_number, to_percent, to_text, to_volume
+from .upsert import upsert_frame
+
+logger = logging.getLogger(__name__)
+
+# Bir seferde dönüştürülüp yazılan en fazla satır sayısı
+CHUNK_ROWS = 50000
+
+BULK_BATCH_SIZE = 1000
+
+CONVERTERS = {
+    'date': parse_dates,
+    'number': to_number,
+    'volume': to_volume,
+    'percent': to_percent,
+    'text': to_text,
+}
+
+
+def _refresh_price_bars(constants, rows):
+    # Haftalık/aylık barlarda yalnızca yeni fiyatların düştüğü dönemler yeniden hesaplanır
+    update_price_bars(constants['stock'], since=rows['date'].min())
+
+
+def _optional_numbers(fields):
+    return {
+        field: {'headers': (field,), 'type': 'number', 'field': field, 'required': False, 'blank': True}
+        for field in fields
+    }
+
+
+MACRO_FIELDS = [
+    'tufe', 'tufe_yillik', 'ufe', 'ufe_yillik', 'policy_rate', 'bond_yield_2y', 'bond_yield_10y',
+    'usd_try', 'eur_try', 'gdp_growth', 'unemployment_rate', 'bist100_close', 'bist100_change',
+    'market_volume',
+]
+
+INTEREST_FIELDS = ['policy_rate', 'bond_yield_2y', 'bond_yield_10y']
+
+DATE_HEADERS = ('tarih', 'Tarih', 'date', 'Date')
+
+SCHEMAS = {
+    # Investing.com (TR/EN) hisse fiyatı dışa aktarımları. Standart sütun adları (Date, Open, ...)
+    # akışlı yükleme ve gün içi barlar tarafından da kullanılır.
+    'stock_prices': {
+        'model': StockPrice,
+        'keys': ['stock', 'date'],
+        'write': 'insert',
+        'after_insert': _refresh_price_bars,
+        'columns': {
+            'Date': {'headers': ('Tarih', 'Date'), 'type': 'date', 'field': 'date', 'label': "Geçersiz tarih değeri"},
+            'Volume': {
+                'headers': ('Hacim', 'Hacim.', 'Hac.', 'Volume', 'Vol.', 'Vol'), 'type': 'volume', 'field': 'volume',
+                'label': "Geçersiz hacim değeri", 'min': 0,
+            },
+            'Open': {'headers': ('Açılış', 'Open'), 'type': 'number', 'field': 'opening_price', 'label': "Geçersiz fiyat değeri (Open)"},
+            'High': {'headers': ('Yüksek', 'High'), 'type': 'number', 'field': 'highest_price', 'label': "Geçersiz fiyat değeri (High)"},
+            'Low': {'headers': ('Düşük', 'Low'), 'type': 'number', 'field': 'lowest_price', 'label': "Geçersiz fiyat değeri (Low)"},
+            'Close': {
+                'headers': ('Şimdi', 'Kapanış', 'Close', 'Price'), 'type': 'number', 'field': 'closing_price',
+                'label': "Geçersiz fiyat değeri (Close)",
+            },
+            'Change': {
+                'headers': ('Fark %', 'Change %'), 'type': 'percent', 'field': 'daily_change', 'required': False,
+                'default': 0.0, 'label': "Geçersiz değişim değeri",
+            },
+        },
+    },
+    # USD/TRY ve EUR/TRY (Investing.com); para birimi içe aktarımda sabit olarak verilir
+    'exchange_rates': {
+        'model': ExchangeRate,
+        'keys': ['date', 'currency'],
+        'write': 'upsert',
+        'columns': {
+            'date': {'headers': DATE_HEADERS, 'type': 'date', 'field': 'date', 'label': "Geçersiz tarih değeri"},
+            'open': {'headers': ('Açılış', 'Open'), 'type': 'number', 'field': 'open_price', 'label': "Geçersiz fiyat (Açılış)"},
+            'high': {'headers': ('Yüksek', 'High'), 'type': 'number', 'field': 'high_price', 'label': "Geçersiz fiyat (Yüksek)"},
+            'low': {'headers': ('Düşük', 'Low'), 'type': 'number', 'field': 'low_price', 'label': "Geçersiz fiyat (Düşük)"},
+            'close': {'headers': ('Şimdi', 'Kapanış', 'Close'), 'type': 'number', 'field': 'close_price', 'label': "Geçersiz fiyat (Kapanış)"},
+            'volume': {'headers': ('Hac.', 'Hacim', 'Volume', 'Vol.'), 'type': 'text', 'field': 'volume', 'required': False, 'blank': True},
+            'change': {
+                'headers': ('Fark %', 'Change %', 'Change'), 'type': 'percent', 'field': 'change_percent',
+                'required': False, 'blank': True, 'coerce': True,
+            },
+        },
+    },
+    # Politika faizi (JSON) ve tahvil faizi dosyaları -> InterestRate; yeni kayıtlarda boş faizler 0 olur
+    'interest_rates': {
+        'model': InterestRate,
+        'keys': ['date'],
+        'write': 'upsert',
+        'defaults': dict.fromkeys(INTEREST_FIELDS, 0),
+        'columns': {
+            'date': {'headers': DATE_HEADERS, 'type': 'date', 'field': 'date', 'label': "Geçersiz tarih değeri"},
+            **_optional_numbers(INTEREST_FIELDS),
+        },
+    },
+    # Birleşik faiz dosyası -> MacroeconomicData (yalnızca faiz alanları)
+    'macro_interest': {
+        'model': MacroeconomicData,
+        'keys': ['date'],
+        'write': 'upsert',
+        'columns': {
+            'date': {'headers': DATE_HEADERS, 'type': 'date', 'field': 'date', 'label': "Geçersiz tarih değeri"},
+            **{field: {**spec, 'required': True} for field, spec in _optional_numbers(INTEREST_FIELDS).items()},
+        },
+    },
+    'macro': {
+        'model': MacroeconomicData,
+        'keys': ['date'],
+        'write': 'upsert',
+        'columns': {
+            'date': {'headers': DATE_HEADERS, 'type': 'date', 'field': 'date', 'label': "Geçersiz tarih değeri"},
+            **_optional_numbers(MACRO_FIELDS),
+        },
+    },
+    # TÜİK enflasyon bültenlerinden (OCR) okunan aylık veriler
+    'inflation': {
+        'model': InflationData,
+        'keys': ['month', 'year'],
+        'write': 'upsert',
+        'columns': {
+            'month': {'headers': ('month', 'Ay'), 'type': 'text', 'field': 'month', 'label': "Geçersiz ay"},
+            'year': {'headers': ('year', 'Yıl'), 'type': 'number', 'field': 'year', 'label': "Geçersiz yıl"},
+            'tufe_monthly': {'headers': ('tufe_monthly',), 'type': 'number', 'field': 'tufe_monthly'},
+            'tufe_yearly': {'headers': ('tufe_yearly',), 'type': 'number', 'field': 'tufe_yearly'},
+            'ufe_monthly': {'headers': ('ufe_monthly',), 'type': 'number', 'field': 'ufe_monthly'},
+            'ufe_yearly': {'headers': ('ufe_yearly',), 'type': 'number', 'field': 'ufe_yearly'},
+        },
+    },
+}
+
+
+def header_map(schema):
+    """Dosya başlığı -> standart sütun adı (standart adlar kendilerine eşlenir)."""
+    mapping = {column: column for column in schema['columns']}
+    for column, spec in schema['columns'].items():
+        mapping.update(dict.fromkeys(spec['headers'], column))
+    return mapping
+
+
+def standardize_columns(name, columns):
+    """
+    Başlıktaki sütun isimlerini şemanın standart isimlerine çevirir (tanınmayanlar olduğu gibi
+    kalır); gerekli sütunlardan biri eksikse ValueError fırlatır.
+    """
+    schema = SCHEMAS[name]
+    mapping = header_map(schema)
+    standard = [mapping.get(str(col).strip(), str(col).strip()) for col in columns]
+
+    missing_columns = [
+        column for column, spec in schema['columns'].items() if spec.get('required', True) and column not in standard
+    ]
+    if missing_columns:
+        raise ValueError(f"Dosyada gerekli sütunlar eksik: {', '.join(missing_columns)}")
+    return standard
+
+
+def read_table(file_path, filename=None, as_text=False):
+    """
+    Dosyayı uzantısına göre CSV ya da Excel olarak okur. as_text=True ise tüm hücreler metin
+    olarak okunur; dönüşüm şemadaki türlere göre yapılır.
+    """
+    name = (filename or file_path).lower()
+    dtype = str if as_text else None
+    if name.endswith(('.xlsx', '.xls')):
+        return pd.read_excel(file_path, dtype=dtype)
+    return pd.read_csv(file_path, encoding='utf-8', dtype=dtype)
+
+
+def _empty(values):
+    return values.isna() | (values.astype(str).str.strip() == '')
+
+
+def parse_frame(name, df, first_row=2):
+    """
+    Standart sütunlu tabloyu şemaya göre dönüştürür ve satır bazında doğrular.
+
+    Dönen DataFrame'de 'row' (dosyadaki satır numarası; ilk veri satırı first_row), şemadaki
+    model alanları ve 'error' (hatalı satırlar için açıklama, aksi halde None) sütunları bulunur.
+    Her satır için yalnızca ilk hata kaydedilir; satırlar dosyadaki sırasını korur.
+    """
+    schema = SCHEMAS[name]
+    model = schema['model']
+    parsed = pd.DataFrame(index=df.index)
+    parsed['row'] = np.arange(len(df)) + first_row
+    errors = pd.Series(None, index=df.index, dtype=object)
+
+    for column, spec in schema['columns'].items():
+        field = model._meta.get_field(spec['field'])
+        if column not in df.columns:
+            parsed[field.name] = spec.get('default')
+            continue
+
+        raw = df[column]
+        values = CONVERTERS[spec['type']](raw)
+        empty = _empty(raw)
+        # Boş olmadığı halde çevrilemeyen hücreler (coerce ile boş değer sayılır)
+        invalid = values.isna() & ~empty & (not spec.get('coerce'))
+        if not spec.get('blank'):
+            invalid |= empty
+
+        if isinstance(field, models.DecimalField):
+            invalid |= values.abs() >= 10 ** (field.max_digits - field.decimal_places)
+            values = values.round(field.decimal_places)
+        elif isinstance(field, models.IntegerField):
+            values = values.round()
+        elif isinstance(field, models.CharField) and field.max_length:
+            invalid |= values.str.len() > field.max_length
+        if field.choices:
+            invalid |= values.notna() & ~values.isin([choice for choice, _ in field.choices])
+        if 'min' in spec:
+            invalid |= values < spec['min']
+
+        # Her satır için yalnızca ilk hata kaydedilir
+        invalid &= errors.isna()
+        if invalid.any():
+            label = spec.get('label') or f"Geçersiz değer ({field.verbose_name})"
+            errors[invalid] = [f"{label}: {'' if pd.isna(value) else value}" for value in raw[invalid]]
+
+        if spec['type'] == 'date':
+            values = values.dt.date
+        parsed[field.name] = values.astype(object).where(values.notna(), None) if spec.get('blank') else values
+
+    parsed['error'] = errors
+    return parsed
+
+
+def _error_details(parsed):
+    failed = parsed['error'].notna()
+    return [f"Satır {row}: {error}" for row, error in parsed.loc[failed, ['row', 'error']].itertuples(index=False)]
+
+
+def _existing_keys(model, constants, key, values):
+    # Verilen anahtar aralığında tabloda bulunan anahtarlar
+    if values.empty:
+        return set()
+    return set(
+        model.objects.filter(
+            **constants, **{f'{key}__gte': values.min(), f'{key}__lte': values.max()},
+        ).values_list(key, flat=True)
+    )
+
+
+def _insert_new(schema, parsed, constants):
+    # Anahtarı tabloda ya da önceki bir satırda bulunanlar mükerrer; geçerli ve yeni olanlar eklenir
+    model = schema['model']
+    (key,) = [name for name in schema['keys'] if name not in constants]
+    fields = [spec['field'] for spec in schema['columns'].values()]
+
+    keyed = parsed[key].notna()
+    valid = parsed['error'].isna()
+    existing_keys = _existing_keys(model, constants, key, parsed.loc[keyed, key])
+
+    for attempt in range(2):
+        existing = keyed & parsed[key].isin(existing_keys)
+
+        # Aynı anahtar birden fazla geçiyorsa ilk geçerli satır eklenir, sonrakiler mükerrer sayılır
+        candidates = valid & ~existing
+        first_rows = parsed.loc[candidates].groupby(key, sort=False)['row'].min()
+        first_row_of_key = parsed[key].map(first_rows)
+        repeated = keyed & first_row_of_key.notna() & (parsed['row'] > first_row_of_key)
+
+        duplicate = existing | repeated
+        new_rows = parsed.loc[candidates & ~duplicate, fields]
+        for field in fields:
+            if isinstance(model._meta.get_field(field), models.IntegerField):
+                new_rows[field] = new_rows[field].astype(np.int64)
+
+        objects = [model(**constants, **dict(zip(fields, values))) for values in new_rows.itertuples(index=False)]
+        try:
+            if objects:
+                with transaction.atomic():
+                    model.objects.bulk_create(objects, batch_size=BULK_BATCH_SIZE)
+                    if schema.get('after_insert'):
+                        schema['after_insert'](constants, new_rows)
+            break
+        except IntegrityError:
+            # Okuma ile yazma arasında başka bir içe aktarma aynı anahtarları eklemiş; anahtarlar yeniden
+            # okunur ve bu satırlar eklenmiş değil mükerrer sayılır
+            if attempt:
+                raise
+            logger.warning("%s: eşzamanlı ekleme nedeniyle anahtarlar yeniden okunuyor", model.__name__)
+            existing_keys = _existing_keys(model, constants, key, parsed.loc[keyed, key])
+
+    return {
+        'success_count': len(objects),
+        'duplicate_count': int(duplicate.sum()),
+        'error_details': _error_details(parsed.loc[~duplicate]),
+    }
+
+
+def _upsert(schema, parsed, constants):
+    model = schema['model']
+    valid = parsed.loc[parsed['error'].isna()].assign(**constants)
+    fields = [
+        name for name in (*(spec['field'] for spec in schema['columns'].values()), *constants)
+        if name not in schema['keys']
+    ]
+    result = upsert_frame(
+        model, valid, schema['keys'], fields, defaults=schema.get('defaults'),
+        label=lambda index: f"Satır {valid.at[index, 'row']}",
+    )
+    return {
+        'success_count': result['created'] + result['updated'],
+        'updated_count': result['updated'],
+        'error_details': _error_details(parsed) + result['error_details'],
+    }
+
+
+WRITERS = {'insert': _insert_new, 'upsert': _upsert}
+
+
+def write_parsed(name, parsed, **constants):
+    """
+    parse_frame çıktısını şemanın yazma biçimiyle veritabanına yazar. constants tüm satırlara
+    eklenen sabit alanlardır (ör. stock, currency). Rapor sözlüğü döndürür.
+    """
+    result = WRITERS[SCHEMAS[name]['write']](SCHEMAS[name], parsed, constants)
+    return {
+        'total_rows': len(parsed),
+        'success_count': result['success_count'],
+        'updated_count': result.get('updated_count', 0),
+        'duplicate_count': result.get('duplicate_count', 0),
+        'error_count': len(result['error_details']),
+        'error_details': result['error_details'],
+    }
+
+
+def import_frame(name, df, first_row=2, chunk_rows=CHUNK_ROWS, **constants):
+    """
+    Tabloyu şemaya göre içe aktarır: başlıklar standartlaştırılır, satırlar chunk_rows'luk
+    parçalar halinde dönüştürülüp yazılır. Rapor: total_rows, success_count (eklenen ya da
+    güncellenen), updated_count, duplicate_count, error_count, error_details ve processed_ratio.
+    Dosya parçalar halinde aktarılıyorsa first_row, tablonun ilk satırının dosyadaki numarasıdır.
+    """
+    df = df.set_axis(standardize_columns(name, df.columns), axis=1)
+    report = {
+        'total_rows': 0, 'success_count': 0, 'updated_count': 0, 'duplicate_count': 0,
+        'error_count': 0, 'error_details': [],
+    }
+    for start in range(0, len(df), chunk_rows):
+        chunk = df.iloc[start:start + chunk_rows]
+        part = write_parsed(name, parse_frame(name, chunk, first_row + start), **constants)
+        for key in ('total_rows', 'success_count', 'updated_count', 'duplicate_count', 'error_count'):
+            report[key] += part[key]
+        report['error_details'].extend(part['error_details'])
+
+    processed = report['success_count'] + report['duplicate_count']
+    report['processed_ratio'] = (processed / report['total_rows'] * 100) if report['total_rows'] else 0
+    logger.debug(
+        "%s: %s satır (%s yazıldı, %s mükerrer, %s hata)",
+        name, report['total_rows'], report['success_count'], report['duplicate_count'], report['error_count'],
+    )
+    return report
@@ -0,0 +1,189 @@
+"""
+Finansal tablo PDF'lerinden (KAP faaliyet raporları, bağımsız denetim raporları) sayfa hedefli
+metin okuma.
+
+Yüzlerce sayfalık bir raporda değerlerin aranacağı yerler gelir tablosu ve finansal durum
+tablosu (bilanço) sayfalarıdır. Bu sayfalar önce PDF'in yer imlerinden, yoksa sayfalar baştan
+okunurken tablo başlıklarından bulunur; iki tablo da bulunduğunda okuma durur ve etiketler
+yalnızca bu sayfalarda aranır. Hiçbir tablo başlığı bulunamazsa (kısa özet PDF'leri) tüm
+sayfalar kullanılır.
+
+Okunan sayfa metinleri dosya içeriğinin SHA-256 özetiyle TEXT_CACHE_DIR altında saklanır; aynı
+rapor yeniden yüklendiğinde PDF hiç açılmaz. Tüm etiket kalıpları tek bir derlenmiş ifadede
+birleştirilmiştir ve metin üzerinden tek geçişte aranır (bkz. match_labels).
+"""
+import hashlib
+import json
+import logging
+import os
+import re
+
+import PyPDF2
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+TEXT_CACHE_DIR = os.path.join(settings.BASE_DIR, 'uploads', 'financials', 'text_cache')
+CACHE_FORMAT = 1
+
+# Bir tablonun başlık sayfasından itibaren kapladığı en fazla sayfa sayısı
+STATEMENT_PAGES = 3
+
+# Tablo başlıkları. Denetim raporu metnindeki küçük harfli anmalar eşleşmesin diye yalnızca
+# başlık biçimleri (Baş Harfler Büyük ve TÜMÜ BÜYÜK) aranır.
+STATEMENT_HEADINGS = {
+    'balance_sheet': re.compile(r'Finansal Durum Tablosu|FİNANSAL DURUM TABLOSU|Bilanço|BİLANÇO'),
+    'income_statement': re.compile(
+        r'K[aâ]r veya Zarar(?: ve Diğer Kapsamlı Gelir)? Tablosu|K[AÂ]R VEYA ZARAR|Gelir Tablosu|GELİR TABLOSU'
+    ),
+}
+TABLE_OF_CONTENTS = re.compile(r'İçindekiler|İÇİNDEKİLER')
+
+# Alan -> etiket kalıbı; değer etiketin ardından gelen ilk sayıdır
+LABEL_PATTERNS = {
+    'revenue': r'Hasılat|Satış Gelirleri|Net Satışlar',
+    'ebitda': r'FAVÖK|EBITDA',
+    'net_income': r'Net Kar|Net Dönem Karı|Dönem Net Karı',
+    'total_assets': r'Toplam Varlıklar|Aktif Toplam',
+    'total_liabilities': r'Toplam Yükümlülükler|Toplam Borçlar',
+    'equity': r'Özkaynaklar|Toplam Özkaynaklar',
+    'eps': r'Hisse Başına Kazanç|Pay Başına Kazanç',
+    'pe_ratio': r'F/K|Fiyat/Kazanç',
+}
+LABELS = re.compile(
+    '(?:' + '|'.join(f'(?P<{field}>{pattern})' for field, pattern in LABEL_PATTERNS.items()) + r')[:\s]*(?P<value>[0-9.,]+)'
+)
+
+
+def match_labels(text):
+    """Metindeki her alanın ilk etiketli değeri (ham metin): {alan: değer}. Metin bir kez taranır."""
+    found = {}
+    for match in LABELS.finditer(text):
+        field = next(field for field in LABEL_PATTERNS if match.group(field) is not None)
+        found.setdefault(field, match.group('value'))
+        if len(found) == len(LABEL_PATTERNS):
+            break
+    return found
+
+
+def content_hash(file_path):
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _cache_path(digest):
+    return os.path.join(TEXT_CACHE_DIR, f"{digest}.json")
+
+
+def _read_cache(digest):
+    try:
+        with open(_cache_path(digest), encoding='utf-8') as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return cached if cached.get('format') == CACHE_FORMAT else None
+
+
+def _write_cache(digest, entry):
+    os.makedirs(TEXT_CACHE_DIR, exist_ok=True)
+    path = _cache_path(digest)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump({'format': CACHE_FORMAT, **entry}, f, ensure_ascii=False)
+    os.replace(temp_path, path)
+
+
+def _outline_pages(pdf_reader):
+    # Yer imlerinden tabloların başlangıç sayfaları: {tablo: sayfa}
+    found = {}
+
+    def walk(items):
+        for item in items:
+            if isinstance(item, list):
+                walk(item)
+                continue
+            for statement, heading in STATEMENT_HEADINGS.items():
+                if statement not in found and heading.search(str(item.title)):
+                    try:
+                        found[statement] = pdf_reader.get_destination_page_number(item)
+                    except Exception:
+                        pass
+
+    try:
+        walk(pdf_reader.outline)
+    except Exception as e:
+        logger.debug("PDF yer imleri okunamadı: %s", e)
+    return found
+
+
+def _statement_span(start, starts, page_count):
+    # Tablo, başlık sayfasından sonraki tablonun başlangıcına ya da STATEMENT_PAGES sayfaya kadar sürer
+    following = [page for page in starts if page > start]
+    stop = min([start + STATEMENT_PAGES, page_count, *following])
+    return list(range(start, stop))
+
+
+def read_statement_pages(file_path):
+    """
+    PDF'in gelir tablosu ve bilanço sayfalarının metinleri: {'pages': {sayfa: metin},
+    'statements': {tablo: [sayfalar]}, 'page_count': n}. Tablo bulunamazsa 'statements' boştur ve
+    'pages' tüm sayfaları içerir. Sonuç dosya içeriğinin özetiyle önbelleğe alınır.
+    """
+    digest = content_hash(file_path)
+    cached = _read_cache(digest)
+    if cached is not None:
+        return {
+            'pages': {int(page): text for page, text in cached['pages'].items()},
+            'statements': cached['statements'],
+            'page_count': cached['page_count'],
+        }
+
+    pages, starts = {}, {}
+    with open(file_path, 'rb') as f:
+        pdf_reader = PyPDF2.PdfReader(f)
+        page_count = len(pdf_reader.pages)
+
+        def text_of(page):
+            if page not in pages:
+                pages[page] = pdf_reader.pages[page].extract_text() or ''
+            return pages[page]
+
+        starts = _outline_pages(pdf_reader)
+        if len(starts) < len(STATEMENT_HEADINGS):
+            # Yer iminde bulunamayan tablolar için sayfalar sırayla okunur; iki tablonun başlığı da
+            # bulununca ve kapladıkları sayfalar okununca durulur
+            for page in range(page_count):
+                text = text_of(page)
+                if not TABLE_OF_CONTENTS.search(text):
+                    for statement, heading in STATEMENT_HEADINGS.items():
+                        if statement not in starts and heading.search(text):
+                            starts[statement] = page
+                if len(starts) == len(STATEMENT_HEADINGS) and page >= max(starts.values()) + STATEMENT_PAGES - 1:
+                    break
+
+        statements = {
+            statement: _statement_span(start, starts.values(), page_count) for statement, start in starts.items()
+        }
+        targets = sorted({page for span in statements.values() for page in span}) or range(page_count)
+        for page in targets:
+            text_of(page)
+
+    pages = {page: pages[page] for page in sorted(pages)}
+    if statements:
+        pages = {page: text for page, text in pages.items() if page in set(targets)}
+    entry = {'pages': pages, 'statements': statements, 'page_count': page_count}
+    _write_cache(digest, entry)
+    logger.debug(
+        "%s: %s sayfadan %s sayfa okundu (tablolar: %s)",
+        os.path.basename(file_path), page_count, len(pages), statements or 'bulunamadı',
+    )
+    return entry
+
+
+def statement_text(file_path):
+    """Değerlerin aranacağı metin: tablo sayfalarının (bulunamazsa tüm sayfaların) sırayla birleşimi."""
+    pages = read_statement_pages(file_path)['pages']
+    return ''.join(pages[page] for page in sorted(pages))
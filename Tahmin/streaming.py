@@ -0,0 +1,190 @@
+"""
+Büyük fiyat dosyaları için akışlı (streaming) yükleme ve ayrıştırma.
+
+Yüklenen CSV parçaları geldikçe hem diske yazılır hem de ayrıştırılır: başlık ilk parçada
+doğrulanır (hatalı dosya daha yüklenmeden reddedilir), satırlar BATCH_ROWS'luk partiler
+halinde ingest_price_frame ile veritabanına aktarılır. Bellekte en fazla bir parti tutulur;
+dosya hiçbir zaman tümüyle DataFrame'e okunmaz.
+"""
+import codecs
+import csv
+import io
+import logging
+import os
+
+import pandas as pd
+from django.core.files.uploadedfile import UploadedFile
+from django.core.files.uploadhandler import FileUploadHandler, StopUpload
+
+from .ingestion import standardize_columns, ingest_price_frame
+
+logger = logging.getLogger(__name__)
+
+BATCH_ROWS = 20000
+
+# Raporda saklanacak en fazla hata ayrıntısı (çok büyük dosyalarda bellek sınırlı kalır)
+MAX_ERROR_DETAILS = 1000
+
+
+class StreamingPriceParser:
+    """
+    CSV baytlarını parça parça alıp hisseye aktarır.
+
+        parser = StreamingPriceParser(stock, destination_path)
+        for chunk in chunks:
+            parser.feed(chunk)
+        report = parser.close()
+
+    Rapor, ingest_price_frame raporunun tüm dosya için toplamıdır. Satırların alan içinde satır
+    sonu içermediği varsayılır (Investing.com dışa aktarımlarında olduğu gibi).
+    """
+
+    def __init__(self, stock, destination_path=None, batch_rows=BATCH_ROWS):
+        self.stock = stock
+        self.batch_rows = batch_rows
+        self.destination_path = destination_path
+        self.destination = open(destination_path, 'wb') if destination_path else None
+        self.decoder = codecs.getincrementaldecoder('utf-8-sig')()
+        self.header = None
+        self.columns = None
+        self.pending = ''
+        self.lines = []
+        self.next_row = 2  # Başlık satırı + 1 tabanlı numaralandırma
+        self.bytes_received = 0
+        self.report = {
+            'total_rows': 0,
+            'success_count': 0,
+            'duplicate_count': 0,
+            'error_count': 0,
+            'error_details': [],
+        }
+
+    def feed(self, data):
+        """Bir bayt parçasını işler; başlık geçersizse ValueError fırlatır."""
+        if self.destination is not None:
+            self.destination.write(data)
+        self.bytes_received += len(data)
+
+        text = self.pending + self.decoder.decode(data)
+        lines = text.split('\n')
+        self.pending = lines.pop()
+        self._add_lines(lines)
+
+    def close(self):
+        """Kalan satırları aktarır, dosyayı kapatır ve toplam raporu döndürür."""
+        text = self.pending + self.decoder.decode(b'', final=True)
+        self.pending = ''
+        self._add_lines([text])
+        self._flush()
+        self._close_destination()
+
+        if self.header is None:
+            raise ValueError("Dosya boş.")
+
+        report = self.report
+        total_rows = report['total_rows']
+        report['processed_ratio'] = (
+            (report['success_count'] + report['duplicate_count']) / total_rows * 100 if total_rows else 0
+        )
+        return report
+
+    def abort(self):
+        """Yarım kalan yüklemenin dosyasını siler."""
+        self._close_destination()
+        if self.destination_path and os.path.exists(self.destination_path):
+            os.remove(self.destination_path)
+
+    def _close_destination(self):
+        if self.destination is not None:
+            self.destination.close()
+            self.destination = None
+
+    def _add_lines(self, lines):
+        for line in lines:
+            line = line.rstrip('\r')
+            if not line.strip():
+                continue
+            if self.header is None:
+                self.header = line
+                self.columns = standardize_columns(next(csv.reader([line])))
+                continue
+            self.lines.append(line)
+            if len(self.lines) >= self.batch_rows:
+                self._flush()
+
+    def _flush(self):
+        if not self.lines:
+            return
+
+        text = '\n'.join([self.header, *self.lines])
+        self.lines = []
+        df = pd.read_csv(io.StringIO(text), dtype=str)
+        df.columns = self.columns
+
+        batch = ingest_price_frame(self.stock, df, first_row=self.next_row)
+        self.next_row += batch['total_rows']
+
+        for key in ('total_rows', 'success_count', 'duplicate_count', 'error_count'):
+            self.report[key] += batch[key]
+        room = MAX_ERROR_DETAILS - len(self.report['error_details'])
+        self.report['error_details'].extend(batch['error_details'][:max(room, 0)])
+        logger.debug("%s: %s satır aktarıldı", self.stock.symbol, self.report['total_rows'])
+
+
+class StreamedPriceFile(UploadedFile):
+    """Akışlı yüklemenin sonucu: diske yazılan dosyanın yolu ve aktarım raporu."""
+
+    def __init__(self, name, content_type, size, charset, file_path, report):
+        super().__init__(file=None, name=name, content_type=content_type, size=size, charset=charset)
+        self.file_path = file_path
+        self.report = report
+
+
+class StreamingPriceUploadHandler(FileUploadHandler):
+    """
+    CSV yüklemelerini istek gövdesi okunurken ayrıştıran yükleme işleyicisi. CSV olmayan
+    dosyalar Django'nun varsayılan işleyicilerine bırakılır. Başlık hatalıysa yükleme durdurulur
+    ve hata self.error içinde saklanır.
+    """
+
+    def __init__(self, request, stock, destination_path):
+        super().__init__(request)
+        self.stock = stock
+        self.destination_path = destination_path
+        self.parser = None
+        self.error = None
+
+    def new_file(self, field_name, file_name, *args, **kwargs):
+        super().new_file(field_name, file_name, *args, **kwargs)
+        if file_name.lower().endswith('.csv'):
+            os.makedirs(os.path.dirname(self.destination_path), exist_ok=True)
+            self.parser = StreamingPriceParser(self.stock, self.destination_path)
+
+    def receive_data_chunk(self, raw_data, start):
+        if self.parser is None:
+            return raw_data
+        try:
+            self.parser.feed(raw_data)
+        except ValueError as e:
+            self._fail(e)
+        return None
+
+    def file_complete(self, file_size):
+        if self.parser is None:
+            return None
+        try:
+            report = self.parser.close()
+        except ValueError as e:
+            self._fail(e)
+        return StreamedPriceFile(
+            self.file_name, self.content_type, file_size, self.charset, self.destination_path, report,
+        )
+
+    def upload_interrupted(self):
+        if self.parser is not None:
+            self.parser.abort()
+
+    def _fail(self, error):
+        self.error = str(error)
+        self.parser.abort()
+        raise StopUpload(connection_reset=False)
@@ -0,0 +1,241 @@
+"""
+Arka plan iş kuyruğu işleyicileri.
+
+Her işleyici ilk argüman olarak JobContext alır, parametrelerini anahtar kelime argümanı
+olarak alır ve JSON'a çevrilebilir bir sonuç döndürür. Hata durumunda istisna fırlatılır;
+iş 'failed' olarak işaretlenir.
+"""
+import json
+import logging
+import os
+
+from django.core.files.storage import default_storage
+
+from .archive import archive_path, export_archive, import_archive
+from .backtest import run_backtest
+from .batch import STOCK_DATA_DIR, find_stock_folders, process_all_stock_folders
+from .financials import import_financial_files
+from .indicators import rebuild_stock_analysis, update_stock_analysis
+from .ingestion import ingest_stock_file, format_report_message
+from .jobs import register_job
+from .market_matrix import update_market_matrix
+from .macro_import import import_macro_frame, import_interest_frame, import_interest_rates, import_exchange_frame
+from .models import Stock, StockFile, StockPrice
+from .prediction.feature_store import refresh_feature_store
+from .prediction.service import predict_for_stock
+from .prediction.tuning import tune_stocks
+from .prediction.universe import predict_universe
+from .schemas import read_table
+
+logger = logging.getLogger(__name__)
+
+# Sonuçta saklanacak en fazla hata ayrıntısı
+MAX_ERROR_DETAILS = 50
+
+
+def _refresh_market_matrix():
+    # Matris güncellenemese de içe aktarma başarılı sayılır; bir sonraki güncellemede eşitlenir
+    try:
+        update_market_matrix()
+    except Exception:
+        logger.exception("Piyasa matrisi güncellenemedi")
+
+
+@register_job('process_stock_file')
+def process_stock_file_job(ctx, file_id):
+    """Yüklenmiş tek bir hisse fiyat dosyasını işler."""
+    stock_file = StockFile.objects.select_related('stock').get(id=file_id)
+    if not os.path.exists(stock_file.file_path):
+        raise ValueError('Dosya bulunamadı.')
+
+    ctx.progress(10, f"{stock_file.filename} işleniyor")
+    report = ingest_stock_file(stock_file)
+    _refresh_market_matrix()
+
+    return {
+        'message': format_report_message(report),
+        'details': {
+            'total_rows': report['total_rows'],
+            'success_count': report['success_count'],
+            'duplicate_count': report['duplicate_count'],
+            'error_count': report['error_count'],
+            'processed_ratio': report['processed_ratio']
+        },
+    }
+
+
+@register_job('process_all_files')
+def process_all_files_job(ctx, base_dir=STOCK_DATA_DIR, max_workers=None):
+    """Tüm hisse klasörlerini paralel olarak işler; her hisse bittiğinde ilerleme bildirir."""
+    total = len(find_stock_folders(base_dir))
+    if not total:
+        raise ValueError('İşlenecek dosya bulunamadı!')
+
+    results = []
+    for result in process_all_stock_folders(base_dir, max_workers=max_workers):
+        results.append(result)
+        ctx.progress(len(results) * 100 // total, f"{result['stock']} işlendi ({len(results)}/{total})")
+
+    _refresh_market_matrix()
+    return {'results': results}
+
+
+@register_job('update_market_matrix')
+def update_market_matrix_job(ctx, full=False):
+    """Bellek eşlemeli piyasa matrisini fiyat tablosuyla eşitler."""
+    return update_market_matrix(full=full)
+
+
+@register_job('update_feature_store')
+def update_feature_store_job(ctx, stock_ids=None, full=False):
+    """Tahmin modellerinin özellik deposunu fiyat, analiz ve makro tablolarıyla eşitler."""
+    return refresh_feature_store(stock_ids, full=full, progress=ctx.progress)
+
+
+@register_job('calculate_analysis')
+def calculate_analysis_job(ctx, stock_id, mode='incremental'):
+    """Hissenin teknik analizini artımlı olarak ya da (mode='full') baştan hesaplar."""
+    stock = Stock.objects.get(id=stock_id)
+    if not StockPrice.objects.filter(stock=stock).exists():
+        raise ValueError(f"{stock.name} için fiyat verisi bulunamadı. Önce fiyat verilerini yükleyin.")
+
+    ctx.progress(10, f"{stock.symbol} analizi hesaplanıyor")
+    if mode == 'full':
+        saved_count = rebuild_stock_analysis(stock)
+    else:
+        saved_count = update_stock_analysis(stock)
+
+    return {
+        'saved_count': saved_count,
+        'message': f"{stock.name} için tüm teknik göstergeler (hareketli ortalamalar, RSI, MACD, Bollinger vb.) başarıyla hesaplandı.",
+    }
+
+
+@register_job('run_prediction')
+def run_prediction_job(ctx, stock_id, model_type='hybrid', time_horizon=12):
+    """Hisse için modeli eğitir (ya da önbellekten alır) ve tahmin üretir."""
+    stock = Stock.objects.get(id=stock_id)
+    ctx.progress(10, f"{stock.symbol} için {model_type} modeli hazırlanıyor")
+    return predict_for_stock(stock, model_type=model_type, time_horizon=time_horizon)
+
+
+@register_job('predict_universe')
+def predict_universe_job(ctx, model_type='xgboost', time_horizon=12):
+    """Tüm aktif hisseler için toplu tahmin üretir."""
+    return predict_universe(model_type=model_type, time_horizon=time_horizon, progress=ctx.progress)
+
+
+@register_job('tune_models')
+def tune_models_job(ctx, symbols=None, model_types=('xgboost',), time_horizons=(12,), n_trials=30,
+                    max_workers=None, max_minutes=None):
+    """Hisse bazında hiperparametre araması yapar; denemeler kaydedilir, yarıda kalan arama devam ettirilebilir."""
+    return tune_stocks(symbols, model_types, time_horizons, n_trials=n_trials, max_workers=max_workers,
+                       max_minutes=max_minutes, progress=ctx.progress)
+
+
+@register_job('export_archive')
+def export_archive_job(ctx, datasets=None):
+    """Veri kümelerini yeni bir Parquet arşivine yazar."""
+    manifest = export_archive(datasets=datasets, progress=ctx.progress)
+    return {
+        'name': os.path.basename(manifest['path']),
+        'datasets': {name: info['rows'] for name, info in manifest['datasets'].items()},
+    }
+
+
+@register_job('import_archive')
+def import_archive_job(ctx, name, datasets=None, replace=False):
+    """ARCHIVE_DIR altındaki Parquet arşivini veritabanına yükler."""
+    return import_archive(archive_path(name), datasets, replace=replace, progress=ctx.progress)
+
+
+@register_job('run_backtest')
+def run_backtest_job(ctx, strategy, grid=None, symbols=None, start=None, end=None, cost=None, max_workers=None):
+    """Stratejinin parametre taramasını ve walk-forward doğrulamasını çalıştırır."""
+    kwargs = {'cost': cost} if cost is not None else {}
+    return run_backtest(
+        strategy, grid, symbols, start, end, max_workers=max_workers, progress=ctx.progress, **kwargs,
+    )
+
+
+@register_job('import_company_financial')
+def import_company_financial_job(ctx, stock_id, year, period, files, analyze_data=False):
+    """Kaydedilmiş finansal tablo dosyalarından veri çıkarır ve CompanyFinancial kaydını yazar."""
+    stock = Stock.objects.get(id=stock_id)
+    ctx.progress(10, f"{len(files)} dosyadan veri çıkarılıyor")
+
+    financial, created, warnings = import_financial_files(
+        stock, year, period, files, analyze_data=analyze_data,
+        progress=lambda percent, message: ctx.progress(10 + percent * 85 // 100, message),
+    )
+
+    action = "oluşturuldu" if created else "güncellendi"
+    return {
+        'financial_id': financial.id,
+        'created': created,
+        'warnings': warnings,
+        'message': f"{stock.symbol} hissesi için {year} {period} dönemi finansal verisi başarıyla {action}.",
+    }
+
+
+def _delete_stored_file(storage_path):
+    if default_storage.exists(storage_path):
+        default_storage.delete(storage_path)
+
+
+def _import_stored_file(ctx, storage_path, importer, filename=None, **kwargs):
+    # Geçici olarak kaydedilmiş yüklemeyi okur ve içe aktarır. Dosya başarıda ya da son denemede
+    # silinir; iş yeniden denenecekse sonraki deneme için saklanır.
+    try:
+        df = read_table(default_storage.path(storage_path), filename)
+        report = importer(df, **kwargs)
+    except Exception:
+        if ctx.last_attempt:
+            _delete_stored_file(storage_path)
+        raise
+    _delete_stored_file(storage_path)
+
+    report['error_details'] = report['error_details'][:MAX_ERROR_DETAILS]
+    return report
+
+
+@register_job('import_macro_file')
+def import_macro_file_job(ctx, storage_path, filename=None):
+    """Makroekonomik veri dosyasını içe aktarır."""
+    ctx.progress(10, "Makroekonomik veriler içe aktarılıyor")
+    return _import_stored_file(ctx, storage_path, import_macro_frame, filename)
+
+
+@register_job('import_interest_file')
+def import_interest_file_job(ctx, storage_path, filename=None):
+    """Birleşik faiz oranları dosyasını içe aktarır."""
+    ctx.progress(10, "Faiz verileri içe aktarılıyor")
+    return _import_stored_file(ctx, storage_path, import_interest_frame, filename)
+
+
+@register_job('import_interest_rates')
+def import_interest_rates_job(ctx, policy_rate_data=None, storage_path=None, filename=None):
+    """Politika faizi (JSON) ve tahvil faizi dosyasını birleştirerek içe aktarır."""
+    ctx.progress(10, "Faiz verileri birleştiriliyor")
+    if isinstance(policy_rate_data, str):
+        policy_rate_data = json.loads(policy_rate_data) if policy_rate_data else None
+
+    if not storage_path:
+        report = import_interest_rates(policy_rate_data)
+    else:
+        report = _import_stored_file(
+            ctx,
+            storage_path,
+            lambda df: import_interest_rates(policy_rate_data, df),
+            filename,
+        )
+
+    report['error_details'] = report['error_details'][:MAX_ERROR_DETAILS]
+    return report
+
+
+@register_job('import_exchange_file')
+def import_exchange_file_job(ctx, storage_path, currency, filename=None):
+    """USD/TRY veya EUR/TRY döviz kuru dosyasını içe aktarır."""
+    ctx.progress(10, f"{currency}/TRY döviz kuru verileri içe aktarılıyor")
+    return _import_stored_file(ctx, storage_path, import_exchange_frame, filename, currency=currency)
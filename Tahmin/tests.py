@@ -1,3 +1,278 @@
-from django.test import TestCase
+import math
+from datetime import date, timedelta
+from decimal import Decimal
 
-# Create your tests here.
+import numpy as np
+import pandas as pd
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from .financials import convert_to_number
+from .indicators import analysis_fields, rebuild_stock_analysis, update_stock_analysis
+from .models import ExchangeRate, MacroeconomicData, Stock, StockAnalysis, StockPrice
+from .parsing import parse_dates, parse_number, parse_numbers, to_number, to_percent, to_volume
+from .upsert import supports_upsert, upsert_frame
+
+
+def random_walk_prices(stock, start, days, seed=0):
+    """Rastgele yürüyüşle üretilmiş, kaydedilmemiş iş günü fiyatları."""
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range(start, periods=days)
+    closes = 50 * np.exp(np.cumsum(rng.normal(0.0003, 0.02, days)))
+    prices = []
+    for day, close, spread, volume in zip(dates, closes, rng.uniform(0, 0.03, days), rng.integers(1_000, 100_000, days)):
+        prices.append(StockPrice(
+            stock=stock, date=day.date(), opening_price=Decimal(f"{close * (1 - spread / 2):.2f}"),
+            highest_price=Decimal(f"{close * (1 + spread):.2f}"), lowest_price=Decimal(f"{close * (1 - spread):.2f}"),
+            closing_price=Decimal(f"{close:.2f}"), volume=int(volume), daily_change=Decimal('0'),
+        ))
+    return prices
+
+
+class ParseNumbersTests(SimpleTestCase):
+    def test_turkish_thousands_and_decimal_separators(self):
+        values, invalid = parse_numbers(['1.234,56', '-1.234,56', '44,98', '44.98', '1 234,5'])
+        np.testing.assert_array_equal(values, [1234.56, -1234.56, 44.98, 44.98, 1234.5])
+        self.assertFalse(invalid.any())
+
+    def test_percent_sign_before_or_after(self):
+        values, invalid = parse_numbers(['%12,5', '12,5%', '-0,45%'], 'percent')
+        np.testing.assert_array_equal(values, [12.5, 12.5, -0.45])
+        self.assertFalse(invalid.any())
+
+    def test_volume_suffixes(self):
+        np.testing.assert_array_equal(to_volume(['36,85M', '795,44K', '1,2B', '150']), [36.85e6, 795.44e3, 1.2e9, 150.0])
+
+    def test_empty_cells_are_nan_but_not_invalid(self):
+        values, invalid = parse_numbers(['', '   ', None, math.nan])
+        self.assertTrue(np.isnan(values).all())
+        self.assertFalse(invalid.any())
+
+    def test_garbage_cells_are_nan_and_invalid(self):
+        values, invalid = parse_numbers(['abc', '1,2,3', '--5', '12x', '1.234,56'])
+        self.assertTrue(np.isnan(values[:4]).all())
+        self.assertEqual(values[4], 1234.56)
+        np.testing.assert_array_equal(invalid, [True, True, True, True, False])
+
+    def test_long_and_exponent_cells_fall_back_to_scalar_parser(self):
+        long_cell = '0' * 40 + '1,5'
+        values, invalid = parse_numbers([long_cell, '1e3', '12,5'])
+        np.testing.assert_array_equal(values, [1.5, 1000.0, 12.5])
+        self.assertFalse(invalid.any())
+
+    def test_numeric_columns_pass_through(self):
+        np.testing.assert_array_equal(to_number(pd.Series([1, 2.5])), [1.0, 2.5])
+        np.testing.assert_array_equal(to_percent(pd.Series([0.45])), [0.45])
+
+    def test_matches_per_cell_parsers(self):
+        cells = [
+            '1.234,56', '44,98', '44.98', '0,01', '123.456.789,12', '7', '1 234,5', '99,999',
+            '-1.234,56', '%12,5', '', 'abc', '1,2,3',
+        ]
+        for kind in ('number', 'percent'):
+            values, _ = parse_numbers(cells, kind)
+            np.testing.assert_array_equal(values, [parse_number(cell, kind) for cell in cells])
+
+        # Eski hücre hücre dönüştürücü işaretleri ve geçersiz hücreleri farklı ele alır (0 döndürür);
+        # pozitif, geçerli değerlerde sonuçlar birebir aynı olmalı
+        valid = cells[:8]
+        np.testing.assert_array_equal(parse_numbers(valid)[0], [convert_to_number(cell) for cell in valid])
+
+
+class ParseDatesTests(SimpleTestCase):
+    def test_day_first_dates(self):
+        dates = parse_dates(['02.01.2020', '31.12.2019', '01/02/2021'])
+        self.assertEqual(list(dates.dt.date.astype(str)), ['2020-01-02', '2019-12-31', '2021-02-01'])
+
+    def test_iso_dates_are_not_read_day_first(self):
+        dates = parse_dates(['2020-01-02', '2020-01-03'])
+        self.assertEqual(list(dates.dt.date.astype(str)), ['2020-01-02', '2020-01-03'])
+
+    def test_mixed_formats_and_invalid_cells(self):
+        dates = parse_dates(['02.01.2020', '2020-01-03', 'tarih yok', None])
+        self.assertEqual(list(dates[:2].dt.date.astype(str)), ['2020-01-02', '2020-01-03'])
+        self.assertTrue(dates[2:].isna().all())
+
+
+class IncrementalAnalysisTests(TestCase):
+    # Artımlı güncelleme yalnızca son YEARLY_MA_WINDOW aylık geçmişi okur; tam geçmiş bundan uzun olmalı
+    DAYS = 1300
+    APPENDED = 15
+
+    def setUp(self):
+        self.stock = Stock.objects.create(symbol='TEST', name='Test')
+        self.prices = random_walk_prices(self.stock, '2018-01-01', self.DAYS + self.APPENDED)
+        benchmark = random_walk_prices(self.stock, '2018-01-01', self.DAYS + self.APPENDED, seed=1)
+        MacroeconomicData.objects.bulk_create(
+            MacroeconomicData(date=price.date, bist100_close=price.closing_price * 100) for price in benchmark
+        )
+
+    def analysis_frame(self):
+        rows = StockAnalysis.objects.filter(stock=self.stock).order_by('date').values('date', *analysis_fields())
+        return pd.DataFrame.from_records(list(rows)).set_index('date').astype(float)
+
+    def assert_matches_full_rebuild(self):
+        incremental = self.analysis_frame()
+        rebuild_stock_analysis(self.stock)
+        full = self.analysis_frame()
+
+        self.assertEqual(list(incremental.index), list(full.index))
+        for field in analysis_fields():
+            with self.subTest(field=field):
+                np.testing.assert_allclose(incremental[field], full[field], rtol=1e-7, atol=1e-9, equal_nan=True)
+
+    def test_appended_days_match_full_rebuild(self):
+        StockPrice.objects.bulk_create(self.prices[:self.DAYS])
+        rebuild_stock_analysis(self.stock)
+
+        StockPrice.objects.bulk_create(self.prices[self.DAYS:])
+        self.assertEqual(update_stock_analysis(self.stock), self.APPENDED)
+        self.assertEqual(StockAnalysis.objects.filter(stock=self.stock).count(), self.DAYS + self.APPENDED)
+        self.assert_matches_full_rebuild()
+
+    def test_repeated_daily_appends_match_full_rebuild(self):
+        StockPrice.objects.bulk_create(self.prices[:self.DAYS])
+        rebuild_stock_analysis(self.stock)
+
+        for price in self.prices[self.DAYS:]:
+            price.save()
+            self.assertEqual(update_stock_analysis(self.stock), 1)
+        self.assert_matches_full_rebuild()
+
+    def test_no_new_prices_adds_nothing(self):
+        StockPrice.objects.bulk_create(self.prices[:self.DAYS])
+        rebuild_stock_analysis(self.stock)
+        self.assertEqual(update_stock_analysis(self.stock), 0)
+
+    def test_backfilled_history_falls_back_to_full_rebuild(self):
+        # Analiz edilmiş aralığın ortasındaki bir gün sonradan eklenir: sayılar tutmaz
+        missing = self.prices[500]
+        StockPrice.objects.bulk_create(self.prices[:500] + self.prices[501:self.DAYS])
+        rebuild_stock_analysis(self.stock)
+
+        missing.save()
+        StockPrice.objects.bulk_create(self.prices[self.DAYS:])
+        self.assertEqual(update_stock_analysis(self.stock), self.DAYS + self.APPENDED)
+        self.assertTrue(StockAnalysis.objects.filter(stock=self.stock, date=missing.date).exists())
+        self.assert_matches_full_rebuild()
+
+    def test_analysis_without_carried_values_falls_back_to_full_rebuild(self):
+        StockPrice.objects.bulk_create(self.prices[:self.DAYS])
+        rebuild_stock_analysis(self.stock)
+        StockAnalysis.objects.filter(stock=self.stock).update(obv=None)
+
+        StockPrice.objects.bulk_create(self.prices[self.DAYS:])
+        self.assertEqual(update_stock_analysis(self.stock), self.DAYS + self.APPENDED)
+        self.assert_matches_full_rebuild()
+
+
+class UpsertFrameTests(TestCase):
+    RATE_KEYS = ['date', 'currency']
+    RATE_FIELDS = ['open_price', 'high_price', 'low_price', 'close_price', 'volume', 'change_percent']
+
+    def rate(self, day, close, **values):
+        return {
+            'date': day, 'currency': 'USD', 'open_price': close, 'high_price': close, 'low_price': close,
+            'close_price': close, **values,
+        }
+
+    def upsert_rates(self, rows):
+        return upsert_frame(ExchangeRate, pd.DataFrame(rows), self.RATE_KEYS, self.RATE_FIELDS)
+
+    def test_inserts_new_and_updates_existing_rows(self):
+        self.upsert_rates([self.rate(date(2024, 1, 2), 30.0)])
+        report = self.upsert_rates([self.rate(date(2024, 1, 2), 31.5), self.rate(date(2024, 1, 3), 32.0)])
+
+        self.assertEqual((report['created'], report['updated'], report['error_details']), (1, 1, []))
+        self.assertEqual(ExchangeRate.objects.get(date=date(2024, 1, 2)).close_price, Decimal('31.5'))
+        self.assertEqual(ExchangeRate.objects.count(), 2)
+
+    def test_empty_cell_keeps_existing_value(self):
+        self.upsert_rates([self.rate(date(2024, 1, 2), 30.0, volume='1,2K', change_percent=0.5)])
+        self.upsert_rates([self.rate(date(2024, 1, 2), 31.0, volume=None, change_percent=math.nan)])
+
+        rate = ExchangeRate.objects.get()
+        self.assertEqual(rate.close_price, Decimal('31'))
+        self.assertEqual((rate.volume, rate.change_percent), ('1,2K', Decimal('0.5')))
+
+    def test_duplicate_keys_in_frame_are_merged(self):
+        report = self.upsert_rates([
+            self.rate(date(2024, 1, 2), 30.0, volume='1K'),
+            {'date': date(2024, 1, 2), 'currency': 'USD', 'close_price': 30.5, 'change_percent': 1.25},
+        ])
+
+        self.assertEqual(report['created'], 1)
+        rate = ExchangeRate.objects.get()
+        self.assertEqual((rate.close_price, rate.open_price), (Decimal('30.5'), Decimal('30')))
+        self.assertEqual((rate.volume, rate.change_percent), ('1K', Decimal('1.25')))
+
+    def test_invalid_rows_are_reported_without_dropping_the_batch(self):
+        report = self.upsert_rates([
+            self.rate(date(2024, 1, 2), 30.0),
+            self.rate(date(2024, 1, 3), 30.0, change_percent=123456.0),  # Değişim (%) 4 tam basamağa sığmaz
+            self.rate(date(2024, 1, 4), 'abc'),
+            self.rate(date(2024, 1, 5), 30.0, volume='x' * 21),
+            self.rate(None, 30.0),
+            self.rate(date(2024, 1, 8), 30.0),
+        ])
+
+        self.assertEqual(report['created'], 2)
+        self.assertEqual(len(report['error_details']), 4)
+        for row, message in zip((3, 4, 5, 6), report['error_details']):
+            self.assertTrue(message.startswith(f"Satır {row}: "), message)
+        self.assertEqual(
+            sorted(ExchangeRate.objects.values_list('date', flat=True)), [date(2024, 1, 2), date(2024, 1, 8)],
+        )
+
+    def test_updated_rows_advance_auto_now(self):
+        self.upsert_rates([self.rate(date(2024, 1, 2), 30.0), self.rate(date(2024, 1, 3), 30.0)])
+        stale = timezone.now() - timedelta(days=1)
+        ExchangeRate.objects.update(updated_at=stale)
+
+        self.upsert_rates([self.rate(date(2024, 1, 2), 31.0)])
+        self.assertGreater(ExchangeRate.objects.get(date=date(2024, 1, 2)).updated_at, stale)
+        self.assertEqual(ExchangeRate.objects.get(date=date(2024, 1, 3)).updated_at, stale)
+
+    def test_unique_keys_are_written_with_on_conflict(self):
+        self.assertTrue(supports_upsert(ExchangeRate, self.RATE_KEYS))
+        self.upsert_rates([self.rate(date(2024, 1, 2), 30.0), self.rate(date(2024, 1, 3), 30.0)])
+        ids = dict(ExchangeRate.objects.values_list('date', 'id'))
+
+        with CaptureQueriesContext(connection) as queries:
+            report = self.upsert_rates([self.rate(date(2024, 1, 2), 31.0), self.rate(date(2024, 1, 3), 32.0)])
+        self.assertTrue(any('ON CONFLICT' in query['sql'] for query in queries))
+        self.assertEqual(report['updated'], 2)
+        self.assertEqual(dict(ExchangeRate.objects.values_list('date', 'id')), ids)
+        self.assertEqual(
+            dict(ExchangeRate.objects.values_list('date', 'close_price')),
+            {date(2024, 1, 2): Decimal('31'), date(2024, 1, 3): Decimal('32')},
+        )
+
+    def test_non_unique_keys_are_written_with_bulk_update(self):
+        self.assertFalse(supports_upsert(MacroeconomicData, ['date']))
+        # Benzersiz olmayan anahtarda eşleşen kayıtların tamamı güncellenir
+        MacroeconomicData.objects.create(date=date(2024, 1, 31), tufe=Decimal('2.5'))
+        MacroeconomicData.objects.create(date=date(2024, 1, 31), tufe=Decimal('2.5'))
+        stale = timezone.now() - timedelta(days=1)
+        MacroeconomicData.objects.update(updated_at=stale)
+
+        with CaptureQueriesContext(connection) as queries:
+            report = upsert_frame(
+                MacroeconomicData,
+                pd.DataFrame([
+                    {'date': date(2024, 1, 31), 'tufe': None, 'policy_rate': 45.0},
+                    {'date': date(2024, 2, 29), 'tufe': 4.53, 'policy_rate': 45.0},
+                ]),
+                ['date'], ['tufe', 'policy_rate'],
+            )
+        self.assertTrue(any(query['sql'].startswith('UPDATE') for query in queries))
+        self.assertFalse(any('ON CONFLICT' in query['sql'] for query in queries))
+
+        self.assertEqual((report['created'], report['updated']), (1, 1))
+        january = MacroeconomicData.objects.filter(date=date(2024, 1, 31))
+        self.assertEqual(
+            list(january.values_list('tufe', 'policy_rate')), [(Decimal('2.5'), Decimal('45'))] * 2,
+        )
+        self.assertTrue(all(updated_at > stale for updated_at in january.values_list('updated_at', flat=True)))
@@ -0,0 +1,180 @@
+"""
+Tablo (DataFrame) bazında toplu ekleme/güncelleme (upsert) motoru.
+
+Gelen satırlar anahtar alanlarına göre tek seferde eşleştirilir: tablodaki karşılıkları anahtar
+değerleriyle IN sorgularında parça parça (satır başına değil) okunur, yeni anahtarlar bulk_create
+ile eklenir, mevcut kayıtlarda yalnızca dolu gelen alanlar bulk_update ile güncellenir; boş hücre
+mevcut değeri silmez. Değerler yazılmadan önce alan tanımlarına göre dönüştürülüp doğrulanır, böylece
+kaydedilemeyecek bir satır tüm partiyi düşürmez: hatalı satırlar raporlanır, diğerleri yazılır.
+"""
+import logging
+from decimal import Decimal, InvalidOperation
+
+import pandas as pd
+from django.core.exceptions import ValidationError
+from django.db import models, transaction
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+BULK_BATCH_SIZE = 1000
+
+# bulk_update her parti için CASE WHEN ifadeleri üretir; büyük partilerde sorgu maliyeti karesel artar
+UPDATE_BATCH_SIZE = 100
+
+# Anahtar değerleriyle yapılan IN sorgularındaki en fazla değer sayısı
+LOOKUP_BATCH_SIZE = 500
+
+
+def _row_label(index):
+    # Başlık satırı + 1 tabanlı numaralandırma (Excel/CSV satır numarası)
+    return f"Satır {index + 2}"
+
+
+def clean_value(field, value):
+    """
+    Değeri alanın Python tipine çevirir (boş hücreler None olur). Veritabanına yazılamayacak
+    değerlerde (geçersiz biçim, DecimalField basamak sınırı, CharField uzunluğu) ValueError fırlatır.
+    """
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return None
+    if hasattr(value, 'item') and not isinstance(value, pd.Timestamp):
+        value = value.item()  # NumPy skalerleri
+    try:
+        value = field.to_python(value)
+    except ValidationError:
+        raise ValueError(f"{field.verbose_name}: geçersiz değer ({value})")
+
+    if isinstance(field, models.DecimalField):
+        try:
+            value = value.quantize(Decimal(1).scaleb(-field.decimal_places))
+        except InvalidOperation:
+            raise ValueError(f"{field.verbose_name}: geçersiz değer ({value})")
+        if not value.is_finite() or (value and value.adjusted() >= field.max_digits - field.decimal_places):
+            raise ValueError(f"{field.verbose_name}: {value} alan sınırını aşıyor")
+    elif isinstance(field, models.CharField) and field.max_length and len(value) > field.max_length:
+        raise ValueError(f"{field.verbose_name}: en fazla {field.max_length} karakter olabilir")
+    return value
+
+
+def supports_upsert(model, keys):
+    """Anahtar alanlarda bir benzersiz kısıt var mı (ON CONFLICT için)."""
+    if any(set(fields) == set(keys) for fields in model._meta.unique_together):
+        return True
+    if len(keys) == 1 and model._meta.get_field(keys[0]).unique:
+        return True
+    return any(
+        isinstance(constraint, models.UniqueConstraint) and set(constraint.fields) == set(keys)
+        for constraint in model._meta.constraints
+    )
+
+
+def _clean_rows(model, frame, keys, fields, label):
+    # {anahtar: {alan: değer}} ve hata listesi; aynı anahtar tekrar ederse sonraki dolu değerler geçerlidir
+    key_fields = [model._meta.get_field(name) for name in keys]
+    value_fields = [model._meta.get_field(name) for name in fields]
+    rows, error_details = {}, []
+
+    for index, *values in frame.reindex(columns=[*keys, *fields]).itertuples():
+        try:
+            key = tuple(clean_value(field, value) for field, value in zip(key_fields, values))
+            missing = [field.verbose_name for field, value in zip(key_fields, key) if value is None]
+            if missing:
+                raise ValueError(f"{', '.join(missing)} alanı eksik")
+            cleaned = {
+                field.name: clean_value(field, value) for field, value in zip(value_fields, values[len(keys):])
+            }
+        except ValueError as e:
+            error_details.append(f"{label(index)}: {e}")
+            continue
+
+        merged = rows.setdefault(key, dict.fromkeys(fields))
+        merged.update({name: value for name, value in cleaned.items() if value is not None})
+
+    return rows, error_details
+
+
+def _existing(model, keys, row_keys):
+    # Tablodaki eşleşen kayıtlar: {anahtar: [nesneler]}. En çok farklı değeri olan anahtar alanı
+    # IN sorgusuyla parça parça okunur, diğer anahtar alanlarının her değer birleşimi için bir grup.
+    if not row_keys:
+        return {}
+    position = max(range(len(keys)), key=lambda index: len({key[index] for key in row_keys}))
+    lookup, others = keys[position], [name for index, name in enumerate(keys) if index != position]
+    groups = {}
+    for key in row_keys:
+        groups.setdefault(key[:position] + key[position + 1:], []).append(key[position])
+
+    existing = {}
+    for other_values, values in groups.items():
+        for start in range(0, len(values), LOOKUP_BATCH_SIZE):
+            queryset = model.objects.filter(
+                **dict(zip(others, other_values)), **{f"{lookup}__in": values[start:start + LOOKUP_BATCH_SIZE]},
+            )
+            for obj in queryset:
+                existing.setdefault(tuple(getattr(obj, name) for name in keys), []).append(obj)
+    return existing
+
+
+def _write_updates(model, keys, objects, fields):
+    if supports_upsert(model, keys):
+        # Anahtarda benzersiz kısıt varsa birleştirilmiş satırlar INSERT ... ON CONFLICT DO UPDATE ile
+        # yazılır; birincil anahtar boşaltılır ki çakışma anahtar alanlarında yakalansın
+        for obj in objects:
+            obj.pk = None
+        model.objects.bulk_create(
+            objects, batch_size=BULK_BATCH_SIZE, update_conflicts=True, unique_fields=keys, update_fields=fields,
+        )
+    else:
+        model.objects.bulk_update(objects, fields, batch_size=UPDATE_BATCH_SIZE)
+
+
+def upsert_frame(model, frame, keys, fields, defaults=None, label=None):
+    """
+    frame satırlarını model tablosuna yazar. keys satırı tanımlayan alanlar, fields yazılacak
+    alanlardır; sütun adları alan adlarıyla aynıdır, frame'de olmayan sütunlar boş sayılır.
+
+    Anahtarı tabloda bulunmayan satırlar eklenir (boş alanlar defaults'taki değerle doldurulur).
+    Bulunanlarda yalnızca dolu alanlar güncellenir; anahtar benzersiz değilse eşleşen kayıtların
+    tamamı güncellenir. label(index) hatalı satırların raporda nasıl anılacağını belirler.
+    {'created', 'updated', 'error_details'} döndürür.
+    """
+    label = label or _row_label
+    defaults = defaults or {}
+    rows, error_details = _clean_rows(model, frame, keys, fields, label)
+    existing = _existing(model, keys, list(rows))
+
+    now = timezone.now()
+    auto_now = [field.name for field in model._meta.concrete_fields if getattr(field, 'auto_now', False)]
+    to_create, to_update, changed = [], [], set()
+    updated = 0
+
+    for key, values in rows.items():
+        if key not in existing:
+            to_create.append(model(
+                **dict(zip(keys, key)),
+                **{name: value if value is not None else defaults.get(name) for name, value in values.items()},
+            ))
+            continue
+
+        filled = {name: value for name, value in values.items() if value is not None}
+        for obj in existing[key]:
+            for name, value in filled.items():
+                setattr(obj, name, value)
+            # bulk_update auto_now alanlarını kendisi güncellemez (sütunsal önbellek parmak izi)
+            for name in auto_now:
+                setattr(obj, name, now)
+            to_update.append(obj)
+        changed.update(filled)
+        updated += 1
+
+    with transaction.atomic():
+        model.objects.bulk_create(to_create, batch_size=BULK_BATCH_SIZE)
+        if to_update and changed:
+            _write_updates(model, keys, to_update, [*changed, *auto_now])
+
+    logger.debug(
+        "%s: %s yeni, %s güncellenen, %s hatalı satır",
+        model.__name__, len(to_create), updated, len(error_details),
+    )
+    return {'created': len(to_create), 'updated': updated, 'error_details': error_details}
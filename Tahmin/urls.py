@@ -39,11 +39,13 @@ urlpatterns = [
     path('stocks/<int:stock_id>/', views.stock_detail, name='stock_detail'),
     path('stocks/<int:stock_id>/calculate-analysis/', views.calculate_analysis, name='calculate_analysis'),
     path('stocks/<int:stock_id>/view-analysis/', views.view_stock_analysis, name='view_stock_analysis'),
+    path('stocks/<int:stock_id>/bars/', views.stock_bars, name='stock_bars'),
     
     # Tahmin sayfası
     path('stocks/<int:stock_id>/prediction/', views.start_prediction, name='start_prediction'),
     path('stocks/<int:stock_id>/run-prediction/', views.run_prediction, name='run_prediction'),
     path('stocks/<int:stock_id>/prediction-status/', views.get_prediction_status, name='prediction_status'),
+    path('predictions/universe/', views.batch_prediction, name='batch_prediction'),
     
     # Tahmin veri kaynakları sayfası
     path('prediction-data-sources/', views.prediction_data_sources, name='prediction_data_sources'),
@@ -61,5 +63,15 @@ urlpatterns = [
     path('import-company-financial/', views.import_company_financial, name='import_company_financial'),
     path('company-financial-detail/<int:financial_id>/', views.company_financial_detail, name='company_financial_detail'),
     path('financial-list/', views.financial_list, name='financial_list'),
+
+    # Parquet veri arşivleri (yedekleme / geri yükleme)
+    path('data-archives/', views.data_archives, name='data_archives'),
+    path('data-archives/restore/', views.restore_data_archive, name='restore_data_archive'),
+    path('data-archives/<str:name>/download/', views.download_data_archive, name='download_data_archive'),
+
+    # Arka plan işleri
+    path('api/jobs/', views.background_jobs, name='background_jobs'),
+    path('api/jobs/enqueue/', views.enqueue_background_job, name='enqueue_background_job'),
+    path('api/jobs/<int:job_id>/', views.background_job_status, name='background_job_status'),
 ]
 